@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark des backends de cache (JSON et SQLite) sur des caches synthétiques.
+
+Pour chaque taille, on mesure :
+- le chargement seul (JSON : lecture complète ; SQLite : ouverture) ;
+- un run typique : charger, modifier quelques utilisateurs, sauvegarder ;
+- la lecture de toutes les entrées (pire cas pour SQLite) ;
+ainsi que la taille des fichiers.
+
+Usage : python .github/scripts/benchmarks/cache_backends.py [taille ...]
+(tailles par défaut : 1000 10000 100000)
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsq import cache as dsq_cache  # noqa: E402
+from render import synthetic_cache  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+# Nombre d'utilisateurs modifiés par run "typique"
+TOUCHED_USERS = 10
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def touch(cache_data, size):
+    """Modifie TOUCHED_USERS utilisateurs, comme un run sans nouveaux forks."""
+    step = max(1, size // TOUCHED_USERS)
+    for i in range(0, size, step)[:TOUCHED_USERS]:
+        cache_data[f"adventurer-{i:06d}"]["last_checked"] = "2030-01-01T00:00:00"
+
+
+def read_all(cache_data):
+    return sum(1 for key, value in cache_data.items() if value)
+
+
+def bench(size):
+    json_backend = dsq_cache.JsonCacheBackend()
+    sqlite_backend = dsq_cache.SqliteCacheBackend()
+    results = {}
+
+    json_backend.save(synthetic_cache(size))
+    results["json load"], _ = timed(json_backend.load)
+
+    def json_run():
+        data = json_backend.load()
+        touch(data, size)
+        json_backend.save(data)
+
+    results["json run"], _ = timed(json_run)
+    results["json read all"], _ = timed(lambda: read_all(json_backend.load()))
+
+    results["sqlite import"], data = timed(sqlite_backend.load)
+    data.close()
+    results["sqlite load"], data = timed(sqlite_backend.load)
+    data.close()
+
+    def sqlite_run():
+        data = sqlite_backend.load()
+        touch(data, size)
+        sqlite_backend.save(data)
+        data.close()
+
+    results["sqlite run"], _ = timed(sqlite_run)
+
+    def sqlite_read_all():
+        data = sqlite_backend.load()
+        read_all(data)
+        data.close()
+
+    results["sqlite read all"], _ = timed(sqlite_read_all)
+
+    sizes = (
+        os.path.getsize(dsq_cache.CACHE_FILE) / 1024 / 1024,
+        os.path.getsize(dsq_cache.CACHE_DB) / 1024 / 1024,
+    )
+    return results, sizes
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        rows = []
+        for size in sizes:
+            # Les backends sont bavards : on ne garde que le tableau final
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    rows.append((size, *bench(size)))
+                finally:
+                    sys.stdout = stdout
+            for name in (dsq_cache.CACHE_FILE, dsq_cache.CACHE_DB):
+                os.remove(name)
+
+    names = list(rows[0][1])
+    print(f"{'utilisateurs':>12} | " + " | ".join(f"{n:>15}" for n in names))
+    for size, results, _ in rows:
+        print(
+            f"{size:>12} | "
+            + " | ".join(f"{results[n] * 1000:>12.1f} ms" for n in names)
+        )
+    for size, _, (json_mb, sqlite_mb) in rows:
+        print(
+            f"{size:>12} : cache.json {json_mb:.1f} Mo, cache.sqlite3 {sqlite_mb:.1f} Mo"
+        )
+
+
+if __name__ == "__main__":
+    main()
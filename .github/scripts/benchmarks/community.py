@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Générateur de communautés synthétiques, côté API GitHub.
+
+Produit les données servies par le faux serveur GitHub (fake_github.py) :
+le repo principal, N utilisateurs ayant chacun forké le repo et possédant M
+repos, dont une partie porte les topics "devsidequests" et "dsqX". Les
+données sont déterministes pour une graine donnée.
+
+Usage : python .github/scripts/benchmarks/community.py N [M] > community.json
+"""
+
+import sys
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+REPO_OWNER = "RaphyStoll"
+REPO_NAME = "devSideQuests"
+
+# Participants ajoutés à la main dans update_participants.py (sans fork)
+ADDITIONAL_USERNAMES = ["RaphyStoll"]
+
+LANGUAGES = ["Python", "C", "C++", "JavaScript", "TypeScript", "Rust", "Go", "Java"]
+
+# Part des repos sans langage détecté, et des repos forkés
+NO_LANGUAGE_RATE = 0.1
+FORK_RATE = 0.3
+
+
+def synthetic_community(users, repos_per_user=6, quests=3, dsq_rate=0.25, seed=1):
+    """
+    Communauté de `users` participants ayant chacun `repos_per_user` repos.
+    Chaque repo non forké est un repo DSQ avec une probabilité `dsq_rate`,
+    rattaché à l'une des quêtes dsq1..dsq`quests`.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2023, 6, 13, 16, 37, tzinfo=timezone.utc)
+    community = {
+        "owner": REPO_OWNER,
+        "repo": REPO_NAME,
+        "repo_created_at": start.isoformat(),
+        "users": {},
+        "forks": [],
+    }
+
+    def add_user(login, created_at, repos):
+        community["users"][login] = {
+            "id": len(community["users"]) + 1,
+            "created_at": created_at.isoformat(),
+            "updated_at": (created_at + timedelta(days=30)).isoformat(),
+            "repos": repos,
+        }
+
+    add_user(
+        REPO_OWNER,
+        start - timedelta(days=400),
+        [
+            {
+                "name": REPO_NAME,
+                "language": None,
+                "fork": False,
+                "created_at": start.isoformat(),
+                "updated_at": start.isoformat(),
+                "pushed_at": start.isoformat(),
+                "topics": ["devsidequests"],
+            }
+        ],
+    )
+
+    for i in range(users):
+        login = f"adventurer-{i:06d}"
+        fork_date = start + timedelta(minutes=rnd.randint(0, 60 * 24 * 700))
+        repos = []
+        for j in range(repos_per_user):
+            created = fork_date + timedelta(days=rnd.randint(-300, 60))
+            fork = rnd.random() < FORK_RATE
+            topics = []
+            if not fork and rnd.random() < dsq_rate:
+                topics = ["devsidequests", f"dsq{rnd.randint(1, quests)}"]
+            language = None
+            if rnd.random() >= NO_LANGUAGE_RATE:
+                language = rnd.choice(LANGUAGES)
+            repos.append(
+                {
+                    "name": f"repo-{j}",
+                    "language": language,
+                    "fork": fork,
+                    "created_at": created.isoformat(),
+                    "updated_at": (created + timedelta(days=3)).isoformat(),
+                    "pushed_at": (created + timedelta(days=3)).isoformat(),
+                    "topics": topics,
+                }
+            )
+        add_user(login, fork_date - timedelta(days=rnd.randint(30, 3000)), repos)
+        community["forks"].append({"owner": login, "created_at": fork_date.isoformat()})
+
+    for login in ADDITIONAL_USERNAMES:
+        if login not in community["users"]:
+            add_user(login, start, [])
+    return community
+
+
+def main():
+    if not 2 <= len(sys.argv) <= 3:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+    users = int(sys.argv[1])
+    repos_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    json.dump(synthetic_community(users, repos_per_user), sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
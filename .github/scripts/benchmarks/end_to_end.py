@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de bout en bout des deux scripts contre le faux serveur GitHub.
+
+Pour chaque taille de communauté synthétique, les étapes d'un cycle complet
+sont lancées dans un répertoire temporaire, chacune dans son propre
+processus :
+- sync à froid (cache vide : listage des forks, récupération des
+  utilisateurs, recherche DSQ) ;
+- render (statistiques par quête et génération de PARTICIPANTS.md) ;
+- sync à chaud (run quotidien sans changement : cache HTTP et deltas) ;
+- refresh (update-user-cache.py, rafraîchissement complet des entrées).
+
+Pour chaque étape : temps mur, requêtes reçues par le serveur (dont les 304),
+pic de mémoire résidente du processus, et durées des étapes instrumentées
+lues dans le rapport de run (dsq.telemetry).
+
+Usage : python .github/scripts/benchmarks/end_to_end.py [taille ...]
+        [--latency S] [--workers N] [--json fichier]
+(tailles par défaut : 100 1000)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
+
+sys.path.insert(0, SCRIPTS_DIR)
+
+from community import synthetic_community  # noqa: E402
+from fake_github import FakeGitHub  # noqa: E402
+
+DEFAULT_SIZES = [100, 1_000]
+
+# Quotas assez larges pour ne jamais bloquer le benchmark : c'est le nombre
+# de requêtes qu'on mesure, pas l'attente des resets
+BENCH_LIMITS = {"core": 10**7, "search": 10**7, "graphql": 10**7}
+
+# (nom, script, arguments, variables d'environnement, étapes affichées)
+PHASES = [
+    (
+        "sync à froid",
+        "update_participants.py",
+        ["sync"],
+        {},
+        ["get_forks", "fetch_user_data", "determine_main_language"],
+    ),
+    (
+        "render",
+        "update_participants.py",
+        ["render"],
+        {},
+        ["quest_stats", "generate_markdown"],
+    ),
+    (
+        "sync à chaud",
+        "update_participants.py",
+        ["sync"],
+        {},
+        ["get_forks", "fetch_user_data"],
+    ),
+    (
+        "refresh",
+        "update-user-cache.py",
+        [],
+        # Toutes les entrées sont dues : pire cas du refresh hebdomadaire
+        {"DSQ_REFRESH_TTL_DAYS": "0", "DSQ_REFRESH_JITTER_DAYS": "0"},
+        ["refresh_user", "determine_main_language"],
+    ),
+]
+
+
+def run_phase(workdir, script, args, env):
+    """Lance un script et renvoie (temps mur, pic RSS en octets ou None)."""
+    with open(os.path.join(workdir, "output.log"), "a", encoding="utf-8") as log:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+            cwd=workdir,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss est en Ko sous Linux
+            peak = usage.ru_maxrss * 1024
+        else:
+            process.wait()
+            peak = None
+        elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"{script} {' '.join(args)} a échoué ({process.returncode}), "
+            f"voir {os.path.join(workdir, 'output.log')}"
+        )
+    return elapsed, peak
+
+
+def bench_size(size, latency, workers):
+    """Résultats de chaque étape, au fil de leur exécution."""
+    community = synthetic_community(size)
+    with tempfile.TemporaryDirectory() as workdir, FakeGitHub(
+        community, latency=latency, limits=BENCH_LIMITS
+    ) as fake:
+        # Le catalogue des quêtes est lu depuis quests/
+        shutil.copytree(
+            os.path.join(REPO_ROOT, "quests"), os.path.join(workdir, "quests")
+        )
+        base_env = dict(
+            os.environ,
+            GITHUB_TOKEN="fake-token",
+            GITHUB_API_URL=fake.url,
+            DSQ_MAX_WORKERS=str(workers),
+            DSQ_RUN_REPORT="run_report.json",
+        )
+        for name, script, args, env, spans in PHASES:
+            fake.reset_counters()
+            elapsed, peak = run_phase(workdir, script, args, dict(base_env, **env))
+            calls, _ = fake.api_calls()
+
+            with open(os.path.join(workdir, "run_report.json"), encoding="utf-8") as f:
+                runs = json.load(f)["runs"]
+            report = runs[args[0] if args else "update-user-cache"]
+            yield {
+                "size": size,
+                "phase": name,
+                "seconds": round(elapsed, 3),
+                "api_calls": calls,
+                "not_modified": fake.not_modified,
+                "peak_rss": peak,
+                "spans": {
+                    span: report["spans"][span]
+                    for span in spans
+                    if span in report["spans"]
+                },
+            }
+
+
+def format_result(result):
+    peak = result["peak_rss"]
+    peak = f"{peak / 1024 / 1024:6.1f} Mo" if peak else "     - "
+    spans = ", ".join(
+        f"{name} {span['total_seconds']:.2f}s/{span['count']}"
+        for name, span in result["spans"].items()
+    )
+    return (
+        f"{result['size']:>7} | {result['phase']:<13} | {result['seconds']:7.2f} s "
+        f"| {result['api_calls']:>6} ({result['not_modified']:>5} 304) | {peak} | {spans}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="latence du faux serveur (s)"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="DSQ_MAX_WORKERS")
+    parser.add_argument("--json", help="écrit aussi les résultats dans ce fichier")
+    args = parser.parse_args()
+
+    print(
+        f"{'taille':>7} | {'étape':<13} | {'temps mur':>9} | {'requêtes API':>18} "
+        f"| {'pic RSS':>9} | étapes instrumentées (total/appels)"
+    )
+    results = []
+    for size in args.sizes:
+        for result in bench_size(size, args.latency, args.workers):
+            print(format_result(result), flush=True)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"latency": args.latency, "workers": args.workers, "results": results},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+
+
+if __name__ == "__main__":
+    main()
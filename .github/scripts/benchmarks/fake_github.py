@@ -0,0 +1,723 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Faux serveur de l'API GitHub, pour faire tourner les scripts sans token ni
+réseau (GITHUB_API_URL=http://127.0.0.1:PORT).
+
+Trois sources de réponses, par ordre de priorité :
+- enregistrement (--record) : les requêtes sont relayées vers la vraie API
+  (--upstream) et les réponses enregistrées dans un fichier de fixtures ;
+- rejeu (--replay) : les réponses sont servies depuis un fichier de fixtures ;
+- communauté synthétique (community.py) : REST, recherche, GraphQL (les
+  requêtes de dsq.graphql_backend : profils par lots, dépôts et forks
+  paginés) et avatars PNG (/avatars/u/ID, hors quota), générés à la volée.
+
+Comme l'API réelle, le serveur pagine (per_page / page, en-têtes Link),
+renvoie des en-têtes X-RateLimit-* avec des quotas core / search séparés
+(403 une fois épuisés), répond 304 aux requêtes conditionnelles (If-None-Match,
+sans consommer de quota) et limite la recherche aux 1000 premiers résultats.
+Une latence peut être ajoutée à chaque réponse, et des limites secondaires
+(403 avec Retry-After) peuvent être injectées (secondary_limit()).
+
+Usage (depuis la racine du dépôt) :
+    python .github/scripts/benchmarks/fake_github.py --users 1000 --latency 0.05
+    GITHUB_TOKEN=... python .github/scripts/benchmarks/fake_github.py \\
+        --record fixtures.json
+    python .github/scripts/benchmarks/fake_github.py --replay fixtures.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import struct
+import hashlib
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsq.atomic import atomic_write  # noqa: E402
+from dsq.telemetry import endpoint_for  # noqa: E402
+from community import synthetic_community  # noqa: E402
+
+DEFAULT_PORT = 8765
+
+# Quotas par défaut (ceux d'un token classique) et durée de leur fenêtre
+DEFAULT_LIMITS = {"core": 5000, "search": 30, "graphql": 5000}
+WINDOWS = {"core": 3600, "search": 60, "graphql": 3600}
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+# La recherche GitHub ne renvoie que les 1000 premiers résultats
+SEARCH_MAX_RESULTS = 1000
+
+FIXTURES_VERSION = 1
+
+# Remplace l'URL de l'API dans les fixtures (rejouées sur une autre adresse)
+BASE_URL_PLACEHOLDER = "{base_url}"
+
+# En-têtes transmis à la vraie API, et conservés dans les fixtures
+FORWARDED_HEADERS = ("Authorization", "Accept", "User-Agent", "Content-Type")
+RECORDED_HEADERS = ("content-type", "link")
+
+
+def github_time(iso_date):
+    return iso_date.replace("+00:00", "Z")
+
+
+def solid_png(size, rgb):
+    """PNG carré d'une seule couleur (sans Pillow)."""
+
+    def chunk(kind, data):
+        crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+    row = b"\x00" + bytes(rgb) * size
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * size))
+        + chunk(b"IEND", b"")
+    )
+
+
+def fixture_key(method, path, body=b""):
+    """Clé d'une requête : méthode, chemin et paramètres triés (+ corps)."""
+    url = urllib.parse.urlsplit(path)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(url.query)))
+    key = f"{method} {url.path}" + (f"?{query}" if query else "")
+    if body:
+        key += f" {hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+class FakeGitHub:
+    """Faux serveur GitHub, démarré dans un thread (start() / stop())."""
+
+    def __init__(
+        self,
+        community=None,
+        latency=0.0,
+        limits=None,
+        replay=None,
+        record=None,
+        upstream="https://api.github.com",
+    ):
+        self.community = community
+        self.latency = latency
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.upstream = upstream.rstrip("/")
+        self.record_path = record
+        self.fixtures = {}
+        if replay:
+            with open(replay, encoding="utf-8") as f:
+                self.fixtures = json.load(f)["responses"]
+
+        self.lock = threading.Lock()
+        self.budgets = {}
+        self.calls = {}
+        self.not_modified = 0
+        self.avatar_requests = 0
+        self.secondary_pending = 0
+        self.retry_after = 1
+        self.server = None
+        if community:
+            self._index_community()
+
+    # ----------------------------------------------------
+    # Démarrage / arrêt
+    # ----------------------------------------------------
+
+    def start(self, port=0):
+        fake = self
+
+        class Handler(FakeGitHubHandler):
+            server_state = fake
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.record_path:
+            self.save_fixtures(self.record_path)
+
+    def __enter__(self):
+        return self.start() if self.server is None else self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def save_fixtures(self, path):
+        with self.lock:
+            responses = dict(sorted(self.fixtures.items()))
+        with atomic_write(path) as f:
+            json.dump(
+                {
+                    "version": FIXTURES_VERSION,
+                    "upstream": self.upstream,
+                    "responses": responses,
+                },
+                f,
+                indent=1,
+                ensure_ascii=False,
+            )
+        print(f"{len(responses)} réponses enregistrées dans {path}.")
+
+    # ----------------------------------------------------
+    # Compteurs et quotas
+    # ----------------------------------------------------
+
+    def api_calls(self):
+        """Nombre total de requêtes reçues, par endpoint."""
+        with self.lock:
+            return sum(self.calls.values()), dict(self.calls)
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls.clear()
+            self.not_modified = 0
+            self.avatar_requests = 0
+
+    def secondary_limit(self, count, retry_after=1):
+        """Les `count` prochaines requêtes reçoivent une limite secondaire."""
+        with self.lock:
+            self.secondary_pending = count
+            self.retry_after = retry_after
+
+    def take_secondary_limit(self):
+        with self.lock:
+            if self.secondary_pending <= 0:
+                return False
+            self.secondary_pending -= 1
+            return True
+
+    def count_call(self, method, path):
+        endpoint = endpoint_for(method, path)
+        with self.lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def consume(self, resource, not_modified=False):
+        """
+        Décompte une requête du quota `resource`. Renvoie les en-têtes
+        X-RateLimit-* et un booléen indiquant si le quota était épuisé.
+        """
+        now = time.time()
+        with self.lock:
+            budget = self.budgets.get(resource)
+            if budget is None or now >= budget["reset"]:
+                budget = self.budgets[resource] = {
+                    "remaining": self.limits[resource],
+                    "reset": int(now) + WINDOWS[resource],
+                }
+            exhausted = budget["remaining"] <= 0
+            # Les réponses 304 ne consomment pas de quota
+            if not exhausted and not not_modified:
+                budget["remaining"] -= 1
+            if not_modified:
+                self.not_modified += 1
+            headers = {
+                "X-RateLimit-Limit": str(self.limits[resource]),
+                "X-RateLimit-Remaining": str(budget["remaining"]),
+                "X-RateLimit-Used": str(self.limits[resource] - budget["remaining"]),
+                "X-RateLimit-Reset": str(budget["reset"]),
+                "X-RateLimit-Resource": resource,
+            }
+        return headers, exhausted
+
+    # ----------------------------------------------------
+    # Communauté synthétique
+    # ----------------------------------------------------
+
+    def _index_community(self):
+        data = self.community
+        self.main_repo = (data["owner"], data["repo"])
+        # Repos DSQ visibles par la recherche, dans un ordre stable
+        self.search_index = [
+            (login, repo)
+            for login, user in data["users"].items()
+            for repo in user["repos"]
+            if "devsidequests" in repo["topics"]
+        ]
+
+    def user_json(self, base_url, login):
+        user = self.community["users"].get(login)
+        if user is None:
+            # Propriétaire d'un fork absent de la communauté (compte supprimé
+            # ou renommé depuis) : décrit a minima, /users/LOGIN répond 404
+            return {"login": login, "id": 0, "type": "User"}
+        return {
+            "login": login,
+            "id": user["id"],
+            "type": "User",
+            "url": f"{base_url}/users/{login}",
+            "html_url": f"https://github.com/{login}",
+            "avatar_url": (
+                f"{base_url}/avatars/u/{user['id']}?v={user.get('avatar_version', 4)}"
+            ),
+            "repos_url": f"{base_url}/users/{login}/repos",
+            "public_repos": len(user["repos"]),
+            "created_at": github_time(user["created_at"]),
+            "updated_at": github_time(user["updated_at"]),
+        }
+
+    def repo_json(self, base_url, login, repo, fork_created_at=None):
+        full_name = f"{login}/{repo['name']}"
+        created_at = fork_created_at or repo["created_at"]
+        return {
+            "id": int(hashlib.sha1(full_name.encode()).hexdigest()[:8], 16),
+            "name": repo["name"],
+            "full_name": full_name,
+            "owner": self.user_json(base_url, login),
+            "private": False,
+            "fork": fork_created_at is not None or repo["fork"],
+            "url": f"{base_url}/repos/{full_name}",
+            "html_url": f"https://github.com/{full_name}",
+            "language": repo["language"],
+            "topics": repo["topics"],
+            "created_at": github_time(created_at),
+            "updated_at": github_time(fork_created_at or repo["updated_at"]),
+            "pushed_at": github_time(fork_created_at or repo["pushed_at"]),
+        }
+
+    def find_repo(self, login, name):
+        user = self.community["users"].get(login)
+        if user is None:
+            return None
+        return next((r for r in user["repos"] if r["name"] == name), None)
+
+    def search(self, query):
+        """Recherche de repos (qualificatifs topic:, user: et fork:)."""
+        terms = query.split()
+        topics = [t[6:] for t in terms if t.startswith("topic:")]
+        users = [t[5:] for t in terms if t.startswith("user:")]
+        fork = next((t[5:] for t in terms if t.startswith("fork:")), None)
+        results = []
+        for login, repo in self.search_index:
+            if users and login not in users:
+                continue
+            if any(topic not in repo["topics"] for topic in topics):
+                continue
+            # Les forks sont exclus de la recherche, sauf fork:true / fork:only
+            if repo["fork"] and fork not in ("true", "only"):
+                continue
+            if fork == "only" and not repo["fork"]:
+                continue
+            results.append((login, repo))
+        return results
+
+    # ----------------------------------------------------
+    # GraphQL (requêtes de dsq.graphql_backend uniquement)
+    # ----------------------------------------------------
+
+    def graphql_repo(self, repo):
+        language = repo["language"]
+        return {
+            "name": repo["name"],
+            "url": f"https://github.com/{repo['owner']}/{repo['name']}",
+            "isFork": repo["fork"],
+            "primaryLanguage": {"name": language} if language else None,
+            "createdAt": github_time(repo["created_at"]),
+            "updatedAt": github_time(repo["updated_at"]),
+            "pushedAt": github_time(repo["pushed_at"]),
+            "repositoryTopics": {
+                "nodes": [{"topic": {"name": topic}} for topic in repo["topics"]]
+            },
+        }
+
+    def graphql(self, base_url, query, variables):
+        """Réponse {"data", "errors"} aux requêtes de profils et de forks."""
+        page_size = int(re.search(r"(?:repositories|forks)\(first: (\d+)", query)[1])
+        if "forks(first:" in query:
+            forks = sorted(
+                self.community["forks"], key=lambda f: f["created_at"], reverse=True
+            )
+            start = int(variables.get("after") or 0)
+            chunk = forks[start : start + page_size]
+            end = start + len(chunk)
+            return {
+                "data": {
+                    "repository": {
+                        "forks": {
+                            "pageInfo": {
+                                "hasNextPage": end < len(forks),
+                                "endCursor": str(end),
+                            },
+                            "nodes": [
+                                {
+                                    "createdAt": github_time(fork["created_at"]),
+                                    "owner": {"login": fork["owner"]},
+                                }
+                                for fork in chunk
+                            ],
+                        }
+                    }
+                }
+            }
+
+        data, errors = {}, []
+        for alias in re.findall(r"(\w+): user\(login: \$\w+\)", query):
+            login = variables[alias]
+            user = self.community["users"].get(login)
+            if user is None:
+                data[alias] = None
+                errors.append({"message": f"Could not resolve to a User '{login}'."})
+                continue
+            repos = [dict(repo, owner=login) for repo in user["repos"]]
+            start = int(variables.get(f"{alias}_after") or 0)
+            chunk = repos[start : start + page_size]
+            end = start + len(chunk)
+            node = {
+                "login": login,
+                "repositories": {
+                    "pageInfo": {
+                        "hasNextPage": end < len(repos),
+                        "endCursor": str(end),
+                    },
+                    "nodes": [self.graphql_repo(repo) for repo in chunk],
+                },
+            }
+            if "avatarUrl" in query:
+                profile = self.user_json(base_url, login)
+                node.update(
+                    databaseId=user["id"],
+                    avatarUrl=profile["avatar_url"],
+                    url=profile["html_url"],
+                    createdAt=profile["created_at"],
+                    updatedAt=profile["updated_at"],
+                    publicRepos={"totalCount": len(repos)},
+                )
+            data[alias] = node
+        return {"data": data, "errors": errors or None}
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # En-têtes et corps sont écrits séparément : sans cela, Nagle et l'ACK
+    # retardé du client ajoutent ~40 ms à chaque réponse en keep-alive
+    disable_nagle_algorithm = True
+    server_state = None
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def base_url(self):
+        return f"http://{self.headers.get('Host', '127.0.0.1')}"
+
+    # ----------------------------------------------------
+    # Réponses
+    # ----------------------------------------------------
+
+    def respond(self, status, payload, headers=None, resource="core"):
+        fake = self.server_state
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        not_modified = status == 200 and self.headers.get("If-None-Match") == etag
+        rate_headers, exhausted = fake.consume(resource, not_modified)
+        if exhausted:
+            status, not_modified = 403, False
+            body = json.dumps(
+                {
+                    "message": "API rate limit exceeded.",
+                    "documentation_url": "https://docs.github.com/rest/rate-limit",
+                }
+            ).encode()
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        self.send_response(304 if not_modified else status)
+        for name, value in rate_headers.items():
+            self.send_header(name, value)
+        self.send_header("ETag", etag)
+        if not_modified:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in (headers or {}).items():
+            if not exhausted:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def not_found(self, resource="core"):
+        self.respond(404, {"message": "Not Found"}, resource=resource)
+
+    def paginate(self, items, query, limit=None):
+        """Page demandée de `items`, et l'en-tête Link correspondant."""
+        per_page = min(MAX_PER_PAGE, int(query.get("per_page", [DEFAULT_PER_PAGE])[0]))
+        page = max(1, int(query.get("page", ["1"])[0]))
+        total = len(items) if limit is None else min(len(items), limit)
+        last = max(1, -(-total // per_page))
+        chunk = items[(page - 1) * per_page : min(page * per_page, total)]
+
+        path = urllib.parse.urlsplit(self.path).path
+        params = {k: v[0] for k, v in query.items()}
+        links = []
+        for rel, number in (
+            ("prev", page - 1),
+            ("next", page + 1),
+            ("last", last),
+            ("first", 1),
+        ):
+            if (rel in ("prev", "first") and page > 1) or (
+                rel in ("next", "last") and page < last
+            ):
+                params["page"] = str(number)
+                url = f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+                links.append(f'<{url}>; rel="{rel}"')
+        return chunk, ({"Link": ", ".join(links)} if links else {})
+
+    # ----------------------------------------------------
+    # Routage
+    # ----------------------------------------------------
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def handle_request(self, method):
+        fake = self.server_state
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path
+        if path.startswith("/avatars/") and fake.community:
+            # Service d'avatars : hors API, ni compté ni soumis aux quotas
+            return self.avatar(path)
+        if path.startswith("/api/v3/"):
+            path = path[len("/api/v3") :]
+        fake.count_call(method, path)
+        resource = "core"
+        if path.startswith("/search/"):
+            resource = "search"
+        elif path.startswith("/graphql"):
+            resource = "graphql"
+        if fake.take_secondary_limit():
+            return self.secondary_limited()
+
+        key = fixture_key(method, path, body)
+        if fake.record_path:
+            return self.record(method, path, body, key, resource)
+        if key in fake.fixtures:
+            return self.replay(fake.fixtures[key], resource)
+        if fake.community and method == "GET":
+            return self.synthetic(path, resource)
+        if fake.community and method == "POST" and resource == "graphql":
+            request = json.loads(body)
+            payload = fake.graphql(
+                self.base_url, request["query"], request.get("variables", {})
+            )
+            return self.respond(200, payload, resource=resource)
+        self.not_found(resource)
+
+    def avatar(self, path):
+        fake = self.server_state
+        url = urllib.parse.urlsplit(path)
+        query = urllib.parse.parse_qs(url.query)
+        user_id = int(url.path.rsplit("/", 1)[-1])
+        version = int(query.get("v", ["4"])[0])
+        size = min(460, int(query.get("s", ["460"])[0]))
+        with fake.lock:
+            fake.avatar_requests += 1
+        body = solid_png(size, (user_id * 37 % 256, version * 53 % 256, 128))
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def secondary_limited(self):
+        fake = self.server_state
+        body = json.dumps(
+            {
+                "message": "You have exceeded a secondary rate limit.",
+                "documentation_url": "https://docs.github.com/rest/rate-limit",
+            }
+        ).encode()
+        self.send_response(403)
+        self.send_header("Retry-After", str(fake.retry_after))
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def replay(self, fixture, resource):
+        base_url = self.base_url
+        body = fixture["body"].replace(BASE_URL_PLACEHOLDER, base_url)
+        headers = {
+            name: value.replace(BASE_URL_PLACEHOLDER, base_url)
+            for name, value in fixture["headers"].items()
+            if name.lower() != "content-type"
+        }
+        self.respond(fixture["status"], body.encode(), headers, resource)
+
+    def record(self, method, path, body, key, resource):
+        fake = self.server_state
+        request = urllib.request.Request(
+            fake.upstream + path, data=body or None, method=method
+        )
+        for name in FORWARDED_HEADERS:
+            if self.headers.get(name):
+                request.add_header(name, self.headers[name])
+        try:
+            with urllib.request.urlopen(request) as response:
+                status, headers, payload = (
+                    response.status,
+                    response.headers,
+                    response.read(),
+                )
+        except urllib.error.HTTPError as e:
+            status, headers, payload = e.code, e.headers, e.read()
+
+        text = payload.decode("utf-8").replace(fake.upstream, BASE_URL_PLACEHOLDER)
+        kept = {
+            name: headers[name].replace(fake.upstream, BASE_URL_PLACEHOLDER)
+            for name in RECORDED_HEADERS
+            if headers.get(name)
+        }
+        with fake.lock:
+            fake.fixtures[key] = {"status": status, "headers": kept, "body": text}
+        self.replay(fake.fixtures[key], resource)
+
+    def synthetic(self, path, resource):
+        fake = self.server_state
+        url = urllib.parse.urlsplit(path)
+        query = urllib.parse.parse_qs(url.query)
+        parts = [urllib.parse.unquote(p) for p in url.path.split("/") if p]
+        users = fake.community["users"]
+        base_url = self.base_url
+
+        if parts == ["rate_limit"]:
+            resources = {}
+            for name in DEFAULT_LIMITS:
+                budget = fake.budgets.get(name, {})
+                resources[name] = {
+                    "limit": fake.limits[name],
+                    "remaining": budget.get("remaining", fake.limits[name]),
+                    "reset": budget.get("reset", int(time.time()) + WINDOWS[name]),
+                }
+            return self.respond(
+                200, {"resources": resources, "rate": resources["core"]}
+            )
+
+        if parts[:1] == ["users"] and len(parts) in (2, 3):
+            login = parts[1]
+            if login not in users:
+                return self.not_found()
+            if len(parts) == 2:
+                return self.respond(200, fake.user_json(base_url, login))
+            if parts[2] == "repos":
+                repos = [
+                    fake.repo_json(base_url, login, repo)
+                    for repo in users[login]["repos"]
+                ]
+                chunk, headers = self.paginate(repos, query)
+                return self.respond(200, chunk, headers)
+
+        if parts[:1] == ["repos"] and len(parts) in (3, 4):
+            login, name = parts[1], parts[2]
+            repo = fake.find_repo(login, name)
+            if repo is None:
+                return self.not_found()
+            if len(parts) == 3:
+                return self.respond(200, fake.repo_json(base_url, login, repo))
+            if parts[3] == "topics":
+                return self.respond(200, {"names": repo["topics"]})
+            if parts[3] == "forks" and (login, name) == fake.main_repo:
+                order = query.get("sort", ["newest"])[0]
+                forks = sorted(
+                    fake.community["forks"],
+                    key=lambda fork: fork["created_at"],
+                    reverse=order != "oldest",
+                )
+                chunk, headers = self.paginate(forks, query)
+                payload = [
+                    fake.repo_json(base_url, fork["owner"], repo, fork["created_at"])
+                    for fork in chunk
+                ]
+                return self.respond(200, payload, headers)
+
+        if parts == ["search", "repositories"]:
+            results = fake.search(query.get("q", [""])[0])
+            chunk, headers = self.paginate(results, query, SEARCH_MAX_RESULTS)
+            page = int(query.get("page", ["1"])[0])
+            if not chunk and page > 1 and len(results) > SEARCH_MAX_RESULTS:
+                return self.respond(
+                    422,
+                    {"message": "Only the first 1000 search results are available"},
+                    resource=resource,
+                )
+            payload = {
+                "total_count": len(results),
+                "incomplete_results": False,
+                "items": [
+                    fake.repo_json(base_url, login, repo) for login, repo in chunk
+                ],
+            }
+            return self.respond(200, payload, headers, resource)
+
+        self.not_found(resource)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Faux serveur de l'API GitHub.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repos", type=int, default=6, help="repos par utilisateur")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="secondes par réponse"
+    )
+    parser.add_argument("--core-limit", type=int, default=DEFAULT_LIMITS["core"])
+    parser.add_argument("--search-limit", type=int, default=DEFAULT_LIMITS["search"])
+    parser.add_argument("--replay", help="fichier de fixtures à rejouer")
+    parser.add_argument("--record", help="enregistre les réponses de --upstream")
+    parser.add_argument("--upstream", default="https://api.github.com")
+    args = parser.parse_args()
+
+    community = None
+    if not args.record:
+        community = synthetic_community(args.users, args.repos, seed=args.seed)
+    fake = FakeGitHub(
+        community,
+        latency=args.latency,
+        limits={"core": args.core_limit, "search": args.search_limit},
+        replay=args.replay,
+        record=args.record,
+        upstream=args.upstream,
+    ).start(args.port)
+    print(f"Faux GitHub sur {fake.url} (Ctrl+C pour arrêter)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+        total, _ = fake.api_calls()
+        print(f"{total} requêtes servies.")
+
+
+if __name__ == "__main__":
+    main()
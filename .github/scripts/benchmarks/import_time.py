@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark du temps d'import des scripts, sans token ni réseau.
+
+Chaque import est mesuré dans un interpréteur neuf (médiane de plusieurs
+essais). Le script échoue si PyGithub / requests sont chargés à l'import,
+ou si le temps médian dépasse le seuil (DSQ_IMPORT_BUDGET_MS, 150 ms).
+
+Usage : python .github/scripts/benchmarks/import_time.py [module ...]
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules importés par défaut
+DEFAULT_MODULES = ["update_participants"]
+
+# Modules lourds qui ne doivent pas être chargés par un simple import
+HEAVY_MODULES = ["github", "requests", "urllib3"]
+
+RUNS = int(os.environ.get("DSQ_IMPORT_RUNS", "7"))
+BUDGET_MS = float(os.environ.get("DSQ_IMPORT_BUDGET_MS", "150"))
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module):
+    """Importe `module` dans un processus neuf et renvoie (ms, modules lourds chargés)."""
+    env = dict(os.environ)
+    env.pop("GITHUB_TOKEN", None)
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=SCRIPTS_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return result["ms"], result["heavy"]
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+    failed = False
+    for module in modules:
+        timings = []
+        heavy = []
+        for _ in range(RUNS):
+            ms, heavy = measure(module)
+            timings.append(ms)
+        median = statistics.median(timings)
+        status = "OK"
+        if heavy:
+            status = f"ÉCHEC : {', '.join(heavy)} chargé(s) à l'import"
+            failed = True
+        elif median > BUDGET_MS:
+            status = f"ÉCHEC : au-delà du budget de {BUDGET_MS:.0f} ms"
+            failed = True
+        print(
+            f"{module}: médiane {median:.1f} ms, min {min(timings):.1f} ms "
+            f"sur {RUNS} essais - {status}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark du rendu de PARTICIPANTS.md sur des caches synthétiques.
+
+Pour chaque taille de communauté, un cache est généré puis rendu hors ligne
+(empreinte + écriture) dans un interpréteur neuf. On mesure le temps par
+participant, qui doit rester à peu près constant (rendu linéaire), et le pic
+mémoire du rendu hors données du cache (tracemalloc), qui ne doit pas suivre
+la taille du document produit.
+
+Usage : python .github/scripts/benchmarks/render.py [taille ...]
+(tailles par défaut : 10000 100000)
+"""
+
+import os
+import sys
+import json
+import random
+import tempfile
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+LANGUAGES = ["Python", "C", "C++", "JavaScript", "TypeScript", "Rust", "Go", "Java"]
+
+# Écart maximal toléré entre les temps par participant de la plus petite et
+# de la plus grande taille
+MAX_TIME_RATIO = float(os.environ.get("DSQ_RENDER_MAX_TIME_RATIO", "2.0"))
+
+
+def synthetic_cache(size, seed=42):
+    """Cache au format de cache.json avec `size` participants."""
+    rnd = random.Random(seed)
+    start = datetime(2023, 6, 13, tzinfo=timezone.utc)
+    cache = {}
+    forks = {}
+    for i in range(size):
+        login = f"adventurer-{i:06d}"
+        fork_date = start + timedelta(minutes=rnd.randint(0, 60 * 24 * 700))
+        repos = []
+        for j in range(rnd.choice([0, 0, 1, 1, 2, 3])):
+            created = fork_date + timedelta(days=rnd.randint(0, 60))
+            repos.append(
+                {
+                    "name": f"dsq-{j}",
+                    "url": f"https://github.com/{login}/dsq-{j}",
+                    "topics": ["devsidequests", f"dsq{rnd.randint(1, 6)}"],
+                    "created_at": created.isoformat(),
+                    "pushed_at": (created + timedelta(days=3)).isoformat(),
+                }
+            )
+        weights = {lang: rnd.random() for lang in rnd.sample(LANGUAGES, 3)}
+        cache[login] = {
+            "username": login,
+            "avatar_url": f"https://avatars.githubusercontent.com/u/{i}?v=4",
+            "profile_url": f"https://github.com/{login}",
+            "fork_date": fork_date.isoformat(),
+            "dsq_repos": repos,
+            "main_language": max(weights, key=weights.get),
+            "language_weights": weights,
+        }
+        forks[login] = fork_date.isoformat()
+    cache["_forks"] = {
+        "newest_created_at": max(forks.values()),
+        "newest_login": max(forks, key=forks.get),
+        "last_full_sync": start.isoformat(),
+        "forks": forks,
+    }
+    return cache
+
+
+PROBE = """
+import sys, json, time, tracemalloc
+sys.path.insert(0, {scripts_dir!r})
+import update_participants as up
+
+with open({cache_file!r}, encoding="utf-8") as f:
+    cache = json.load(f)
+up.ADDITIONAL_USERNAMES = []
+up.load_cached_global_search(cache)
+participants = up.participants_from_cache(cache)
+# L'index des statistiques est maintenu par sync : il est construit hors mesure
+up.load_stats_index(cache).sync_members(participants)
+
+if {trace!r}:
+    tracemalloc.start()
+start = time.perf_counter()
+up.content_hash(up.iter_markdown(participants))
+up.write_markdown(participants, {output!r})
+elapsed = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if {trace!r} else 0
+print(json.dumps({{"seconds": elapsed, "peak": peak}}))
+"""
+
+
+def run_probe(cache_file, output, trace):
+    code = PROBE.format(
+        scripts_dir=SCRIPTS_DIR, cache_file=cache_file, output=output, trace=trace
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            cache_file = os.path.join(tmp, f"cache-{size}.json")
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump(synthetic_cache(size), f)
+            output = os.path.join(tmp, f"PARTICIPANTS-{size}.md")
+
+            # Temps mesuré sans tracemalloc, qui ralentit fortement le rendu
+            seconds = run_probe(cache_file, output, trace=False)["seconds"]
+            peak = run_probe(cache_file, output, trace=True)["peak"]
+            doc_size = os.path.getsize(output)
+            results.append((size, seconds))
+            print(
+                f"{size:>7} participants : {seconds:.2f} s "
+                f"({seconds / size * 1e6:.1f} µs/participant), "
+                f"document {doc_size / 1024 / 1024:.1f} Mo, "
+                f"pic mémoire du rendu {peak / 1024 / 1024:.1f} Mo"
+            )
+
+    if len(results) > 1:
+        (small, t_small), (large, t_large) = results[0], results[-1]
+        ratio = (t_large / large) / (t_small / small)
+        print(f"Rapport des temps par participant ({large} / {small}) : {ratio:.2f}")
+        if ratio > MAX_TIME_RATIO:
+            print(f"ÉCHEC : rendu non linéaire (rapport > {MAX_TIME_RATIO})")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
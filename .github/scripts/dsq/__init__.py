@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bibliothèque commune aux scripts des Dev Side Quests.
+
+Les modules de ce package n'importent ni PyGithub ni requests au chargement :
+le client GitHub n'est construit (dsq.client) qu'au premier appel réseau, ce
+qui permet d'utiliser le cache et de générer le markdown hors ligne.
+"""
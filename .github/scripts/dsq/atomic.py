@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""
+Écriture atomique de fichiers texte : le contenu est écrit dans un fichier
+temporaire voisin, puis renommé sur la cible une fois complet.
+"""
+
+import os
+import shutil
+from contextlib import contextmanager
+
+# Taille du tampon d'écriture (les morceaux produits par les générateurs
+# de markdown sont petits)
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+@contextmanager
+def atomic_write(path, buffering=WRITE_BUFFER_SIZE, backup_path=None):
+    """
+    Ouvre `path` en écriture de façon atomique. En cas d'exception, le
+    fichier temporaire est supprimé et `path` reste intact. Avec
+    `backup_path`, la version précédente de `path` y est conservée.
+    """
+    tmp_path = f"{path}.tmp"
+    f = open(tmp_path, "w", encoding="utf-8", buffering=buffering)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        if backup_path and os.path.exists(path):
+            _keep_backup(path, backup_path)
+        os.replace(tmp_path, path)
+        _fsync_directory(path)
+    except BaseException:
+        f.close()
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _keep_backup(path, backup_path):
+    # Lien physique quand c'est possible (pas de copie), copie sinon
+    if os.path.exists(backup_path):
+        os.remove(backup_path)
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+
+
+def _fsync_directory(path):
+    # Rend le renommage durable (POSIX) ; sans effet là où ce n'est pas possible
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
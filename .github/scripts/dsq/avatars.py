@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+"""
+Miniatures des avatars, servies depuis le dépôt au lieu des avatars GitHub
+en taille réelle redimensionnés par le navigateur.
+
+Pipeline (optionnel, activé par DSQ_AVATARS=1) :
+1. téléchargement, en parallèle, des avatars inconnus dans un cache local
+   adressé par URL (.avatar-cache/, non versionné). L'URL d'un avatar porte sa
+   version (?v=4) : une URL déjà traitée n'est jamais retéléchargée ;
+2. génération des miniatures dans un pool de processus (Pillow : recadrage
+   carré, redimensionnement, JPEG). Sans Pillow, l'avatar est demandé
+   directement à la bonne taille au service d'avatars (paramètre s=) et
+   copié tel quel ;
+3. écriture dans img/avatars/, sous le nom de l'empreinte du contenu (deux
+   URL donnant la même image partagent le même fichier).
+
+La correspondance URL -> fichier est conservée dans la section réservée
+"_avatars" du cache ; le rendu de PARTICIPANTS.md l'utilise pour pointer les
+<img> vers les miniatures. Les miniatures qui ne sont plus référencées sont
+supprimées. Une grille de sprites n'est pas utilisable ici : GitHub retire
+les attributs style du markdown, d'où un répertoire d'images.
+"""
+
+import io
+import os
+import hashlib
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Pipeline activé (sinon les avatars GitHub sont utilisés directement)
+AVATARS_ENABLED = os.environ.get("DSQ_AVATARS", "0") == "1"
+
+# Miniatures versionnées avec le dépôt (relatif à la racine du repo)
+AVATARS_DIR = os.path.join("img", "avatars")
+
+# Avatars originaux téléchargés (non versionné, restauré par actions/cache)
+AVATAR_CACHE_DIR = os.environ.get("DSQ_AVATAR_CACHE_DIR", ".avatar-cache")
+
+# Côté des miniatures en pixels (2x la plus grande taille affichée, 70 px)
+AVATAR_SIZE = int(os.environ.get("DSQ_AVATAR_SIZE", "140"))
+
+# Clé réservée du cache
+AVATARS_CACHE_KEY = "_avatars"
+
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_TIMEOUT = 30
+
+JPEG_QUALITY = 85
+
+_CONTENT_TYPES = {"image/png": ".png", "image/jpeg": ".jpg", "image/gif": ".gif"}
+
+
+def sized_url(avatar_url, size=AVATAR_SIZE):
+    """URL de l'avatar à la taille `size` (paramètre s= du service d'avatars)."""
+    parts = urllib.parse.urlsplit(avatar_url)
+    query = [(k, v) for k, v in urllib.parse.parse_qsl(parts.query) if k != "s"]
+    query.append(("s", str(size)))
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def _cache_path(avatar_url):
+    key = hashlib.sha256(avatar_url.encode("utf-8")).hexdigest()
+    return os.path.join(AVATAR_CACHE_DIR, key)
+
+
+def download_avatar(avatar_url, size=AVATAR_SIZE):
+    """
+    Télécharge l'avatar dans le cache local (une seule fois par URL).
+    Renvoie (chemin, extension) ou lève une exception.
+    """
+    path = _cache_path(avatar_url)
+    for ext in _CONTENT_TYPES.values():
+        if os.path.exists(path + ext):
+            return path + ext, ext
+
+    with urllib.request.urlopen(
+        sized_url(avatar_url, size), timeout=DOWNLOAD_TIMEOUT
+    ) as response:
+        content_type = response.headers.get_content_type()
+        data = response.read()
+    ext = _CONTENT_TYPES.get(content_type, ".png")
+    os.makedirs(AVATAR_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}{ext}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path + ext)
+    return path + ext, ext
+
+
+def make_thumbnail(source, ext, size=AVATAR_SIZE):
+    """
+    Miniature de `source` (exécuté dans le pool de processus).
+    Renvoie (octets, extension).
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        # Pas de Pillow : l'avatar a déjà été demandé à la bonne taille
+        with open(source, "rb") as f:
+            return f.read(), ext
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        side = min(image.size)
+        left = (image.width - side) // 2
+        top = (image.height - side) // 2
+        image = image.crop((left, top, left + side, top + side))
+        if side > size:
+            image = image.resize((size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    return buffer.getvalue(), ".jpg"
+
+
+def _write_thumbnail(data, ext):
+    """Écrit la miniature sous le nom de l'empreinte de son contenu."""
+    name = hashlib.sha256(data).hexdigest()[:16] + ext
+    path = os.path.join(AVATARS_DIR, name)
+    if not os.path.exists(path):
+        os.makedirs(AVATARS_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return name
+
+
+def update_avatars(cache_data, participants, workers=None):
+    """
+    Met à jour les miniatures des participants. Seuls les avatars dont
+    l'URL est inconnue (nouvel utilisateur, nouvelle version) sont
+    retraités. Renvoie le nombre de miniatures générées.
+    """
+    section = cache_data.get(AVATARS_CACHE_KEY) or {}
+    files = dict(section.get("files", {}))
+    if section.get("size") != AVATAR_SIZE:
+        files = {}
+
+    urls = {user["avatar_url"] for user in participants if user.get("avatar_url")}
+    pending = sorted(
+        url
+        for url in urls
+        if url not in files or not os.path.exists(os.path.join(AVATARS_DIR, files[url]))
+    )
+
+    generated = 0
+    if pending:
+        print(f"Miniatures : {len(pending)} avatars à traiter...")
+        downloads = {}
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {url: executor.submit(download_avatar, url) for url in pending}
+            for url, future in futures.items():
+                try:
+                    downloads[url] = future.result()
+                except Exception as e:
+                    # L'avatar GitHub reste utilisé pour ce participant
+                    print(f"[WARN] Avatar {url} non téléchargé : {e}")
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                url: executor.submit(make_thumbnail, source, ext, AVATAR_SIZE)
+                for url, (source, ext) in downloads.items()
+            }
+            for url, future in futures.items():
+                try:
+                    files[url] = _write_thumbnail(*future.result())
+                    generated += 1
+                except Exception as e:
+                    print(f"[WARN] Miniature de {url} non générée : {e}")
+
+    # Participants partis ou avatars remplacés : miniatures orphelines
+    files = {url: name for url, name in files.items() if url in urls}
+    removed = 0
+    if os.path.isdir(AVATARS_DIR):
+        used = set(files.values())
+        for entry in os.scandir(AVATARS_DIR):
+            if entry.is_file() and entry.name not in used:
+                os.remove(entry.path)
+                removed += 1
+
+    new_section = {"size": AVATAR_SIZE, "files": dict(sorted(files.items()))}
+    if new_section != section:
+        cache_data[AVATARS_CACHE_KEY] = new_section
+    print(
+        f"Miniatures : {generated} générées, {removed} supprimées, "
+        f"{len(files)} au total dans {AVATARS_DIR}."
+    )
+    return generated
+
+
+def avatar_files(cache_data):
+    """URL d'avatar -> fichier de miniature, pour le rendu (vide si désactivé)."""
+    if not AVATARS_ENABLED:
+        return {}
+    section = cache_data.get(AVATARS_CACHE_KEY) or {}
+    if section.get("size") != AVATAR_SIZE:
+        return {}
+    return section.get("files", {})
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""
+Lecture / écriture du cache, commune aux deux scripts.
+
+Deux backends, choisis par DSQ_CACHE_BACKEND :
+- "json" (par défaut) : cache.json, lu et réécrit en entier ;
+- "sqlite" : cache.sqlite3 (dsq.sqlite_cache), lu à la demande et mis à jour
+  ligne par ligne. Il est créé à partir de cache.json s'il n'existe pas.
+
+Export JSON du cache SQLite (depuis la racine du dépôt) :
+    PYTHONPATH=.github/scripts python -m dsq.cache export [fichier]
+"""
+
+import os
+import sys
+import json
+
+from .atomic import atomic_write
+from .migrations import migrate
+from .telemetry import timed
+
+# Fichier de cache
+CACHE_FILE = "cache.json"
+
+# Version précédente de CACHE_FILE, conservée à chaque sauvegarde
+CACHE_BACKUP_FILE = f"{CACHE_FILE}.bak"
+
+# Backend de stockage du cache : "json" ou "sqlite"
+CACHE_BACKEND = os.environ.get("DSQ_CACHE_BACKEND", "json")
+
+# Base SQLite utilisée par le backend "sqlite"
+CACHE_DB = os.environ.get("DSQ_CACHE_DB", "cache.sqlite3")
+
+
+class JsonCacheBackend:
+    """Cache complet dans CACHE_FILE, lu et réécrit en entier à chaque run."""
+
+    def load(self, create_missing=True):
+        if not os.path.exists(CACHE_FILE):
+            if not create_missing:
+                print(f"[ERROR] Cache file '{CACHE_FILE}' not found. Aborting.")
+                sys.exit(1)
+            print(
+                f"[DEBUG] Cache file '{CACHE_FILE}' not found. Creating it now in {os.getcwd()}."
+            )
+            # On crée un nouveau fichier de cache vide
+            with open(CACHE_FILE, "w", encoding="utf-8") as f:
+                f.write("{}")  # on met simplement un JSON vide
+            return {}
+
+        try:
+            with open(CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            data = self._recover(e)
+        print(
+            f"[DEBUG] Cache file '{CACHE_FILE}' loaded successfully from {os.path.join(os.getcwd(), CACHE_FILE)}."
+        )
+        return data
+
+    def _recover(self, error):
+        """
+        Cache illisible : on repart de la sauvegarde précédente si elle est
+        valide. Sinon on s'arrête, sans jamais remplacer le cache par un dict
+        vide (tout redemander à l'API épuiserait le quota).
+        """
+        corrupt_file = f"{CACHE_FILE}.corrupt"
+        os.replace(CACHE_FILE, corrupt_file)
+        print(f"[WARN] {CACHE_FILE} is invalid ({error}), moved to '{corrupt_file}'.")
+        try:
+            with open(CACHE_BACKUP_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ERROR] No usable backup in '{CACHE_BACKUP_FILE}' ({e}). Aborting.")
+            sys.exit(1)
+        print(f"[WARN] Recovered the cache from '{CACHE_BACKUP_FILE}'.")
+        return data
+
+    def save(self, cache_data):
+        # On écrit dans un fichier temporaire (fsync) puis on le renomme : une
+        # écriture interrompue ne laisse jamais un cache tronqué.
+        print(
+            f"[DEBUG] Saving cache file '{CACHE_FILE}' to {os.path.join(os.getcwd(), CACHE_FILE)}."
+        )
+        with atomic_write(CACHE_FILE, backup_path=CACHE_BACKUP_FILE) as f:
+            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+
+
+class SqliteCacheBackend:
+    """Cache dans la base CACHE_DB, entrées lues à la demande et écrites ligne par ligne."""
+
+    def load(self, create_missing=True):
+        from .sqlite_cache import SqliteCache
+
+        exists = os.path.exists(CACHE_DB)
+        if not exists and not os.path.exists(CACHE_FILE) and not create_missing:
+            print(f"[ERROR] Cache database '{CACHE_DB}' not found. Aborting.")
+            sys.exit(1)
+
+        cache = SqliteCache(CACHE_DB)
+        if not exists and os.path.exists(CACHE_FILE):
+            # Première utilisation : reprise du cache JSON existant
+            rows = cache.import_dict(JsonCacheBackend().load())
+            print(
+                f"[DEBUG] Imported {rows} entries from '{CACHE_FILE}' into '{CACHE_DB}'."
+            )
+        print(f"[DEBUG] Cache database '{CACHE_DB}' opened.")
+        return cache
+
+    def save(self, cache_data):
+        rows = cache_data.flush()
+        print(f"[DEBUG] Saved {rows} changed entries to '{CACHE_DB}'.")
+
+
+BACKENDS = {
+    "json": JsonCacheBackend,
+    "sqlite": SqliteCacheBackend,
+}
+
+
+def get_backend():
+    """Backend de cache configuré par DSQ_CACHE_BACKEND."""
+    if CACHE_BACKEND not in BACKENDS:
+        print(
+            f"[ERROR] Unknown cache backend '{CACHE_BACKEND}' "
+            f"(expected one of: {', '.join(BACKENDS)})."
+        )
+        sys.exit(1)
+    return BACKENDS[CACHE_BACKEND]()
+
+
+@timed()
+def load_cache(create_missing=True):
+    """Charge le cache avec le backend configuré et le migre vers la version
+    courante du schéma. S'il n'existe pas, il est créé vide (ou le script
+    s'arrête si create_missing est faux)."""
+    cache_data = get_backend().load(create_missing)
+    migrate(cache_data)
+    return cache_data
+
+
+@timed()
+def save_cache(cache_data):
+    """Sauvegarde le cache avec le backend configuré."""
+    get_backend().save(cache_data)
+
+
+def export_json(cache_data, path=CACHE_FILE):
+    """Écrit le cache (quel que soit son backend) au format de cache.json."""
+    with atomic_write(path) as f:
+        json.dump(dict(cache_data.items()), f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    """Usage : python -m dsq.cache export [fichier]"""
+    args = sys.argv[1:] if argv is None else argv
+    if not args or args[0] != "export" or len(args) > 2:
+        print(main.__doc__)
+        sys.exit(2)
+    path = args[1] if len(args) > 1 else CACHE_FILE
+    export_json(load_cache(create_missing=False), path)
+    print(f"[DEBUG] Cache exported to '{path}'.")
+
+
+if __name__ == "__main__":
+    main()
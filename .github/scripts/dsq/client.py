@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Construction paresseuse des clients GitHub.
+
+PyGithub (et toute la pile requests/urllib3) n'est importé qu'au premier
+appel de get_github() / get_client(). Le token n'est donc exigé que par les
+commandes qui touchent réellement au réseau.
+"""
+
+import os
+import sys
+import threading
+
+# URL de l'API GitHub (surchargeable pour pointer vers un serveur local)
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+_client = None
+_client_lock = threading.Lock()
+
+# Les connexions PyGithub ne sont pas thread-safe : chaque thread du pool
+# utilise son propre client.
+_thread_local = threading.local()
+
+
+def _get_token():
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token:
+        print("ERREUR: Variable d'environnement GITHUB_TOKEN non définie ou vide.")
+        sys.exit(1)
+    return token
+
+
+def _build_client():
+    from github import Github
+    from urllib3.util.retry import Retry
+
+    from .connections import install_connections
+    from .http_cache import install_http_cache
+
+    # Cache HTTP conditionnel (ETag / Last-Modified) et suivi des quotas
+    # core/search/graphql, partagés par tous les clients du processus
+    install_http_cache()
+    install_connections()
+
+    # Les erreurs serveur transitoires restent gérées par urllib3 ; les 403/429
+    # de quota sont laissés à l'ordonnanceur de dsq.rate_limit.
+    transient_retry = Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET", "POST"),
+        raise_on_status=False,
+    )
+    return Github(_get_token(), base_url=GITHUB_API_URL, retry=transient_retry)
+
+
+def get_github():
+    """Client GitHub principal, construit au premier appel."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def get_client():
+    """Renvoie le client GitHub propre au thread courant."""
+    if threading.current_thread() is threading.main_thread():
+        return get_github()
+    client = getattr(_thread_local, "client", None)
+    if client is None:
+        # Le client principal installe les connexions partagées une seule fois
+        get_github()
+        client = _build_client()
+        _thread_local.client = client
+    return client
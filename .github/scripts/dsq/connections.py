@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Classes de connexion injectées dans PyGithub : chaque requête passe par
+l'ordonnanceur de quotas (dsq.rate_limit) puis par le cache HTTP
+conditionnel (dsq.http_cache), et est comptée par endpoint (dsq.telemetry).
+Module importé uniquement par dsq.client, au moment de construire le premier
+client.
+"""
+
+import threading
+
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+
+from .http_cache import CachedResponse, cached_getresponse
+from .rate_limit import scheduled_getresponse
+from .telemetry import record_api_call
+
+# Sessions requests réutilisées par thread, pour garder le keep-alive même si
+# PyGithub recrée un objet connexion à chaque requête une fois les classes injectées.
+_sessions = threading.local()
+
+
+class _DsqConnectionMixin:
+    def _reuse_session(self):
+        pool = getattr(_sessions, "pool", None)
+        if pool is None:
+            pool = _sessions.pool = {}
+        key = (self.protocol, self.host, self.port)
+        if key in pool:
+            self.session = pool[key]
+        else:
+            pool[key] = self.session
+
+    def getresponse(self):
+        send = super().getresponse
+
+        def counted_send():
+            response = cached_getresponse(self, send)
+            # Une réponse rejouée depuis le cache HTTP a reçu un 304
+            status = 304 if isinstance(response, CachedResponse) else response.status
+            record_api_call(self.verb, self.url, status)
+            return response
+
+        return scheduled_getresponse(self, counted_send)
+
+    def close(self):
+        # La session est partagée par le thread, on ne la ferme pas ici
+        pass
+
+
+class DsqHTTPConnection(_DsqConnectionMixin, HTTPRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reuse_session()
+
+
+class DsqHTTPSConnection(_DsqConnectionMixin, HTTPSRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reuse_session()
+
+
+def install_connections():
+    """Fait passer toutes les requêtes PyGithub par l'ordonnanceur et le cache HTTP."""
+    Requester.injectConnectionClasses(DsqHTTPConnection, DsqHTTPSConnection)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Backend GraphQL : récupère un lot de participants en une seule requête aliasée
+(avatar, profil, dépôts avec langage/fork/dates/topics) au lieu des N+1 appels
+REST par utilisateur, ainsi que la liste paginée des forks du repo principal.
+"""
+
+import os
+from collections import namedtuple
+from datetime import datetime
+
+# --------------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------------
+
+# Nombre d'utilisateurs par requête GraphQL aliasée
+GRAPHQL_BATCH_SIZE = max(1, int(os.environ.get("DSQ_GRAPHQL_BATCH_SIZE", "10")))
+
+# Nombre de dépôts (ou de forks) demandés par page (100 maximum côté GitHub)
+GRAPHQL_PAGE_SIZE = min(100, max(1, int(os.environ.get("DSQ_GRAPHQL_PAGE_SIZE", "50"))))
+
+# Nombre maximal de topics lus par dépôt
+GRAPHQL_TOPICS_PER_REPO = 20
+
+GraphQLRepo = namedtuple(
+    "GraphQLRepo",
+    [
+        "name",
+        "url",
+        "language",
+        "fork",
+        "created_at",
+        "updated_at",
+        "pushed_at",
+        "topics",
+    ],
+)
+
+GraphQLUser = namedtuple(
+    "GraphQLUser",
+    [
+        "login",
+        "id",
+        "avatar_url",
+        "profile_url",
+        "created_at",
+        "updated_at",
+        "public_repos",
+        "repos",
+    ],
+)
+
+REPOSITORIES_FIELDS = """
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        url
+        isFork
+        primaryLanguage { name }
+        createdAt
+        updatedAt
+        pushedAt
+        repositoryTopics(first: %d) { nodes { topic { name } } }
+      }
+""" % GRAPHQL_TOPICS_PER_REPO
+
+
+def parse_datetime(value):
+    """Convertit une date GraphQL ("...Z") en datetime (compatible Python 3.10)."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _post(requester, query, variables):
+    """
+    Envoie une requête GraphQL. Contrairement à Requester.graphql_query, les
+    erreurs partielles (ex : un utilisateur supprimé) ne font pas échouer le lot.
+    """
+    _, data = requester.requestJsonAndCheck(
+        "POST",
+        requester.graphql_url,
+        input={"query": query, "variables": variables},
+    )
+    for error in data.get("errors") or []:
+        print(f"[WARN] GraphQL: {error.get('message')}")
+    return data.get("data") or {}
+
+
+def _repo_from_node(node):
+    return GraphQLRepo(
+        name=node["name"],
+        url=node["url"],
+        language=(node.get("primaryLanguage") or {}).get("name"),
+        fork=node["isFork"],
+        created_at=parse_datetime(node["createdAt"]),
+        updated_at=parse_datetime(node["updatedAt"]),
+        pushed_at=parse_datetime(node.get("pushedAt")),
+        topics=[t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]],
+    )
+
+
+# --------------------------------------------------------
+# UTILISATEURS PAR LOTS
+# --------------------------------------------------------
+
+
+def _users_query(aliases, with_profile):
+    """Construit la requête aliasée pour une liste de (alias, a_un_curseur)."""
+    params = []
+    blocks = []
+    for alias, has_cursor in aliases:
+        params.append(f"${alias}: String!")
+        after = ""
+        if has_cursor:
+            params.append(f"${alias}_after: String")
+            after = f", after: ${alias}_after"
+        profile = "login"
+        if with_profile:
+            profile = (
+                "login databaseId avatarUrl url createdAt updatedAt "
+                "publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) "
+                "{ totalCount }"
+            )
+        blocks.append(
+            f"  {alias}: user(login: ${alias}) {{\n"
+            f"    {profile}\n"
+            f"    repositories(first: {GRAPHQL_PAGE_SIZE}{after}, ownerAffiliations: OWNER) {{"
+            f"{REPOSITORIES_FIELDS}    }}\n"
+            f"  }}"
+        )
+    return f"query({', '.join(params)}) {{\n" + "\n".join(blocks) + "\n}"
+
+
+def fetch_users(requester, logins):
+    """
+    Récupère les profils et tous les dépôts des `logins`, par lots de
+    GRAPHQL_BATCH_SIZE. Renvoie un dict login -> GraphQLUser (les logins
+    introuvables sont absents du résultat).
+    """
+    users = {}
+    logins = list(logins)
+    for start in range(0, len(logins), GRAPHQL_BATCH_SIZE):
+        batch = logins[start : start + GRAPHQL_BATCH_SIZE]
+        aliases = {f"u{i}": login for i, login in enumerate(batch)}
+        query = _users_query([(alias, False) for alias in aliases], True)
+        data = _post(requester, query, dict(aliases))
+
+        cursors = {}
+        for alias, login in aliases.items():
+            node = data.get(alias)
+            if node is None:
+                print(f"[WARN] GraphQL: utilisateur {login} introuvable, ignoré.")
+                continue
+            repos_conn = node["repositories"]
+            users[login] = GraphQLUser(
+                login=node["login"],
+                id=node["databaseId"],
+                avatar_url=node["avatarUrl"],
+                profile_url=node["url"],
+                created_at=parse_datetime(node["createdAt"]),
+                updated_at=parse_datetime(node["updatedAt"]),
+                public_repos=node["publicRepos"]["totalCount"],
+                repos=[_repo_from_node(n) for n in repos_conn["nodes"]],
+            )
+            if repos_conn["pageInfo"]["hasNextPage"]:
+                cursors[alias] = repos_conn["pageInfo"]["endCursor"]
+
+        # Pages suivantes : seuls les utilisateurs ayant encore des dépôts
+        # sont redemandés, toujours dans une seule requête aliasée
+        while cursors:
+            query = _users_query([(alias, True) for alias in cursors], False)
+            variables = {}
+            for alias, cursor in cursors.items():
+                variables[alias] = aliases[alias]
+                variables[f"{alias}_after"] = cursor
+            data = _post(requester, query, variables)
+
+            next_cursors = {}
+            for alias in cursors:
+                node = data.get(alias)
+                if node is None:
+                    continue
+                repos_conn = node["repositories"]
+                login = aliases[alias]
+                users[login].repos.extend(
+                    _repo_from_node(n) for n in repos_conn["nodes"]
+                )
+                if repos_conn["pageInfo"]["hasNextPage"]:
+                    next_cursors[alias] = repos_conn["pageInfo"]["endCursor"]
+            cursors = next_cursors
+
+    return users
+
+
+# --------------------------------------------------------
+# FORKS DU REPO PRINCIPAL
+# --------------------------------------------------------
+
+FORKS_QUERY = """
+query($owner: String!, $name: String!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    forks(first: %d, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { createdAt owner { login } }
+    }
+  }
+}
+""" % GRAPHQL_PAGE_SIZE
+
+
+def fetch_forks(requester, owner, name, since=None):
+    """
+    Renvoie la liste des forks sous forme de tuples (login, date de création),
+    du plus récent au plus ancien comme l'API REST. Avec `since`, la pagination
+    s'arrête au premier fork plus ancien que cette date (le tout premier fork,
+    high-water mark de l'API, est toujours renvoyé).
+    """
+    forks = []
+    cursor = None
+    while True:
+        data = _post(
+            requester, FORKS_QUERY, {"owner": owner, "name": name, "after": cursor}
+        )
+        conn = data["repository"]["forks"]
+        for node in conn["nodes"]:
+            created_at = parse_datetime(node["createdAt"])
+            if since and created_at < since and forks:
+                return forks
+            forks.append((node["owner"]["login"], created_at))
+        if not conn["pageInfo"]["hasNextPage"]:
+            return forks
+        cursor = conn["pageInfo"]["endCursor"]
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache HTTP persistant (ETag / Last-Modified) branché sous le client PyGithub
+(voir dsq.connections).
+
+Chaque réponse GET de l'API est stockée sur disque avec son ETag et/ou sa date
+Last-Modified. Les requêtes suivantes sur la même URL sont rejouées en requêtes
+conditionnelles : un 304 est servi depuis le disque, ce qui ne consomme pas de
+quota d'API ni de bande passante.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# --------------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------------
+
+# Dossier du cache HTTP (restauré/sauvegardé par actions/cache dans les workflows)
+HTTP_CACHE_DIR = os.environ.get("DSQ_HTTP_CACHE_DIR", ".http-cache")
+
+# Taille maximale du cache sur disque, au-delà on évince les entrées les plus anciennes
+HTTP_CACHE_MAX_BYTES = int(
+    os.environ.get("DSQ_HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# En-têtes de réponse conservés avec le corps (Link est indispensable à la pagination)
+STORED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+# Instance active (une seule par processus)
+_cache = None
+
+# --------------------------------------------------------
+# STOCKAGE SUR DISQUE
+# --------------------------------------------------------
+
+
+class HttpCache:
+    """Cache de réponses sur disque, un fichier JSON par URL, éviction LRU."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        # clé -> taille, du moins récemment utilisé au plus récent
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                st = entry.stat()
+                files.append((st.st_mtime, entry.name[:-5], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def key_for(url, accept):
+        return hashlib.sha256(f"{accept}\n{url}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def lookup(self, key):
+        """Renvoie l'entrée stockée pour cette clé, ou None."""
+        if key not in self._entries:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self._forget(key)
+            return None
+
+    def record_hit(self, key):
+        with self._lock:
+            self.stats["hits"] += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def record_miss(self):
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def store(self, key, url, status, headers, body):
+        """Enregistre une réponse (écriture atomique) puis évince si besoin."""
+        payload = json.dumps(
+            {"url": url, "status": status, "headers": headers, "body": body},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total_bytes += len(payload) - self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _forget(self, key):
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+
+    def _evict(self):
+        # appelé avec self._lock déjà acquis
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def summary(self):
+        s = self.stats
+        total = s["hits"] + s["misses"]
+        ratio = (s["hits"] / total * 100) if total else 0
+        return (
+            f"Cache HTTP : {s['hits']} hits (304), {s['misses']} misses "
+            f"({ratio:.0f}% hits), {s['stores']} réponses stockées, "
+            f"{s['evictions']} évincées, {self._total_bytes // 1024} Ko sur disque"
+        )
+
+
+# --------------------------------------------------------
+# REQUÊTES CONDITIONNELLES
+# --------------------------------------------------------
+
+
+class CachedResponse:
+    """Réponse rejouée depuis le disque, avec l'interface attendue par PyGithub."""
+
+    def __init__(self, entry, fresh_headers):
+        self.status = entry["status"]
+        self.headers = dict(fresh_headers)
+        self.headers.update(entry["headers"])
+        self.text = entry["body"]
+
+    def getheaders(self):
+        return self.headers.items()
+
+    def read(self):
+        return self.text
+
+
+def cached_getresponse(connection, send):
+    """
+    Envoie la requête préparée sur `connection` (objet connexion PyGithub)
+    via `send()`, en la rendant conditionnelle si l'URL est déjà en cache.
+    """
+    if _cache is None or connection.verb != "GET" or connection.stream:
+        return send()
+
+    url = f"{connection.protocol}://{connection.host}:{connection.port}{connection.url}"
+    key = _cache.key_for(url, connection.headers.get("Accept", ""))
+    entry = _cache.lookup(key)
+    if entry:
+        connection.headers = dict(connection.headers)
+        etag = entry["headers"].get("etag")
+        last_modified = entry["headers"].get("last-modified")
+        if etag:
+            connection.headers["If-None-Match"] = etag
+        if last_modified:
+            connection.headers["If-Modified-Since"] = last_modified
+
+    response = send()
+
+    if entry and response.status == 304:
+        _cache.record_hit(key)
+        return CachedResponse(entry, response.getheaders())
+
+    _cache.record_miss()
+    if response.status == 200:
+        headers = {
+            k.lower(): v
+            for k, v in response.getheaders()
+            if k.lower() in STORED_HEADERS
+        }
+        if "etag" in headers or "last-modified" in headers:
+            _cache.store(key, url, response.status, headers, response.read())
+    return response
+
+
+def install_http_cache(directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+    """
+    Active le cache HTTP pour tous les clients Github créés dans ce processus
+    (branché par dsq.connections). Désactivable avec DSQ_HTTP_CACHE=0.
+    Renvoie l'instance HttpCache (ou None).
+    """
+    global _cache
+    if os.environ.get("DSQ_HTTP_CACHE", "1") == "0":
+        return None
+    if _cache is None:
+        _cache = HttpCache(directory, max_bytes)
+        print(
+            f"[DEBUG] HTTP cache enabled in '{directory}' "
+            f"({len(_cache._entries)} entries, max {max_bytes // (1024 * 1024)} MB)."
+        )
+    return _cache
+
+
+def http_cache_summary():
+    """Résumé des compteurs du cache HTTP, pour le récapitulatif de fin de run."""
+    if _cache is None:
+        return "Cache HTTP : désactivé"
+    return _cache.summary()
+
+
+def http_cache_stats():
+    """Compteurs du cache HTTP pour le rapport de run (None si désactivé)."""
+    if _cache is None:
+        return None
+    with _cache._lock:
+        return dict(_cache.stats, bytes_on_disk=_cache._total_bytes)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Score des langages d'un utilisateur, partagé par les deux scripts.
+
+Les dépôts sont consommés au fil de la pagination (aucune liste complète en
+mémoire) et les poids sont accumulés directement par langage :
+x3 pour un dépôt qui n'est pas un fork, x2 s'il a été mis à jour depuis moins
+de six mois. Le vecteur de poids est stocké dans le cache
+("language_weights") pour les statistiques de la communauté.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from .objects import get_user
+from .rate_limit import RateLimitDeferred, RateLimitExhausted
+from .telemetry import timed
+
+# Au-delà de cette part, le pourcentage est affiché avec le langage
+MAIN_LANGUAGE_LABEL_THRESHOLD = 15
+
+RECENT_ACTIVITY = timedelta(days=180)
+
+
+def score_repos(repos, now=None):
+    """
+    Renvoie un dict langage -> poids à partir d'un itérable de dépôts
+    (objets exposant .language, .fork et .updated_at).
+    """
+    now = now or datetime.now(timezone.utc)
+    six_months_ago = now - RECENT_ACTIVITY
+
+    weights = {}
+    for repo in repos:
+        if not repo.language:
+            continue
+        weight = 1
+        if not repo.fork:
+            weight *= 3
+        updated_at = repo.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        if updated_at > six_months_ago:
+            weight *= 2
+        weights[repo.language] = weights.get(repo.language, 0) + weight
+    return weights
+
+
+def main_language_label(weights):
+    """Libellé du langage principal ("C 37%", "Rust" ou "Aucune")."""
+    total = sum(weights.values())
+    if not total:
+        return "Aucune"
+
+    # En cas d'égalité, le premier langage rencontré l'emporte
+    lang, count = max(weights.items(), key=lambda item: item[1])
+    percentage = (count / total) * 100
+    if percentage > MAIN_LANGUAGE_LABEL_THRESHOLD:
+        return f"{lang} {int(percentage)}%"
+    return lang
+
+
+@timed()
+def determine_main_language(client, user_login):
+    """
+    Renvoie (langage principal, poids par langage) en parcourant les dépôts
+    de l'utilisateur au fil de la pagination.
+    """
+    try:
+        # Seule l'URL de l'utilisateur sert au listage de ses repos
+        user_obj = get_user(client, user_login, lazy=True)
+        weights = score_repos(user_obj.get_repos())
+        return main_language_label(weights), weights
+
+    except (RateLimitDeferred, RateLimitExhausted):
+        # Quota épuisé : on ne met pas en cache un "Aucune" erroné
+        raise
+    except Exception as e:
+        print(f"Erreur determine_main_language({user_login}): {e}")
+        return "Aucune", {}
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+"""
+Version du schéma du cache et migrations.
+
+Le cache porte son numéro de version dans la clé réservée "_version". Au
+chargement, les migrations plus récentes que cette version sont appliquées
+aux entrées utilisateur en une seule passe (chaque entrée passe par toutes
+les migrations en attente), au lieu de jeter le cache et de tout
+redemander à l'API.
+
+Pour faire évoluer le format : incrémenter SCHEMA_VERSION et ajouter une
+fonction décorée par @migration(SCHEMA_VERSION) qui met à jour une entrée
+en place.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+# Version courante du format du cache
+SCHEMA_VERSION = 1
+
+# Clé réservée portant la version
+VERSION_KEY = "_version"
+
+# Migrations d'entrée utilisateur, par version cible croissante
+_MIGRATIONS = []
+
+
+def is_user_key(key):
+    """Les sections réservées du cache ("_forks", "_global_search"...) ne sont
+    pas des utilisateurs : un login GitHub ne commence jamais par "_"."""
+    return not key.startswith("_")
+
+
+def migration(version):
+    """Enregistre une migration fn(login, user_info) amenant une entrée à `version`."""
+
+    def register(fn):
+        _MIGRATIONS.append((version, fn))
+        _MIGRATIONS.sort(key=lambda item: item[0])
+        return fn
+
+    return register
+
+
+def migrate(cache_data):
+    """
+    Met le cache à jour vers SCHEMA_VERSION. Renvoie True si des migrations ont
+    été appliquées. Un cache écrit par une version plus récente des scripts
+    arrête le run, pour ne pas l'écraser avec un format plus ancien.
+    """
+    current = cache_data.get(VERSION_KEY, 0)
+    if current == SCHEMA_VERSION:
+        return False
+    if current > SCHEMA_VERSION:
+        print(
+            f"[ERROR] Cache schema version {current} is newer than supported "
+            f"version {SCHEMA_VERSION}. Aborting."
+        )
+        sys.exit(1)
+
+    pending = [(version, fn) for version, fn in _MIGRATIONS if version > current]
+    migrated = 0
+    for key in list(cache_data):
+        if not is_user_key(key):
+            continue
+        user_info = cache_data[key]
+        for version, fn in pending:
+            fn(key, user_info)
+        migrated += 1
+
+    cache_data[VERSION_KEY] = SCHEMA_VERSION
+    print(
+        f"[INFO] Cache migrated from schema version {current} to {SCHEMA_VERSION} "
+        f"({migrated} entries)."
+    )
+    return True
+
+
+# --------------------------------------------------------
+# MIGRATIONS
+# --------------------------------------------------------
+
+
+@migration(1)
+def complete_legacy_entries(user_login, user_info):
+    """
+    Entrées antérieures au versionnage : champs obligatoires manquants, et
+    dates de fork sans fuseau (anciennes versions de PyGithub) qui ne peuvent
+    pas être comparées aux dates avec fuseau lors du tri.
+    """
+    user_info.setdefault("username", user_login)
+    user_info.setdefault("dsq_repos", [])
+    user_info.setdefault("main_language", "Aucune")
+
+    fork_date = user_info.get("fork_date")
+    if fork_date:
+        parsed = datetime.fromisoformat(fork_date)
+        if parsed.tzinfo is None:
+            user_info["fork_date"] = parsed.replace(tzinfo=timezone.utc).isoformat()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+Cache mémoire des objets PyGithub (utilisateurs, repos), limité à la durée
+du run et à DSQ_OBJECT_CACHE_SIZE entrées (LRU).
+
+Les objets PyGithub sont liés au client qui les a créés, et chaque thread du
+pool a son propre client (dsq.client) : on conserve donc les données brutes
+(raw_data) et l'objet est reconstruit, sans requête, sur le client du thread
+appelant.
+
+Avec lazy=True, l'appelant n'a besoin que de l'URL de l'objet (listage des
+repos d'un utilisateur, des forks d'un repo) : une entrée en cache est
+renvoyée si elle existe, sinon un objet paresseux est construit sans requête.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from .telemetry import count
+
+OBJECT_CACHE_SIZE = int(os.environ.get("DSQ_OBJECT_CACHE_SIZE", "1024"))
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "lazy": 0, "evictions": 0}
+
+
+def _record(name):
+    with _lock:
+        _stats[name] += 1
+    count(f"object_cache.{name}")
+
+
+def _lookup(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _store(key, obj):
+    entry = (type(obj), obj.raw_data, obj.raw_headers)
+    evicted = 0
+    with _lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > OBJECT_CACHE_SIZE:
+            _entries.popitem(last=False)
+            evicted += 1
+    for _ in range(evicted):
+        _record("evictions")
+
+
+def _get(client, key, fetch, make_lazy, lazy):
+    entry = _lookup(key)
+    if entry is not None:
+        _record("hits")
+        return client.create_from_raw_data(*entry)
+    if lazy:
+        _record("lazy")
+        return make_lazy()
+    _record("misses")
+    obj = fetch()
+    if OBJECT_CACHE_SIZE > 0:
+        _store(key, obj)
+    return obj
+
+
+def get_user(client, user_login, lazy=False):
+    """Utilisateur `user_login`, complet (une requête au plus par run) ou paresseux."""
+    return _get(
+        client,
+        ("user", user_login.lower()),
+        lambda: client.get_user(user_login),
+        lambda: client.get_user(user_login, lazy=True),
+        lazy,
+    )
+
+
+def get_repo(client, full_name, lazy=False):
+    """Repo "owner/name", complet (une requête au plus par run) ou paresseux."""
+    from github.Repository import Repository
+
+    return _get(
+        client,
+        ("repo", full_name.lower()),
+        lambda: client.get_repo(full_name),
+        lambda: Repository(client.requester.withLazy(True), url=f"/repos/{full_name}"),
+        lazy,
+    )
+
+
+def object_cache_stats():
+    """Compteurs du cache d'objets pour le rapport de run."""
+    with _lock:
+        return dict(_stats, entries=len(_entries), max_entries=OBJECT_CACHE_SIZE)
+
+
+def object_cache_summary():
+    """Résumé du cache d'objets, pour le récapitulatif de fin de run."""
+    s = object_cache_stats()
+    total = s["hits"] + s["misses"]
+    ratio = (s["hits"] / total * 100) if total else 0
+    return (
+        f"Cache d'objets : {s['hits']} hits, {s['misses']} misses "
+        f"({ratio:.0f}% de hits), {s['lazy']} objets paresseux, "
+        f"{s['evictions']} évictions ({s['entries']}/{s['max_entries']} entrées)"
+    )
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""
+Statistiques par quête : participants, repos, distribution des temps de
+complétion (moyenne, médiane, 90e centile) et langages utilisés.
+
+Tout est calculé en une passe sur les agrégats de l'index des statistiques
+(dsq.stats_index), sans relire les participants : les dates de création y
+sont déjà triées par quête, les centiles se lisent donc directement.
+Les métadonnées (titre, fiche, niveau, temps max) viennent du catalogue des
+quêtes (dsq.quests).
+"""
+
+from .quests import quest_sort_key
+from .telemetry import timed
+
+# Nombre de langages affichés par quête
+TOP_LANGUAGES = 3
+
+
+def percentile(sorted_values, fraction):
+    """Centile d'une liste triée, par interpolation linéaire."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+@timed()
+def quest_stats(index, catalogue, now=None):
+    """
+    Liste des statistiques par quête, dans l'ordre des numéros de quête.
+    Les quêtes du catalogue sans participant y figurent aussi.
+    """
+    completion = index.completion_days(now)
+    participants = index.quest_participants()
+    repos = index.quest_repos()
+    languages = index.quest_languages()
+
+    quest_ids = sorted(catalogue.keys() | participants.keys(), key=quest_sort_key)
+    results = []
+    for quest_id in quest_ids:
+        quest = catalogue.get(quest_id, {})
+        # Dates de création croissantes -> durées décroissantes
+        days = completion.get(quest_id, [])[::-1]
+        repo_languages = languages.get(quest_id, {})
+        top_languages = sorted(repo_languages.items(), key=lambda i: (-i[1], i[0]))
+        results.append(
+            {
+                "id": quest_id,
+                "title": quest.get("title", quest_id),
+                "file": quest.get("file"),
+                "level": quest.get("level"),
+                "max_days": quest.get("max_days"),
+                "participants": participants.get(quest_id, 0),
+                "repos": repos.get(quest_id, 0),
+                "completed": len(days),
+                "mean_days": sum(days) / len(days) if days else None,
+                "median_days": percentile(days, 0.5),
+                "p90_days": percentile(days, 0.9),
+                "languages": top_languages[:TOP_LANGUAGES],
+            }
+        )
+    return results
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+Catalogue des quêtes, lu depuis les fiches du dossier quests/.
+
+Chaque fiche `quests/dsqN_*.md` décrit une quête : le titre vient du premier
+titre markdown, les métadonnées de la liste "Informations de la quête"
+(niveau, temps max, classes suggérées, type).
+
+Les fiches ne sont analysées qu'une fois : le résultat est gardé dans la
+section réservée "_quests" du cache avec l'empreinte (SHA-256) du contenu de
+chaque fichier, et n'est recalculé que si ce contenu a changé. La date de
+modification, qui change à chaque checkout, n'est gardée qu'en mémoire pour
+le run : elle évite de relire une fiche inchangée depuis le dernier appel.
+"""
+
+import os
+import re
+import hashlib
+
+# Dossier des fiches de quêtes (relatif à la racine du repo)
+QUESTS_DIR = "quests"
+
+# Clé réservée du cache
+QUESTS_CACHE_KEY = "_quests"
+
+_QUEST_FILE_RE = re.compile(r"^(dsq\d+)[-_].*\.md$")
+_FIELD_RE = re.compile(r"^- \*\*(.+?)\*\*\s*:\s*(.*)$")
+
+# Libellés des fiches -> champs du catalogue
+_FIELDS = {
+    "Niveau": "level",
+    "Temps Max": "max_time",
+    "Classes Suggérées": "classes",
+    "Type": "type",
+}
+
+# Fiches analysées pendant le run :
+# {nom de fichier: {"stat": (mtime_ns, taille), "sha256", "quest"}}
+_parsed = {}
+
+
+def quest_sort_key(quest_id):
+    """Clé de tri des identifiants de quête (dsq2 avant dsq10)."""
+    suffix = quest_id[3:]
+    return (0, int(suffix), quest_id) if suffix.isdigit() else (1, 0, quest_id)
+
+
+def parse_quest(path, quest_id, text=None):
+    """Métadonnées d'une fiche de quête (`text` : son contenu, si déjà lu)."""
+    if text is None:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    lines = text.splitlines()
+
+    quest = {"id": quest_id, "title": quest_id, "file": path.replace(os.sep, "/")}
+    fields = {}
+    current = None
+    for line in lines:
+        if quest["title"] == quest_id and line.startswith("# "):
+            # "# 🌦️ DSQ #1 - Mini Weather Dashboard" -> "Mini Weather Dashboard"
+            quest["title"] = line[2:].split(" - ", 1)[-1].strip()
+            continue
+        match = _FIELD_RE.match(line)
+        if match:
+            current = _FIELDS.get(match.group(1).strip())
+            if current:
+                fields[current] = match.group(2).strip()
+        elif current and line.startswith("  ") and line.strip():
+            # Suite d'une valeur coupée sur plusieurs lignes
+            fields[current] += " " + line.strip()
+        else:
+            current = None
+
+    quest["level"] = fields.get("level")
+    quest["type"] = fields.get("type")
+    max_time = re.match(r"\d+", fields.get("max_time", ""))
+    quest["max_days"] = int(max_time.group()) if max_time else None
+    # "Python, JavaScript, Java (mais tout langage ...)" -> ["Python", ...]
+    classes = fields.get("classes", "").split("(", 1)[0]
+    quest["classes"] = [c.strip() for c in classes.split(",") if c.strip()]
+    return quest
+
+
+def load_catalogue(cache_data=None):
+    """
+    Catalogue des quêtes {id: métadonnées}, trié par numéro de quête. Avec
+    `cache_data`, les fiches déjà analysées lors d'un run précédent sont
+    reprises de la section "_quests" et la section est mise à jour.
+    """
+    section = (cache_data or {}).get(QUESTS_CACHE_KEY) or {}
+    parsed = {}
+    if os.path.isdir(QUESTS_DIR):
+        for entry in os.scandir(QUESTS_DIR):
+            match = _QUEST_FILE_RE.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            st = entry.stat()
+            stat = (st.st_mtime_ns, st.st_size)
+            memo = _parsed.get(entry.name)
+            if memo and memo["stat"] == stat:
+                parsed[entry.name] = memo
+                continue
+            with open(entry.path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            known = section.get(entry.name)
+            if known and known.get("sha256") == digest:
+                quest = known["quest"]
+            else:
+                quest = parse_quest(entry.path, match.group(1), data.decode("utf-8"))
+            parsed[entry.name] = {"stat": stat, "sha256": digest, "quest": quest}
+
+    _parsed.clear()
+    _parsed.update(parsed)
+    # Seul le contenu est enregistré : la section (et donc cache.json) ne
+    # change pas quand un checkout ne fait que toucher les fichiers
+    files = {
+        name: {"sha256": entry["sha256"], "quest": entry["quest"]}
+        for name, entry in parsed.items()
+    }
+    if cache_data is not None and files != section:
+        cache_data[QUESTS_CACHE_KEY] = files
+
+    quests = {}
+    for name in sorted(files):
+        quest = files[name]["quest"]
+        # Deux fiches pour la même quête : la première par ordre alphabétique
+        quests.setdefault(quest["id"], quest)
+    return {
+        quest_id: quests[quest_id] for quest_id in sorted(quests, key=quest_sort_key)
+    }
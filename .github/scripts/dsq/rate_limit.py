@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ordonnanceur des requêtes GitHub tenant compte des quotas d'API.
+
+Les quotas core, search et graphql sont suivis séparément à partir des
+en-têtes X-RateLimit-* de chaque réponse. Les requêtes de faible priorité
+(rafraîchissements différables) sont refusées quand le quota restant passe
+sous une réserve, pour garder le budget aux appels nécessaires à
+PARTICIPANTS.md. Les limites secondaires déclenchent une pause commune à
+tous les threads, avec backoff exponentiel, au lieu de réessayer en boucle.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# --------------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------------
+
+CORE = "core"
+SEARCH = "search"
+GRAPHQL = "graphql"
+
+HIGH_PRIORITY = "high"
+LOW_PRIORITY = "low"
+
+# Part de chaque quota réservée aux requêtes prioritaires
+LOW_PRIORITY_RESERVE = float(os.environ.get("DSQ_LOW_PRIORITY_RESERVE", "0.2"))
+
+# Attente maximale (en secondes) acceptée pour un reset de quota ou une pause
+RATE_LIMIT_MAX_WAIT = float(os.environ.get("DSQ_RATE_LIMIT_MAX_WAIT", "300"))
+
+# Premier délai de backoff sur une limite secondaire sans Retry-After
+SECONDARY_BASE_DELAY = 60
+
+# Nombre maximal de tentatives pour une même requête
+MAX_ATTEMPTS = 5
+
+
+class RateLimitDeferred(Exception):
+    """Requête de faible priorité refusée : à reporter au prochain run."""
+
+
+class RateLimitExhausted(Exception):
+    """Quota épuisé et reset trop lointain pour être attendu."""
+
+
+# --------------------------------------------------------
+# PRIORITÉ DU THREAD COURANT
+# --------------------------------------------------------
+
+_priority = threading.local()
+
+
+def current_priority():
+    return getattr(_priority, "value", HIGH_PRIORITY)
+
+
+@contextmanager
+def low_priority():
+    """Les requêtes émises dans ce bloc peuvent être reportées au prochain run."""
+    previous = current_priority()
+    _priority.value = LOW_PRIORITY
+    try:
+        yield
+    finally:
+        _priority.value = previous
+
+
+# --------------------------------------------------------
+# ORDONNANCEUR
+# --------------------------------------------------------
+
+
+def resource_for(url):
+    """Quota consommé par une URL de l'API."""
+    path = url.split("?", 1)[0]
+    if path.endswith("/graphql"):
+        return GRAPHQL
+    if "/search/" in path:
+        return SEARCH
+    return CORE
+
+
+class RateLimitScheduler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # ressource -> {"limit", "remaining", "reset"} (reset en timestamp epoch)
+        self.budgets = {}
+        self.paused_until = 0.0
+        self._secondary_streak = 0
+        self.stats = {"requests": 0, "waits": 0, "waited_seconds": 0, "deferred": 0}
+
+    def _sleep(self, seconds):
+        with self._lock:
+            self.stats["waits"] += 1
+            self.stats["waited_seconds"] += seconds
+        time.sleep(seconds)
+
+    def before_request(self, resource):
+        """
+        Bloque jusqu'à ce que la requête puisse partir, ou lève
+        RateLimitDeferred / RateLimitExhausted.
+        """
+        priority = current_priority()
+        while True:
+            now = time.time()
+            with self._lock:
+                pause = self.paused_until - now
+                budget = self.budgets.get(resource)
+                wait = 0
+                if pause <= 0 and budget is not None:
+                    if now >= budget["reset"]:
+                        # fenêtre expirée : le quota est de nouveau plein
+                        budget["remaining"] = budget["limit"]
+                    reserve = 0
+                    if priority == LOW_PRIORITY:
+                        reserve = int(budget["limit"] * LOW_PRIORITY_RESERVE)
+                    if budget["remaining"] <= reserve:
+                        wait = budget["reset"] - now + 1
+                    else:
+                        # réservation optimiste, corrigée par les en-têtes de la réponse
+                        budget["remaining"] -= 1
+                        self.stats["requests"] += 1
+                        return
+                elif pause <= 0:
+                    self.stats["requests"] += 1
+                    return
+                else:
+                    wait = pause
+
+            if priority == LOW_PRIORITY:
+                with self._lock:
+                    self.stats["deferred"] += 1
+                raise RateLimitDeferred(
+                    f"quota {resource} réservé aux requêtes prioritaires"
+                )
+            if wait > RATE_LIMIT_MAX_WAIT:
+                raise RateLimitExhausted(
+                    f"quota {resource} épuisé, reset dans {int(wait)}s"
+                )
+            print(f"[INFO] Quota {resource} : pause de {wait:.1f}s.")
+            self._sleep(wait)
+
+    def after_response(self, resource, status, headers, body):
+        """
+        Met à jour les quotas à partir de la réponse. Renvoie le délai à
+        attendre avant de réessayer (limite atteinte), ou None. Lève
+        RateLimitExhausted si ce délai dépasse RATE_LIMIT_MAX_WAIT.
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        now = time.time()
+        with self._lock:
+            if "x-ratelimit-remaining" in headers:
+                resource = headers.get("x-ratelimit-resource", resource)
+                remaining = int(headers["x-ratelimit-remaining"])
+                reset = float(headers.get("x-ratelimit-reset", now))
+                budget = self.budgets.get(resource)
+                if budget is not None and reset <= budget["reset"]:
+                    # Même fenêtre : l'en-tête ne tient pas compte des requêtes
+                    # parties depuis, déjà réservées dans budget["remaining"]
+                    remaining = min(remaining, budget["remaining"])
+                    reset = budget["reset"]
+                self.budgets[resource] = {
+                    "limit": int(headers.get("x-ratelimit-limit", 0)),
+                    "remaining": remaining,
+                    "reset": reset,
+                }
+
+            if status not in (403, 429):
+                self._secondary_streak = 0
+                return None
+
+            text = body.lower() if isinstance(body, str) else ""
+            if "retry-after" in headers or "secondary rate limit" in text:
+                # Limite secondaire : pause commune, backoff exponentiel
+                delay = float(
+                    headers.get(
+                        "retry-after",
+                        SECONDARY_BASE_DELAY * 2**self._secondary_streak,
+                    )
+                )
+                self._secondary_streak += 1
+            elif headers.get("x-ratelimit-remaining") == "0":
+                delay = float(headers.get("x-ratelimit-reset", now)) - now + 1
+            else:
+                return None
+
+            if delay > RATE_LIMIT_MAX_WAIT:
+                # Laisser passer la 403 ferait lever à PyGithub une exception
+                # que les appelants ne traitent pas comme un report
+                raise RateLimitExhausted(
+                    f"quota {resource} épuisé ({status}), reset dans {int(delay)}s"
+                )
+            self.paused_until = max(self.paused_until, now + delay)
+            return delay
+
+    def summary(self):
+        parts = []
+        for resource in sorted(self.budgets):
+            b = self.budgets[resource]
+            parts.append(f"{resource} {b['remaining']}/{b['limit']}")
+        s = self.stats
+        return (
+            f"Quotas API : {', '.join(parts) or 'inconnus'} ; "
+            f"{s['requests']} requêtes, {s['waits']} pauses "
+            f"({int(s['waited_seconds'])}s), {s['deferred']} reportées"
+        )
+
+
+_scheduler = RateLimitScheduler()
+
+
+# --------------------------------------------------------
+# REQUÊTES ORDONNANCÉES
+# --------------------------------------------------------
+
+
+def scheduled_getresponse(connection, send):
+    """
+    Envoie la requête préparée sur `connection` via `send()` une fois le
+    quota disponible, et la rejoue après une pause si une limite est atteinte.
+    """
+    resource = resource_for(connection.url)
+    for _ in range(MAX_ATTEMPTS):
+        _scheduler.before_request(resource)
+        response = send()
+        delay = _scheduler.after_response(
+            resource, response.status, dict(response.getheaders()), response.read()
+        )
+        if delay is None:
+            return response
+        print(
+            f"[WARN] Limite de quota ({response.status}), nouvel essai dans {delay:.1f}s."
+        )
+    raise RateLimitExhausted(
+        f"quota {resource} : toujours limité après {MAX_ATTEMPTS} tentatives"
+    )
+
+
+def rate_limit_summary():
+    """Résumé des quotas restants et des reports, pour le récapitulatif de fin de run."""
+    return _scheduler.summary()
+
+
+def rate_limit_stats():
+    """Quotas restants et compteurs de l'ordonnanceur, pour le rapport de run."""
+    with _scheduler._lock:
+        return {
+            "budgets": {
+                resource: {
+                    "limit": budget["limit"],
+                    "remaining": budget["remaining"],
+                    "reset": datetime.fromtimestamp(
+                        budget["reset"], timezone.utc
+                    ).isoformat(),
+                }
+                for resource, budget in sorted(_scheduler.budgets.items())
+            },
+            **_scheduler.stats,
+        }
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Politique de rafraîchissement des entrées du cache.
+
+Une entrée n'est recalculée (liste des dépôts + langage principal) que si
+elle est due : jamais rafraîchie, empreinte des dépôts modifiée (date de mise
+à jour du profil / nombre de dépôts publics), ou TTL dépassé. Le TTL reçoit
+un décalage déterministe par utilisateur pour étaler les rafraîchissements
+sur plusieurs semaines plutôt que de tout recalculer le même jour.
+"""
+
+import os
+import hashlib
+from datetime import datetime, timedelta
+
+# Durée de validité d'un rafraîchissement complet
+REFRESH_TTL = timedelta(days=float(os.environ.get("DSQ_REFRESH_TTL_DAYS", "30")))
+
+# Décalage maximal ajouté au TTL, propre à chaque utilisateur
+REFRESH_JITTER = timedelta(days=float(os.environ.get("DSQ_REFRESH_JITTER_DAYS", "7")))
+
+
+def repos_fingerprint(public_repos, updated_at):
+    """Empreinte bon marché du portfolio, lue depuis le seul profil utilisateur."""
+    updated = updated_at.isoformat() if updated_at else ""
+    return f"{public_repos}|{updated}"
+
+
+def jitter_for(user_login):
+    """Décalage stable dans [0, REFRESH_JITTER), dérivé du login."""
+    digest = int(hashlib.sha256(user_login.encode("utf-8")).hexdigest(), 16)
+    return timedelta(seconds=digest % max(1, int(REFRESH_JITTER.total_seconds())))
+
+
+def refresh_reason(user_login, user_info, fingerprint, now):
+    """
+    Renvoie la raison pour laquelle l'entrée doit être recalculée,
+    ou None si elle est encore à jour.
+    """
+    last_refreshed = user_info.get("last_refreshed")
+    if not last_refreshed:
+        return "never refreshed"
+    if user_info.get("repos_fingerprint") != fingerprint:
+        return "repos changed"
+    if now - datetime.fromisoformat(last_refreshed) > REFRESH_TTL + jitter_for(
+        user_login
+    ):
+        return "ttl expired"
+    return None
+
+
+def mark_refreshed(user_info, fingerprint, now):
+    """Enregistre un rafraîchissement complet dans l'entrée du cache."""
+    user_info["last_refreshed"] = now.isoformat()
+    user_info["repos_fingerprint"] = fingerprint
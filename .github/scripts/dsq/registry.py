@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+Registre des participants, dédupliqué par identité GitHub.
+
+Les sources de participants (forks, participants additionnels) peuvent
+désigner plusieurs fois la même personne : un participant additionnel qui a
+aussi forké le repo, ou un login renommé dont l'ancien fork n'a pas encore
+disparu de la liste (les forks supprimés ne sont vus qu'au listage complet).
+Le registre fusionne toutes les sources en une passe : chaque participant
+est identifié par son id GitHub, stable malgré les renommages, ou par son
+login (insensible à la casse) pour les entrées du cache antérieures au
+stockage de l'id.
+
+Quand deux entrées du cache désignent la même personne, la plus récemment
+rafraîchie est conservée (à égalité, le plus petit login) et reçoit la date
+de fork la plus ancienne des deux : le résultat ne dépend pas de l'ordre des
+sources.
+"""
+
+from datetime import datetime
+
+
+def _fork_datetime(user):
+    return datetime.fromisoformat(user["fork_date"])
+
+
+def _prefer(user, kept):
+    """`user` doit-il remplacer `kept` (même personne, deux entrées du cache) ?"""
+    refreshed = user.get("last_refreshed", "")
+    kept_refreshed = kept.get("last_refreshed", "")
+    if refreshed != kept_refreshed:
+        return refreshed > kept_refreshed
+    # Logins ne différant que par la casse : départagés par le login exact
+    login, kept_login = user["username"], kept["username"]
+    return (login.lower(), login) < (kept_login.lower(), kept_login)
+
+
+def _keys(user):
+    keys = [("login", user["username"].lower())]
+    if user.get("id") is not None:
+        keys.insert(0, ("id", user["id"]))
+    return keys
+
+
+class ParticipantRegistry:
+    def __init__(self):
+        # identité -> entrée du cache retenue, dans l'ordre d'apparition
+        self._entries = {}
+        # id ou login (en minuscules) -> identité
+        self._aliases = {}
+        self.duplicates = 0
+
+    def add(self, user):
+        """
+        Ajoute une entrée du cache. Renvoie l'entrée retenue si elle a été
+        modifiée par la fusion (date de fork plus ancienne), sinon None.
+        """
+        keys = _keys(user)
+        # Identités déjà connues sous l'un des alias de l'entrée. Une entrée
+        # avec id peut en relier deux (son id, et son login vu sans id) :
+        # elles sont alors fusionnées dans la plus ancienne
+        identities = []
+        for key in keys:
+            identity = self._aliases.get(key)
+            if identity is not None and identity not in identities:
+                identities.append(identity)
+        if not identities:
+            for key in keys:
+                self._aliases[key] = keys[0]
+            self._entries[keys[0]] = user
+            return None
+
+        if len(identities) > 1:
+            order = list(self._entries)
+            identities.sort(key=order.index)
+        identity = identities[0]
+        for key in keys:
+            self._aliases.setdefault(key, identity)
+        changed = False
+        for other in identities[1:]:
+            for key, target in self._aliases.items():
+                if target == other:
+                    self._aliases[key] = identity
+            changed |= self._merge(identity, self._entries.pop(other))
+        changed |= self._merge(identity, user)
+        return self._entries[identity] if changed else None
+
+    def _merge(self, identity, user):
+        """
+        Fusionne `user` dans l'entrée retenue pour `identity`. Renvoie True si
+        la date de fork de l'entrée retenue a changé.
+        """
+        kept = self._entries[identity]
+        self.duplicates += 1
+        if kept is user:
+            return False
+        if _prefer(user, kept):
+            user, kept = kept, user
+            self._entries[identity] = kept
+        if _fork_datetime(user) < _fork_datetime(kept):
+            kept["fork_date"] = user["fork_date"]
+            return True
+        return False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, user_login):
+        return ("login", user_login.lower()) in self._aliases
+
+    def participants(self):
+        """Participants dédupliqués, dans l'ordre de première apparition."""
+        return list(self._entries.values())
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+
+"""
+Stockage du cache dans une base SQLite (module standard sqlite3).
+
+Chaque utilisateur est une ligne de la table `users` indexée par login,
+chaque section réservée ("_forks", "_global_search"...) une ligne de la table
+`sections`.
+Les entrées ne sont lues qu'à la demande, et seules les entrées modifiées
+sont réécrites lors de la sauvegarde.
+"""
+
+import json
+import sqlite3
+from collections.abc import MutableMapping
+
+from .migrations import is_user_key
+
+# Version du schéma, stockée dans PRAGMA user_version
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    login TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sections (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+-- Schéma 1 : index par date de fork et par quête, jamais interrogés (le
+-- rendu et les stats travaillent sur les entrées en mémoire). La colonne
+-- users.fork_date des bases existantes n'est plus ni lue ni écrite.
+DROP TABLE IF EXISTS user_quests;
+DROP INDEX IF EXISTS users_fork_date;
+"""
+
+
+class SqliteCache(MutableMapping):
+    """
+    Cache au format dict (mêmes clés et valeurs que cache.json) adossé à une
+    base SQLite. Les valeurs lues sont gardées en mémoire ; flush() compare
+    leur sérialisation avec celle lue en base et n'écrit que les différences.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        # Entrées lues ou ajoutées pendant le run, et leur sérialisation en base
+        self._entries = {}
+        self._stored = {}
+        self._deleted = set()
+
+    def _table_for(self, key):
+        if is_user_key(key):
+            return "SELECT data FROM users WHERE login = ?"
+        return "SELECT data FROM sections WHERE key = ?"
+
+    def __getitem__(self, key):
+        if key in self._entries:
+            return self._entries[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        row = self._conn.execute(self._table_for(key), (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = json.loads(row[0])
+        self._entries[key] = value
+        self._stored[key] = row[0]
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._entries.pop(key, None)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+        if key in self._entries:
+            return True
+        if key in self._deleted:
+            return False
+        return self._conn.execute(self._table_for(key), (key,)).fetchone() is not None
+
+    def _stored_keys(self):
+        for (key,) in self._conn.execute("SELECT key FROM sections"):
+            yield key
+        for (login,) in self._conn.execute("SELECT login FROM users"):
+            yield login
+
+    def __iter__(self):
+        seen = set()
+        for key in list(self._stored_keys()):
+            seen.add(key)
+            if key not in self._deleted:
+                yield key
+        for key in list(self._entries):
+            if key not in seen:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def items(self):
+        # Parcours complet : une seule requête par table plutôt qu'une par clé
+        self._load_all()
+        return super().items()
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def _load_all(self):
+        queries = ("SELECT key, data FROM sections", "SELECT login, data FROM users")
+        for query in queries:
+            for key, data in self._conn.execute(query):
+                if key not in self._entries and key not in self._deleted:
+                    self._entries[key] = json.loads(data)
+                    self._stored[key] = data
+
+    # ----------------------------------------------------
+    # Écriture
+    # ----------------------------------------------------
+
+    def _write_entry(self, key, data):
+        if is_user_key(key):
+            self._conn.execute(
+                "INSERT INTO users (login, data) VALUES (?, ?) "
+                "ON CONFLICT (login) DO UPDATE SET data = excluded.data",
+                (key, data),
+            )
+        else:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sections (key, data) VALUES (?, ?)",
+                (key, data),
+            )
+
+    def flush(self):
+        """
+        Enregistre les entrées ajoutées, modifiées ou supprimées, en une
+        transaction. Renvoie le nombre de lignes réécrites.
+        """
+        written = 0
+        with self._conn:
+            for key in self._deleted:
+                if is_user_key(key):
+                    self._conn.execute("DELETE FROM users WHERE login = ?", (key,))
+                else:
+                    self._conn.execute("DELETE FROM sections WHERE key = ?", (key,))
+                self._stored.pop(key, None)
+                written += 1
+            self._deleted.clear()
+
+            for key, value in self._entries.items():
+                data = json.dumps(value, ensure_ascii=False)
+                if self._stored.get(key) == data:
+                    continue
+                self._write_entry(key, data)
+                self._stored[key] = data
+                written += 1
+        return written
+
+    def import_dict(self, cache_data):
+        """Remplit la base à partir d'un cache au format dict (cache.json)."""
+        for key, value in cache_data.items():
+            self[key] = value
+        return self.flush()
+
+    def close(self):
+        self._conn.close()
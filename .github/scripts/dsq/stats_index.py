@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+Index des statistiques de la communauté, maintenu par deltas.
+
+L'index est stocké dans la section réservée "_stats" du cache. Il contient
+les agrégats affichés dans PARTICIPANTS.md (arrivées par mois, langages,
+nombre de projets, dates de création des repos par quête) et, pour chaque
+participant, sa contribution à ces agrégats : mettre à jour ou retirer un
+participant revient à soustraire son ancienne contribution et à ajouter la
+nouvelle, sans reparcourir les autres.
+
+Les temps de complétion dépendent de la date du jour : l'index garde donc,
+par quête, les dates de création triées (en secondes depuis l'epoch) et les
+moyennes sont calculées à la demande, sans analyser de dates. Il compte aussi,
+par quête, les participants distincts, les repos et les repos par langage
+(dsq.quest_analytics).
+
+StatsIndex.build() reconstruit l'index complet, et diff() le compare à
+l'index incrémental pour vérifier sa cohérence.
+"""
+
+import bisect
+from datetime import datetime, timezone
+
+from .quests import quest_sort_key
+
+# Clé réservée du cache
+STATS_CACHE_KEY = "_stats"
+
+# Version du format de la section (reconstruite si elle change)
+STATS_INDEX_VERSION = 2
+
+# Les parts de langage sont stockées en entiers (milliardièmes de voix) pour
+# que les ajouts et retraits successifs ne fassent pas dériver les sommes
+SHARE_SCALE = 10**9
+
+# Un repo DSQ est considéré comme terminé après ce délai
+COMPLETION_MIN_DAYS = 7
+
+SECONDS_PER_DAY = 86400
+
+
+def quest_topic(repo_info):
+    """Première quête ("dsqX") parmi les topics d'un repo, ou None."""
+    for topic in repo_info.get("topics", []):
+        if topic.startswith("dsq") and topic != "devsidequests":
+            return topic
+    return None
+
+
+def language_name(main_language):
+    """Nom du langage principal, sans pourcentage ("C 37%" -> "C")."""
+    if "%" in main_language:
+        return main_language.split()[0]
+    return main_language
+
+
+def contribution(user_info):
+    """Contribution d'un participant aux agrégats (stockée dans l'index)."""
+    lang = language_name(user_info["main_language"])
+    weights = user_info.get("language_weights")
+    total_weight = sum(weights.values()) if weights else 0
+    if total_weight:
+        shares = {
+            weighted_lang: round(weight / total_weight * SHARE_SCALE)
+            for weighted_lang, weight in weights.items()
+        }
+    else:
+        shares = {lang: SHARE_SCALE}
+
+    # [quête, date de création (ou None), langage du repo (ou None)] ; les
+    # entrées antérieures au suivi du langage des repos prennent celui du
+    # participant
+    quests = []
+    for repo_info in user_info["dsq_repos"]:
+        topic = quest_topic(repo_info)
+        if not topic:
+            continue
+        created_at = repo_info.get("created_at")
+        created = None
+        if created_at:
+            created = datetime.fromisoformat(created_at)
+            if created.tzinfo is None:
+                created = created.replace(tzinfo=timezone.utc)
+            created = created.timestamp()
+        quests.append([topic, created, repo_info.get("language", lang)])
+
+    return {
+        # Les dates ISO commencent par "YYYY-MM"
+        "month": user_info["fork_date"][:7],
+        "language": lang,
+        "shares": shares,
+        "projects": len(user_info["dsq_repos"]),
+        "quests": quests,
+    }
+
+
+def _empty_section():
+    return {
+        "version": STATS_INDEX_VERSION,
+        "months": {},
+        "languages": {},
+        "shares": {},
+        "projects": 0,
+        "quests": {},
+        "quest_members": {},
+        "quest_repos": {},
+        "quest_languages": {},
+        "members": {},
+    }
+
+
+def _add_count(counts, key, delta):
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+class StatsIndex:
+    """Agrégats de la communauté, sur une section "_stats" du cache."""
+
+    def __init__(self, section=None):
+        if not section or section.get("version") != STATS_INDEX_VERSION:
+            section = _empty_section()
+        self.section = section
+
+    @classmethod
+    def load(cls, cache_data):
+        """Index stocké dans le cache (créé vide si absent ou obsolète)."""
+        index = cls(cache_data.get(STATS_CACHE_KEY))
+        cache_data[STATS_CACHE_KEY] = index.section
+        return index
+
+    @classmethod
+    def build(cls, participants):
+        """Reconstruction complète à partir d'une liste de participants."""
+        index = cls()
+        for user in participants:
+            index.update(user["username"], user)
+        return index
+
+    # ----------------------------------------------------
+    # Mises à jour par deltas
+    # ----------------------------------------------------
+
+    def members(self):
+        return self.section["members"].keys()
+
+    def _apply(self, contrib, sign):
+        s = self.section
+        _add_count(s["months"], contrib["month"], sign)
+        _add_count(s["languages"], contrib["language"], sign)
+        for lang, share in contrib["shares"].items():
+            _add_count(s["shares"], lang, sign * share)
+        s["projects"] += sign * contrib["projects"]
+        for topic, created, lang in contrib["quests"]:
+            _add_count(s["quest_repos"], topic, sign)
+            if lang:
+                languages = s["quest_languages"].setdefault(topic, {})
+                _add_count(languages, lang, sign)
+                if not languages:
+                    del s["quest_languages"][topic]
+            if created is None:
+                continue
+            dates = s["quests"].setdefault(topic, [])
+            if sign > 0:
+                bisect.insort(dates, created)
+            else:
+                del dates[bisect.bisect_left(dates, created)]
+                if not dates:
+                    del s["quests"][topic]
+        for topic in {quest[0] for quest in contrib["quests"]}:
+            _add_count(s["quest_members"], topic, sign)
+
+    def update(self, login, user_info):
+        """Ajoute ou met à jour un participant. Renvoie True si l'index a changé."""
+        new = contribution(user_info)
+        old = self.section["members"].get(login)
+        if old == new:
+            return False
+        if old is not None:
+            self._apply(old, -1)
+        self._apply(new, 1)
+        self.section["members"][login] = new
+        return True
+
+    def remove(self, login):
+        """Retire un participant de l'index."""
+        old = self.section["members"].pop(login, None)
+        if old is not None:
+            self._apply(old, -1)
+
+    def sync_members(self, participants):
+        """
+        Aligne les membres de l'index sur une liste de participants : les
+        absents sont retirés, les nouveaux ajoutés. Les membres déjà connus
+        ne sont pas recalculés (leurs changements passent par update()).
+        """
+        logins = {user["username"] for user in participants}
+        for login in list(self.members() - logins):
+            self.remove(login)
+        for user in participants:
+            if user["username"] not in self.section["members"]:
+                self.update(user["username"], user)
+
+    # ----------------------------------------------------
+    # Lecture des statistiques
+    # ----------------------------------------------------
+
+    def participants_count(self):
+        return len(self.section["members"])
+
+    def projects_count(self):
+        return self.section["projects"]
+
+    def monthly_growth(self):
+        """Croissance mensuelle (groupement par YYYY-MM)."""
+        months = self.section["months"]
+        return [
+            {
+                "month": month,
+                "count": months[month],
+                "display_name": datetime.strptime(month, "%Y-%m").strftime("%b %Y"),
+            }
+            for month in sorted(months)
+        ]
+
+    def language_stats(self):
+        """
+        Classement des langages de la communauté. Chaque participant compte
+        pour une voix, répartie selon ses poids de langage (ou entièrement
+        sur son langage principal pour les anciennes entrées).
+        """
+        total_users = self.participants_count()
+        ranked = sorted(self.section["shares"].items(), key=lambda i: (-i[1], i[0]))
+        return [
+            {
+                "language": lang,
+                "count": self.section["languages"].get(lang, 0),
+                "percentage": round(share / SHARE_SCALE / total_users * 100, 1),
+            }
+            for lang, share in ranked
+        ]
+
+    def completion_days(self, now=None):
+        """
+        Durées (en jours) des repos terminés, par quête. Elles sont comptées
+        jusqu'au début du jour UTC de `now` : elles ne changent qu'une fois
+        par jour, et les runs d'une même journée produisent le même rendu.
+        """
+        now = (now or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        now = now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        cutoff = now - COMPLETION_MIN_DAYS * SECONDS_PER_DAY
+        by_quest = {}
+        for quest_id in sorted(self.section["quests"], key=quest_sort_key):
+            dates = self.section["quests"][quest_id]
+            completed = dates[: bisect.bisect_right(dates, cutoff)]
+            if completed:
+                by_quest[quest_id] = [
+                    int((now - created) // SECONDS_PER_DAY) for created in completed
+                ]
+        return by_quest
+
+    def quest_participants(self):
+        """Nombre de participants distincts par quête."""
+        return self.section["quest_members"]
+
+    def quest_repos(self):
+        """Nombre de repos par quête."""
+        return self.section["quest_repos"]
+
+    def quest_languages(self):
+        """Nombre de repos par langage, par quête."""
+        return self.section["quest_languages"]
+
+    # ----------------------------------------------------
+    # Vérification
+    # ----------------------------------------------------
+
+    def diff(self, other):
+        """Liste des agrégats qui diffèrent entre deux index (vide si cohérents)."""
+        differences = []
+        for key in (
+            "months",
+            "languages",
+            "shares",
+            "projects",
+            "quests",
+            "quest_members",
+            "quest_repos",
+            "quest_languages",
+        ):
+            if self.section[key] != other.section[key]:
+                differences.append(key)
+        mine, theirs = self.section["members"], other.section["members"]
+        stale = sorted(
+            login
+            for login in mine.keys() | theirs.keys()
+            if mine.get(login) != theirs.get(login)
+        )
+        if stale:
+            differences.append(f"members ({len(stale)}: {', '.join(stale[:5])})")
+        return differences
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentation des runs : durées des étapes, compteurs et rapport JSON.
+
+- span(nom) / @timed(nom) mesurent une étape (nombre d'appels, durée
+  cumulée, durée maximale). Les étapes exécutées dans plusieurs threads à la
+  fois cumulent leurs durées : le total peut dépasser la durée du run.
+- count(nom) incrémente un compteur libre (hits du cache utilisateurs...).
+- record_api_call() compte les requêtes envoyées à l'API par endpoint, les
+  logins et noms de repos étant remplacés par des paramètres
+  ("GET /users/:login/repos").
+
+write_run_report() écrit le tout, avec les compteurs du cache HTTP et les
+quotas restants, dans un rapport JSON à côté du cache (DSQ_RUN_REPORT, vide
+pour désactiver). Chaque commande y a sa propre entrée, pour que les étapes
+check / sync / render d'un même workflow se retrouvent dans un seul fichier.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+from .atomic import atomic_write
+from .http_cache import http_cache_stats
+from .rate_limit import rate_limit_stats
+
+# Rapport de run, à côté de cache.json (vide : pas de rapport)
+RUN_REPORT_FILE = os.environ.get("DSQ_RUN_REPORT", "run_report.json")
+
+# Version du format du rapport
+RUN_REPORT_VERSION = 1
+
+_lock = threading.Lock()
+_started_at = datetime.now(timezone.utc)
+_started = time.perf_counter()
+
+# nom -> [appels, durée cumulée, durée max]
+_spans = {}
+_counters = {}
+_api_calls = {}
+
+
+# --------------------------------------------------------
+# MESURES
+# --------------------------------------------------------
+
+
+def record_span(name, seconds):
+    with _lock:
+        entry = _spans.get(name)
+        if entry is None:
+            _spans[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+
+@contextmanager
+def span(name):
+    """Mesure la durée du bloc sous le nom `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def timed(name=None):
+    """Décorateur : mesure chaque appel de la fonction (nom de la fonction par défaut)."""
+
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_span(span_name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name, n=1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def endpoint_for(verb, url):
+    """
+    Endpoint d'une requête, sans paramètres de requête ni logins :
+    "/users/octocat/repos?page=2" -> "GET /users/:login/repos".
+    """
+    parts = url.split("?", 1)[0].strip("/").split("/")
+    if parts[:2] == ["api", "v3"]:
+        # GitHub Enterprise
+        parts = parts[2:]
+    if parts[0] in ("users", "orgs") and len(parts) > 1:
+        parts[1] = ":login"
+    elif parts[0] == "repos" and len(parts) > 2:
+        parts[1:3] = [":owner", ":repo"]
+    return f"{verb} /{'/'.join(parts)}"
+
+
+def record_api_call(verb, url, status):
+    """Compte une requête envoyée à l'API (réponse `status`)."""
+    endpoint = endpoint_for(verb, url)
+    with _lock:
+        calls = _api_calls.get(endpoint)
+        if calls is None:
+            calls = _api_calls[endpoint] = {"calls": 0, "statuses": {}}
+        calls["calls"] += 1
+        status = str(status)
+        calls["statuses"][status] = calls["statuses"].get(status, 0) + 1
+
+
+# --------------------------------------------------------
+# RAPPORT DE RUN
+# --------------------------------------------------------
+
+
+def run_report(command, status="ok"):
+    """Rapport du run courant, sous forme de dict sérialisable en JSON."""
+    with _lock:
+        spans = {
+            name: {
+                "count": calls,
+                "total_seconds": round(total, 6),
+                "max_seconds": round(longest, 6),
+            }
+            for name, (calls, total, longest) in sorted(_spans.items())
+        }
+        counters = dict(sorted(_counters.items()))
+        api_calls = {
+            endpoint: {
+                "calls": calls["calls"],
+                "statuses": dict(sorted(calls["statuses"].items())),
+            }
+            for endpoint, calls in sorted(_api_calls.items())
+        }
+    return {
+        "command": command,
+        "status": status,
+        "started_at": _started_at.isoformat(),
+        "duration_seconds": round(time.perf_counter() - _started, 3),
+        "spans": spans,
+        "counters": counters,
+        "api_calls": api_calls,
+        "api_calls_total": sum(calls["calls"] for calls in api_calls.values()),
+        "http_cache": http_cache_stats(),
+        "rate_limit": rate_limit_stats(),
+    }
+
+
+def write_run_report(command, status="ok", path=None):
+    """
+    Ajoute le rapport du run courant au fichier de rapport (entrée `command`),
+    en conservant les entrées des autres commandes.
+    """
+    path = RUN_REPORT_FILE if path is None else path
+    if not path:
+        return
+    report = {"version": RUN_REPORT_VERSION, "runs": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("version") == RUN_REPORT_VERSION:
+            report = previous
+    except (OSError, ValueError):
+        pass
+
+    report["runs"][command] = run_report(command, status)
+    try:
+        with atomic_write(path) as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    except OSError as e:
+        print(f"[WARN] Run report could not be written to '{path}': {e}")
+        return
+    print(f"[DEBUG] Run report written to '{path}'.")
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""
+Outils communs aux tests : chaque script est lancé dans son propre processus
+(les modules dsq lisent leur configuration à l'import), dans un répertoire
+temporaire, contre le faux serveur GitHub (benchmarks/fake_github.py).
+"""
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRIPTS_DIR))
+
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "benchmarks"))
+
+from community import synthetic_community  # noqa: E402
+from fake_github import FakeGitHub  # noqa: E402
+
+
+class Workspace:
+    """Répertoire de travail d'un test, avec le catalogue des quêtes."""
+
+    def __init__(self, path, fake):
+        self.path = str(path)
+        self.fake = fake
+        shutil.copytree(
+            os.path.join(REPO_ROOT, "quests"), os.path.join(self.path, "quests")
+        )
+
+    def run(self, script, *args, check=True, **env):
+        """Lance `script` (update_participants.py...) avec `args` et `env`."""
+        env = dict(
+            os.environ,
+            GITHUB_TOKEN="fake-token",
+            GITHUB_API_URL=self.fake.url,
+            DSQ_RUN_REPORT="run_report.json",
+            **env,
+        )
+        result = subprocess.run(
+            [sys.executable, os.path.join(SCRIPTS_DIR, script), *args],
+            cwd=self.path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if check and result.returncode != 0:
+            pytest.fail(
+                f"{script} {' '.join(args)} a échoué ({result.returncode}) :\n"
+                f"{result.stdout}\n{result.stderr}"
+            )
+        return result
+
+    def sync(self, *args, **env):
+        return self.run("update_participants.py", "sync", *args, **env)
+
+    def file(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def cache(self):
+        with open(self.file("cache.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def report(self, command):
+        with open(self.file("run_report.json"), encoding="utf-8") as f:
+            return json.load(f)["runs"][command]
+
+
+def users_of(cache_data):
+    """Entrées utilisateur du cache (sans les sections réservées)."""
+    return {k: v for k, v in cache_data.items() if not k.startswith("_")}
+
+
+@pytest.fixture
+def community():
+    return synthetic_community(12)
+
+
+@pytest.fixture
+def fake(community):
+    with FakeGitHub(community) as server:
+        yield server
+
+
+@pytest.fixture
+def workspace(tmp_path, fake):
+    return Workspace(tmp_path, fake)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+Miniatures d'avatars (dsq.avatars), servies par le faux serveur GitHub
+(/avatars/u/ID?v=N) : traitement incrémental et rendu de PARTICIPANTS.md.
+"""
+
+import os
+import struct
+
+from conftest import users_of
+
+AVATARS = {"DSQ_AVATARS": "1"}
+
+
+def thumbnails(workspace):
+    directory = workspace.file("img", "avatars")
+    return {
+        name: os.stat(os.path.join(directory, name)).st_mtime_ns
+        for name in os.listdir(directory)
+    }
+
+
+def image_size(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(b"\x89PNG"):
+        return struct.unpack(">II", data[16:24])
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return image.size
+
+
+def test_thumbnails_are_generated_once(workspace, fake):
+    workspace.sync()
+    participants = len(users_of(workspace.cache()))
+
+    workspace.run("update_participants.py", "avatars", **AVATARS)
+    assert fake.avatar_requests == participants
+    files = thumbnails(workspace)
+    section = workspace.cache()["_avatars"]
+    assert set(section["files"].values()) == set(files)
+    for name in files:
+        assert image_size(workspace.file("img", "avatars", name)) == (140, 140)
+
+    # Deuxième run : rien n'est retéléchargé ni réécrit
+    workspace.run("update_participants.py", "avatars", **AVATARS)
+    assert fake.avatar_requests == participants
+    assert thumbnails(workspace) == files
+
+
+def test_only_changed_avatars_are_reprocessed(workspace, fake, community):
+    workspace.sync()
+    workspace.run("update_participants.py", "avatars", **AVATARS)
+    before = thumbnails(workspace)
+
+    # Nouvel avatar (nouvelle version d'URL) repris par le refresh
+    login = "adventurer-000003"
+    community["users"][login]["avatar_version"] = 5
+    workspace.run("update-user-cache.py")
+    assert workspace.cache()[login]["avatar_url"].endswith("?v=5")
+
+    fake.reset_counters()
+    workspace.run("update_participants.py", "avatars", **AVATARS)
+    assert fake.avatar_requests == 1
+    after = thumbnails(workspace)
+    # L'ancienne miniature, orpheline, est supprimée
+    assert len(after) == len(before)
+    assert len(set(after) - set(before)) == 1
+
+
+def test_render_points_to_thumbnails_only_when_enabled(workspace, fake):
+    workspace.sync()
+    workspace.run("update_participants.py", "avatars", **AVATARS)
+    participants_file = workspace.file("PARTICIPANTS.md")
+
+    workspace.run("update_participants.py", "render", **AVATARS)
+    with open(participants_file, encoding="utf-8") as f:
+        markdown = f.read()
+    assert "img/avatars/" in markdown
+    assert f"{fake.url}/avatars/" not in markdown
+
+    workspace.run("update_participants.py", "render")
+    with open(participants_file, encoding="utf-8") as f:
+        markdown = f.read()
+    assert "img/avatars/" not in markdown
+    assert f"{fake.url}/avatars/" in markdown
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Lecture du cache JSON (dsq.cache) et migrations de schéma (dsq.migrations)."""
+
+import json
+
+import pytest
+
+from dsq.cache import CACHE_BACKUP_FILE, CACHE_FILE, JsonCacheBackend
+from dsq.migrations import SCHEMA_VERSION, VERSION_KEY, migrate
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_corrupt_cache_is_recovered_from_backup(tmp_path):
+    write(CACHE_FILE, '{"alice": {"username": "al')
+    write(CACHE_BACKUP_FILE, '{"alice": {"username": "alice"}}')
+
+    assert JsonCacheBackend().load() == {"alice": {"username": "alice"}}
+    # Le fichier illisible est mis de côté, pas écrasé
+    corrupt = tmp_path / f"{CACHE_FILE}.corrupt"
+    assert corrupt.read_text(encoding="utf-8") == '{"alice": {"username": "al'
+
+
+def test_corrupt_cache_without_backup_aborts(tmp_path):
+    write(CACHE_FILE, "{not json")
+
+    with pytest.raises(SystemExit) as exit_info:
+        JsonCacheBackend().load()
+    assert exit_info.value.code == 1
+    # Jamais remplacé par un cache vide
+    assert not (tmp_path / CACHE_FILE).exists()
+    assert (tmp_path / f"{CACHE_FILE}.corrupt").read_text() == "{not json"
+
+
+def test_newer_schema_version_is_refused():
+    cache_data = {VERSION_KEY: SCHEMA_VERSION + 1, "alice": {"username": "alice"}}
+    before = json.dumps(cache_data)
+
+    with pytest.raises(SystemExit):
+        migrate(cache_data)
+    assert json.dumps(cache_data) == before
+
+
+def test_migration_1_completes_legacy_entries():
+    cache_data = {
+        "_forks": {"forks": {}},
+        "alice": {"fork_date": "2023-05-04T10:20:30"},
+        "bob": {
+            "username": "bob",
+            "fork_date": "2024-01-02T03:04:05+00:00",
+            "dsq_repos": [{"name": "weather"}],
+            "main_language": "C",
+        },
+    }
+
+    assert migrate(cache_data)
+    assert cache_data[VERSION_KEY] == SCHEMA_VERSION
+    assert cache_data["alice"] == {
+        "fork_date": "2023-05-04T10:20:30+00:00",
+        "username": "alice",
+        "dsq_repos": [],
+        "main_language": "Aucune",
+    }
+    assert cache_data["bob"]["fork_date"] == "2024-01-02T03:04:05+00:00"
+    assert cache_data["bob"]["dsq_repos"] == [{"name": "weather"}]
+    # Sections réservées intactes, et migration appliquée une seule fois
+    assert cache_data["_forks"] == {"forks": {}}
+    assert not migrate(cache_data)
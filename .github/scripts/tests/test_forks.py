@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+"""
+Liste des forks (list_forks, événements fork) : date du plus ancien fork
+d'un participant, quel que soit le chemin de mise à jour.
+"""
+
+import os
+import json
+
+from conftest import Workspace
+
+
+def fork_event(path, fake, owner, created_at):
+    payload = {
+        "repository": {"full_name": "/".join(fake.main_repo)},
+        "forkee": {"owner": {"login": owner}, "created_at": created_at},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    return str(path)
+
+
+def check(workspace):
+    """Sortie changed=... de la commande check."""
+    output = workspace.file("github_output")
+    if os.path.exists(output):
+        os.remove(output)
+    workspace.run("update_participants.py", "check", GITHUB_OUTPUT=output)
+    with open(output, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def test_earliest_fork_date_is_kept(tmp_path, fake, community):
+    login = community["forks"][0]["owner"]
+    first = min(f["created_at"] for f in community["forks"] if f["owner"] == login)
+    workspace = Workspace(tmp_path / "repo", fake)
+
+    # Second fork (repo renommé puis refork) plus récent que tous les autres
+    community["forks"].append(
+        {"owner": login, "created_at": "2099-01-01T00:00:00+00:00"}
+    )
+    workspace.sync()
+    assert workspace.cache()["_forks"]["forks"][login] == first
+    assert workspace.cache()[login]["fork_date"] == first
+
+    # Listage incrémental, puis événement fork : la date ne change pas
+    community["forks"].append(
+        {"owner": login, "created_at": "2099-02-01T00:00:00+00:00"}
+    )
+    workspace.sync()
+    event = fork_event(tmp_path / "event.json", fake, login, "2099-03-01T00:00:00Z")
+    workspace.run("update_participants.py", "event", event)
+
+    cache_data = workspace.cache()
+    assert cache_data["_forks"]["forks"][login] == first
+    assert cache_data[login]["fork_date"] == first
+
+    # Le high-water mark suit l'API (le second fork), pas la date conservée
+    workspace.sync(DSQ_FORKS_FULL_SYNC="1")
+    assert check(workspace) == "changed=false"
+
+
+def test_unknown_login_does_not_abort_the_sync(tmp_path, community):
+    from fake_github import FakeGitHub
+
+    community["forks"].append(
+        {"owner": "ghost", "created_at": "2024-05-01T00:00:00+00:00"}
+    )
+    with FakeGitHub(community) as fake:
+        workspace = Workspace(tmp_path, fake)
+        result = workspace.sync(DSQ_BACKEND="rest")
+
+    # Les autres utilisateurs récupérés sont enregistrés
+    cache_data = workspace.cache()
+    assert "ghost" not in cache_data
+    assert all(f["owner"] in cache_data for f in community["forks"][:-1])
+    assert "ghost ignoré pour ce run (404)" in result.stdout
+
+
+def test_deleted_newest_fork_does_not_force_a_sync_every_run(workspace, community):
+    workspace.sync()
+    assert check(workspace) == "changed=false"
+
+    # Le fork le plus récent est supprimé : détecté par check, puis le
+    # high-water mark redescend au fork le plus récent encore présent
+    newest = max(community["forks"], key=lambda fork: fork["created_at"])
+    community["forks"].remove(newest)
+    assert check(workspace).startswith("changed=true")
+    workspace.sync()
+
+    forks_section = workspace.cache()["_forks"]
+    current = max(community["forks"], key=lambda fork: fork["created_at"])
+    assert forks_section["newest_login"] == current["owner"]
+    assert check(workspace) == "changed=false"
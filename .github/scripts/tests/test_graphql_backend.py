@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+"""
+Backend GraphQL (dsq.graphql_backend) contre le faux serveur GitHub : même
+cache.json que le chemin REST, profils par lots et pagination des dépôts.
+"""
+
+import json
+import math
+
+from conftest import Workspace, users_of
+
+# Petits lots et petites pages : chaque lot a des dépôts sur plusieurs pages
+SMALL_BATCHES = {"DSQ_GRAPHQL_BATCH_SIZE": "5", "DSQ_GRAPHQL_PAGE_SIZE": "2"}
+
+
+def cache_without_run_dates(workspace):
+    cache_data = workspace.cache()
+    users = {
+        login: {k: v for k, v in info.items() if k != "last_refreshed"}
+        for login, info in users_of(cache_data).items()
+    }
+    return users, cache_data["_forks"]["forks"]
+
+
+def test_same_cache_as_rest(tmp_path, fake):
+    rest = Workspace(tmp_path / "rest", fake)
+    graphql = Workspace(tmp_path / "graphql", fake)
+    rest.sync(DSQ_BACKEND="rest")
+    graphql.sync(DSQ_BACKEND="graphql", **SMALL_BATCHES)
+
+    rest_users, rest_forks = cache_without_run_dates(rest)
+    graphql_users, graphql_forks = cache_without_run_dates(graphql)
+    # Même schéma, clés comprises dans le même ordre
+    assert json.dumps(graphql_users) == json.dumps(rest_users)
+    assert graphql_forks == rest_forks
+
+
+def test_batches_users_and_paginates_repositories(workspace, fake, community):
+    workspace.sync(DSQ_BACKEND="graphql", **SMALL_BATCHES)
+
+    report = workspace.report("sync")
+    calls = report["api_calls"]
+    # Ni profil ni listage de dépôts REST par utilisateur
+    assert not any(name.startswith("GET /users/") for name in calls)
+
+    # Un lot de profils = une requête, plus une par page de dépôts suivante
+    # (seuls les utilisateurs ayant encore des dépôts sont redemandés)
+    def pages(login):
+        return max(1, math.ceil(len(community["users"][login]["repos"]) / 2))
+
+    def batch_queries(logins):
+        return sum(
+            max(pages(login) for login in logins[i : i + 5])
+            for i in range(0, len(logins), 5)
+        )
+
+    fork_owners = [fork["owner"] for fork in community["forks"]]
+    expected = (
+        math.ceil(len(fork_owners) / 2)  # pages de forks
+        + batch_queries(fork_owners)
+        + batch_queries(["RaphyStoll"])  # participants additionnels
+    )
+    assert calls["POST /graphql"]["calls"] == expected
+    assert len(users_of(workspace.cache())) == len(fork_owners) + 1
+
+
+def test_unknown_login_is_skipped(tmp_path, community):
+    from fake_github import FakeGitHub
+
+    community["forks"].append(
+        {"owner": "ghost", "created_at": "2024-05-01T00:00:00+00:00"}
+    )
+    with FakeGitHub(community) as fake:
+        workspace = Workspace(tmp_path, fake)
+        result = workspace.sync(DSQ_BACKEND="graphql")
+
+    assert "ghost" not in workspace.cache()
+    assert "GraphQL: utilisateur ghost introuvable" in result.stdout
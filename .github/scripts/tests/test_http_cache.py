@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Cache HTTP conditionnel (dsq.http_cache) contre le faux serveur GitHub."""
+
+import os
+
+from conftest import users_of
+
+
+def without_run_dates(users):
+    return {
+        login: {k: v for k, v in info.items() if k != "last_refreshed"}
+        for login, info in users.items()
+    }
+
+
+def test_replays_304_from_disk(workspace, fake):
+    workspace.sync()
+    first = users_of(workspace.cache())
+    assert workspace.report("sync")["http_cache"]["stores"] > 0
+
+    # Sans cache.json, toutes les requêtes sont refaites : conditionnelles
+    os.remove(workspace.file("cache.json"))
+    fake.reset_counters()
+    core_remaining = fake.budgets["core"]["remaining"]
+    workspace.sync()
+
+    report = workspace.report("sync")
+    calls, _ = fake.api_calls()
+    assert fake.not_modified > 0
+    assert report["http_cache"]["hits"] == fake.not_modified
+    # Un 304 ne consomme pas de quota
+    core_calls = sum(
+        endpoint["calls"]
+        for name, endpoint in report["api_calls"].items()
+        if "/search/" not in name
+    )
+    core_304 = sum(
+        endpoint["statuses"].get("304", 0)
+        for name, endpoint in report["api_calls"].items()
+        if "/search/" not in name
+    )
+    assert fake.budgets["core"]["remaining"] == core_remaining - (core_calls - core_304)
+    # Les réponses rejouées donnent les mêmes entrées
+    assert without_run_dates(users_of(workspace.cache())) == without_run_dates(first)
+
+
+def test_evicts_least_recently_used_beyond_max_bytes(workspace):
+    max_bytes = 16 * 1024
+    workspace.sync(DSQ_HTTP_CACHE_MAX_BYTES=str(max_bytes))
+
+    stats = workspace.report("sync")["http_cache"]
+    assert stats["evictions"] > 0
+    assert stats["bytes_on_disk"] <= max_bytes
+
+    directory = workspace.file(".http-cache")
+    on_disk = sum(entry.stat().st_size for entry in os.scandir(directory))
+    assert on_disk == stats["bytes_on_disk"]
+
+
+def test_can_be_disabled(workspace, fake):
+    workspace.sync(DSQ_HTTP_CACHE="0")
+    workspace.sync(DSQ_HTTP_CACHE="0", DSQ_FORKS_FULL_SYNC="1")
+
+    assert workspace.report("sync")["http_cache"] is None
+    assert not os.path.exists(workspace.file(".http-cache"))
+    assert fake.not_modified == 0
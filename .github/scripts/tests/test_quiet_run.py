@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+"""
+Run sans nouvelles données : le workflow commite cache.json dès qu'il change,
+un run « calme » doit donc laisser l'arbre de travail intact.
+"""
+
+import os
+import time
+
+
+def read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_quiet_run_leaves_the_tree_clean(workspace):
+    workspace.sync()
+    workspace.run("update_participants.py", "render")
+    cache_json = read_bytes(workspace.file("cache.json"))
+    markdown = read_bytes(workspace.file("PARTICIPANTS.md"))
+
+    # Nouveau checkout : mêmes fiches de quêtes, nouvelles dates de modification
+    later = time.time() + 3600
+    quests_dir = workspace.file("quests")
+    for name in os.listdir(quests_dir):
+        os.utime(os.path.join(quests_dir, name), (later, later))
+
+    output = workspace.file("github_output")
+    workspace.run("update_participants.py", "check", GITHUB_OUTPUT=output)
+    with open(output, encoding="utf-8") as f:
+        assert f.read() == "changed=false\n"
+    workspace.run("update_participants.py", "render")
+
+    assert read_bytes(workspace.file("cache.json")) == cache_json
+    assert read_bytes(workspace.file("PARTICIPANTS.md")) == markdown
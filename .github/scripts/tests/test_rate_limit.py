@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Ordonnanceur des quotas (dsq.rate_limit) : contre le faux serveur GitHub,
+qui émet les en-têtes X-RateLimit-* et des limites secondaires, puis sur
+l'ordonnanceur seul pour le backoff.
+"""
+
+import time
+
+import pytest
+
+from conftest import Workspace, synthetic_community, users_of
+from fake_github import FakeGitHub
+
+from dsq.rate_limit import (
+    LOW_PRIORITY_RESERVE,
+    RateLimitExhausted,
+    RateLimitScheduler,
+    SECONDARY_BASE_DELAY,
+)
+
+
+def statuses(report):
+    found = {}
+    for endpoint in report["api_calls"].values():
+        for status, calls in endpoint["statuses"].items():
+            found[status] = found.get(status, 0) + calls
+    return found
+
+
+def test_parallel_sync_defers_users_instead_of_overbooking(tmp_path):
+    community = synthetic_community(25)
+    with FakeGitHub(community, limits={"core": 30}) as fake:
+        workspace = Workspace(tmp_path, fake)
+        result = workspace.sync(DSQ_MAX_WORKERS="16", DSQ_HTTP_CACHE="0")
+
+        # Le quota est épuisé sans qu'aucune requête soit refusée
+        assert "403" not in statuses(workspace.report("sync"))
+        assert fake.budgets["core"]["remaining"] == 0
+        assert "reporté au prochain run" in result.stdout
+        fetched = len(users_of(workspace.cache()))
+        assert 0 < fetched < len(community["users"])
+
+        # Nouvelle fenêtre : les utilisateurs reportés sont récupérés
+        for _ in range(3):
+            fake.budgets.clear()
+            workspace.sync(DSQ_MAX_WORKERS="16", DSQ_HTTP_CACHE="0")
+        assert len(users_of(workspace.cache())) == len(community["users"])
+
+
+def test_low_priority_refresh_keeps_the_reserve(workspace, fake):
+    workspace.sync()
+
+    limit = 20
+    fake.limits["core"] = limit
+    fake.budgets.clear()
+    refresh_env = {
+        "DSQ_HTTP_CACHE": "0",
+        "DSQ_REFRESH_TTL_DAYS": "0",
+        "DSQ_REFRESH_JITTER_DAYS": "0",
+    }
+    result = workspace.run("update-user-cache.py", **refresh_env)
+
+    reserve = int(limit * LOW_PRIORITY_RESERVE)
+    assert fake.budgets["core"]["remaining"] >= reserve
+    assert workspace.report("update-user-cache")["rate_limit"]["deferred"] >= 1
+    assert "Stopping refresh" in result.stdout
+    state = workspace.cache()["_refresh_state"]
+    assert not state["complete"]
+
+    # Le run suivant reprend la passe là où elle s'était arrêtée
+    done = state["done"]
+    fake.budgets.clear()
+    workspace.run("update-user-cache.py", **refresh_env)
+    assert workspace.cache()["_refresh_state"]["done"] > done
+
+
+def test_secondary_limit_pauses_then_retries(workspace, fake):
+    workspace.sync()
+
+    fake.secondary_limit(2, retry_after=1)
+    start = time.perf_counter()
+    result = workspace.sync(DSQ_FORKS_FULL_SYNC="1")
+
+    assert "Limite de quota (403)" in result.stdout
+    stats = workspace.report("sync")["rate_limit"]
+    assert stats["waits"] >= 1
+    assert time.perf_counter() - start >= 2
+    assert fake.secondary_pending == 0
+
+
+def test_secondary_backoff_is_exponential_without_retry_after():
+    scheduler = RateLimitScheduler()
+    body = '{"message": "You have exceeded a secondary rate limit."}'
+
+    delays = [
+        scheduler.after_response("core", 403, {}, body),
+        scheduler.after_response("core", 403, {}, body),
+    ]
+    assert delays == [SECONDARY_BASE_DELAY, SECONDARY_BASE_DELAY * 2]
+
+    # Une réponse normale remet le backoff à zéro
+    assert scheduler.after_response("core", 200, {}, "{}") is None
+    assert scheduler.after_response("core", 403, {}, body) == SECONDARY_BASE_DELAY
+
+
+def test_primary_limit_beyond_max_wait_raises_exhausted():
+    scheduler = RateLimitScheduler()
+    headers = {
+        "X-RateLimit-Limit": "30",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+    }
+    with pytest.raises(RateLimitExhausted):
+        scheduler.after_response("core", 403, headers, "{}")
+
+
+def test_response_headers_keep_in_flight_reservations():
+    scheduler = RateLimitScheduler()
+    reset = int(time.time()) + 3600
+
+    def headers(remaining, reset):
+        return {
+            "X-RateLimit-Limit": "30",
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Resource": "core",
+        }
+
+    scheduler.after_response("core", 200, headers(10, reset), "{}")
+    for _ in range(3):
+        scheduler.before_request("core")
+    assert scheduler.budgets["core"]["remaining"] == 7
+
+    # Réponse à la première des trois requêtes : les deux autres restent réservées
+    scheduler.after_response("core", 200, headers(9, reset), "{}")
+    assert scheduler.budgets["core"]["remaining"] == 7
+
+    # Nouvelle fenêtre : l'en-tête fait foi
+    scheduler.after_response("core", 200, headers(29, reset + 3600), "{}")
+    assert scheduler.budgets["core"]["remaining"] == 29
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""Registre des participants (dsq.registry) : fusion par id GitHub ou par login."""
+
+import copy
+import itertools
+
+from dsq.registry import ParticipantRegistry
+
+
+def user(login, fork_date, user_id=None, refreshed=None):
+    entry = {"username": login, "fork_date": f"{fork_date}T00:00:00+00:00"}
+    if user_id is not None:
+        entry["id"] = user_id
+    if refreshed:
+        entry["last_refreshed"] = f"{refreshed}T00:00:00+00:00"
+    return entry
+
+
+def merged(*sources):
+    registry = ParticipantRegistry()
+    for participants in sources:
+        for entry in participants:
+            registry.add(entry)
+    return registry
+
+
+def summary(registry):
+    return sorted((u["username"], u["fork_date"]) for u in registry.participants())
+
+
+def test_same_id_under_two_logins_is_one_participant():
+    old = user("old-name", "2024-01-10", user_id=42, refreshed="2024-02-01")
+    new = user("new-name", "2024-03-05", user_id=42, refreshed="2024-06-01")
+    registry = merged([old], [new])
+
+    assert len(registry) == 1
+    assert registry.duplicates == 1
+    # L'entrée la plus récemment rafraîchie, avec la date du premier fork
+    assert summary(registry) == [("new-name", "2024-01-10T00:00:00+00:00")]
+    assert "old-name" in registry and "NEW-NAME" in registry
+
+
+def test_entry_without_id_matches_by_login_ignoring_case():
+    legacy = user("Alice", "2024-02-01")
+    current = user("alice", "2024-04-01", user_id=7, refreshed="2024-05-01")
+    registry = merged([current], [legacy])
+
+    assert len(registry) == 1
+    assert summary(registry) == [("alice", "2024-02-01T00:00:00+00:00")]
+
+
+def test_distinct_people_are_kept_apart():
+    registry = merged(
+        [user("alice", "2024-01-01", user_id=1), user("bob", "2024-01-02", user_id=2)],
+        [user("carol", "2024-01-03")],
+    )
+    assert len(registry) == 3
+    assert registry.duplicates == 0
+
+
+def test_result_does_not_depend_on_source_order():
+    entries = [
+        user("octo", "2024-03-01", user_id=5, refreshed="2024-04-01"),
+        user("OCTO", "2024-01-15"),
+        user("octo-renamed", "2024-05-01", user_id=5, refreshed="2024-06-01"),
+        user("solo", "2024-02-01", user_id=9),
+        user("twin", "2024-02-02", refreshed="2024-03-01"),
+        user("Twin", "2024-02-02", refreshed="2024-03-01"),
+    ]
+    expected = None
+    for order in itertools.permutations(range(len(entries))):
+        sources = [copy.deepcopy(entries[i]) for i in order]
+        # Les mêmes entrées réparties sur deux sources
+        result = summary(merged(sources[:3], sources[3:]))
+        if expected is None:
+            expected = result
+        assert result == expected, order
+
+    assert expected == [
+        ("Twin", "2024-02-02T00:00:00+00:00"),
+        ("octo-renamed", "2024-01-15T00:00:00+00:00"),
+        ("solo", "2024-02-01T00:00:00+00:00"),
+    ]
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""Backend SQLite du cache (dsq.sqlite_cache) : sémantique de dict et flush()."""
+
+import json
+import sqlite3
+
+import pytest
+
+from dsq.cache import export_json
+from dsq.sqlite_cache import SCHEMA_VERSION, SqliteCache
+
+CACHE = {
+    "_version": 1,
+    "_forks": {"newest_login": "alice", "forks": {"alice": "2024-05-01"}},
+    "alice": {
+        "username": "alice",
+        "fork_date": "2024-05-01T00:00:00+00:00",
+        "dsq_repos": [{"name": "météo", "topics": ["devsidequests", "dsq1"]}],
+    },
+    "bob": {"username": "bob", "fork_date": "2024-04-01T00:00:00+00:00"},
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SqliteCache(path)
+    cache.import_dict(json.loads(json.dumps(CACHE)))
+    cache.close()
+    return path
+
+
+def reopen(path):
+    cache = SqliteCache(path)
+    data = dict(cache.items())
+    cache.close()
+    return data
+
+
+def test_in_place_mutation_is_flushed(db):
+    cache = SqliteCache(db)
+    cache["alice"]["dsq_repos"].append({"name": "todo", "topics": []})
+    cache["_forks"]["newest_login"] = "carol"
+    assert cache.flush() == 2
+    assert cache.flush() == 0
+    cache.close()
+
+    data = reopen(db)
+    assert data["alice"]["dsq_repos"][-1]["name"] == "todo"
+    assert data["_forks"]["newest_login"] == "carol"
+
+
+def test_deleted_then_set_again(db):
+    cache = SqliteCache(db)
+    del cache["bob"]
+    assert "bob" not in cache
+    cache["bob"] = {"username": "bob", "fork_date": "2024-06-01T00:00:00+00:00"}
+    del cache["_forks"]
+    cache["_forks"] = CACHE["_forks"]
+    cache.flush()
+    cache.close()
+
+    data = reopen(db)
+    assert data["bob"]["fork_date"] == "2024-06-01T00:00:00+00:00"
+    assert data["_forks"] == CACHE["_forks"]
+
+    cache = SqliteCache(db)
+    del cache["bob"]
+    with pytest.raises(KeyError):
+        del cache["bob"]
+    cache.flush()
+    cache.close()
+    assert "bob" not in reopen(db)
+
+
+def test_iteration_includes_unflushed_changes(db):
+    cache = SqliteCache(db)
+    cache["carol"] = {"username": "carol"}
+    del cache["bob"]
+
+    assert sorted(cache) == ["_forks", "_version", "alice", "carol"]
+    assert len(cache) == 4
+    assert dict(cache.items())["carol"] == {"username": "carol"}
+    cache.close()
+
+
+def test_import_export_round_trip(db, tmp_path):
+    source = tmp_path / "cache.json"
+    source.write_text(json.dumps(CACHE, ensure_ascii=False), encoding="utf-8")
+
+    cache = SqliteCache(db)
+    export_json(cache, str(tmp_path / "export.json"))
+    cache.close()
+
+    exported = json.loads((tmp_path / "export.json").read_text(encoding="utf-8"))
+    assert exported == json.loads(source.read_text(encoding="utf-8"))
+
+
+def test_opens_a_schema_1_database(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE users (login TEXT PRIMARY KEY, fork_date TEXT, data TEXT NOT NULL);
+        CREATE INDEX users_fork_date ON users (fork_date);
+        CREATE TABLE user_quests (
+            login TEXT NOT NULL REFERENCES users (login) ON DELETE CASCADE,
+            topic TEXT NOT NULL,
+            PRIMARY KEY (login, topic)
+        );
+        CREATE TABLE sections (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+        INSERT INTO users VALUES ('alice', '2024-05-01', '{"username": "alice"}');
+        INSERT INTO user_quests VALUES ('alice', 'dsq1');
+        PRAGMA user_version = 1;
+        """)
+    conn.close()
+
+    cache = SqliteCache(path)
+    assert cache["alice"] == {"username": "alice"}
+    cache["alice"]["main_language"] = "C"
+    cache["bob"] = {"username": "bob"}
+    assert cache.flush() == 2
+    tables = {
+        name
+        for (name,) in cache._conn.execute(
+            "SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+        )
+    }
+    version = cache._conn.execute("PRAGMA user_version").fetchone()[0]
+    cache.close()
+
+    assert tables == {"users", "sections"}
+    assert version == SCHEMA_VERSION
+    assert reopen(path) == {
+        "alice": {"username": "alice", "main_language": "C"},
+        "bob": {"username": "bob"},
+    }
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+Index incrémental des statistiques (dsq.stats_index) : après toute suite de
+mises à jour, de retraits et d'alignements des membres, il doit être égal à
+une reconstruction complète.
+"""
+
+import random
+
+from dsq.stats_index import StatsIndex
+
+LANGUAGES = ["Python", "C", "Rust", "JavaScript"]
+TOPICS = ["dsq1", "dsq2", "dsq3", "dsq10"]
+# Peu de dates distinctes : des repos partagent la même date de création,
+# ce qui exerce le retrait d'un doublon dans les listes triées
+DATES = [
+    "2024-01-03T10:00:00+00:00",
+    "2024-02-14T08:30:00+00:00",
+    "2024-02-14T08:30:00",  # date naïve (anciennes entrées)
+    "2024-06-01T00:00:00+00:00",
+]
+
+
+def random_user(rnd, login):
+    lang = rnd.choice(LANGUAGES)
+    user = {
+        "username": login,
+        "fork_date": f"2024-{rnd.randint(1, 12):02d}-01T00:00:00+00:00",
+        "main_language": (
+            f"{lang} {rnd.randint(10, 90)}%" if rnd.random() < 0.5 else lang
+        ),
+        "dsq_repos": [],
+    }
+    if rnd.random() < 0.7:
+        user["language_weights"] = {
+            name: rnd.randint(0, 5000) for name in rnd.sample(LANGUAGES, 2)
+        }
+    for i in range(rnd.randint(0, 4)):
+        repo = {
+            "name": f"repo-{i}",
+            "topics": ["devsidequests"] + rnd.sample(TOPICS, rnd.randint(0, 2)),
+        }
+        if rnd.random() < 0.9:
+            repo["created_at"] = rnd.choice(DATES)
+        if rnd.random() < 0.8:
+            repo["language"] = rnd.choice(LANGUAGES + [None])
+        user["dsq_repos"].append(repo)
+    return user
+
+
+def assert_consistent(index, participants):
+    assert StatsIndex.build(list(participants.values())).diff(index) == []
+
+
+def test_random_deltas_match_a_full_rebuild():
+    rnd = random.Random(2024)
+    index = StatsIndex()
+    participants = {}
+    logins = [f"adventurer-{i:02d}" for i in range(30)]
+
+    for _ in range(2000):
+        step = rnd.random()
+        if step < 0.6:
+            login = rnd.choice(logins)
+            participants[login] = random_user(rnd, login)
+            index.update(login, participants[login])
+        elif step < 0.9:
+            login = rnd.choice(logins)
+            participants.pop(login, None)
+            index.remove(login)
+        else:
+            # Membres conservés inchangés (sync_members ne les recalcule pas),
+            # certains retirés, de nouveaux ajoutés
+            kept = {k: v for k, v in participants.items() if rnd.random() < 0.8}
+            newcomers = [login for login in logins if login not in participants]
+            for login in rnd.sample(newcomers, min(3, len(newcomers))):
+                kept[login] = random_user(rnd, login)
+            participants = kept
+            index.sync_members(list(participants.values()))
+        assert_consistent(index, participants)
+
+    # Tout retirer ramène à un index vide
+    for login in list(participants):
+        index.remove(login)
+    assert index.section == StatsIndex().section
+
+
+def test_removing_the_last_repo_of_a_quest_drops_its_dates():
+    user = {
+        "username": "solo",
+        "fork_date": "2024-03-01T00:00:00+00:00",
+        "main_language": "C",
+        "dsq_repos": [
+            {
+                "name": "weather",
+                "topics": ["devsidequests", "dsq1"],
+                "created_at": DATES[0],
+            },
+            {
+                "name": "weather-v2",
+                "topics": ["devsidequests", "dsq1"],
+                "created_at": DATES[0],
+            },
+        ],
+    }
+    index = StatsIndex.build([user])
+    assert len(index.section["quests"]["dsq1"]) == 2
+
+    user = dict(user, dsq_repos=user["dsq_repos"][:1])
+    assert index.update("solo", user)
+    assert len(index.section["quests"]["dsq1"]) == 1
+    assert not index.update("solo", user)
+
+    index.remove("solo")
+    assert "dsq1" not in index.section["quests"]
+    assert index.section == StatsIndex().section
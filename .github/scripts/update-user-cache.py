@@ -3,99 +3,50 @@
 
 import os
 import sys
-import json
-from datetime import datetime, timedelta, timezone
-from github import Github
-
-CACHE_FILE = "cache.json"
-
-# Nécessite un token GitHub
-token = os.environ.get("GITHUB_TOKEN")
-if not token:
-    print("ERREUR: Variable d'environnement GITHUB_TOKEN non définie ou vide.")
-    sys.exit(1)
-
-g = Github(token)
-
-
-def load_cache():
-    """Charge le cache depuis le fichier CACHE_FILE,
-    s'il n'existe pas, le crée et renvoie un dict vide."""
-    if not os.path.exists(CACHE_FILE):
-        print(f"[ERROR] Cache file '{CACHE_FILE}' not found. Aborting.")
-        sys.exit(1)
-    else:
-        try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            print(
-                f"[DEBUG] Cache file '{CACHE_FILE}' loaded successfully from {os.path.join(os.getcwd(), CACHE_FILE)}."
-            )
-            return data
-        except json.JSONDecodeError:
-            print(f"[WARN] {CACHE_FILE} semble vide ou invalide. On le réinitialise.")
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                f.write("{}")
-            return {}
-
-
-def save_cache(cache_data):
-    """Sauvegarde le cache dans le fichier CACHE_FILE."""
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        print(
-            f"[DEBUG] Saving cache file '{CACHE_FILE}' to {os.path.join(os.getcwd(), CACHE_FILE)}."
-        )
-        json.dump(cache_data, f, ensure_ascii=False, indent=2)
-
-
-def determine_main_language(user_login):
-    """
-    Simplified version of your logic to find the main language.
-    Only used to refresh if needed.
-    """
-    try:
-        user_obj = g.get_user(user_login)
-        repos = list(user_obj.get_repos())
-
-        if not repos:
-            return "Aucune"
-
-        from collections import Counter
-
-        languages = []
-        for repo in repos:
-            if repo.language:
-                weight = 1
-                repo_tz = repo.updated_at.tzinfo or timezone.utc
-                six_months_ago = datetime.now(tz=repo_tz) - timedelta(days=180)
-                if not repo.fork:
-                    weight *= 3
-                if repo.updated_at > six_months_ago:
-                    weight *= 2
-                languages.extend([repo.language] * weight)
-
-        if not languages:
-            return "Aucune"
-
-        counter = Counter(languages)
-        lang, count = counter.most_common(1)[0]
-        total = sum(counter.values())
-        percentage = (count / total) * 100
-        if percentage > 15:
-            return f"{lang} {int(percentage)}%"
-        return lang
-    except Exception as e:
-        print(f"[ERROR] Could not determine main language for {user_login}: {e}")
-        return "Aucune"
-
-
+import signal
+from datetime import datetime, timezone
+
+from dsq.cache import load_cache, save_cache
+from dsq.client import get_github
+from dsq.http_cache import http_cache_summary
+from dsq.language_stats import determine_main_language
+from dsq.migrations import is_user_key
+from dsq.objects import get_user, object_cache_summary
+from dsq.stats_index import StatsIndex
+from dsq.telemetry import count, timed, write_run_report
+from dsq.refresh_policy import mark_refreshed, refresh_reason, repos_fingerprint
+from dsq.rate_limit import (
+    RateLimitDeferred,
+    RateLimitExhausted,
+    low_priority,
+    rate_limit_summary,
+)
+
+# Save a checkpoint every N refreshed users
+CHECKPOINT_EVERY = max(1, int(os.environ.get("DSQ_CHECKPOINT_EVERY", "25")))
+
+# Maximum number of users refreshed per run (0 = no limit)
+MAX_USERS_PER_RUN = int(os.environ.get("DSQ_REFRESH_MAX_USERS", "0"))
+
+# Reserved cache key holding the progress of the current refresh pass
+REFRESH_STATE_KEY = "_refresh_state"
+
+
+@timed()
 def refresh_user(user_login, user_info):
     """
     Fetch minimal info (avatar & main_language) from GitHub
     and update user_info if needed.
     We do NOT touch dsq_repos or fork_date.
+    The profile request is conditional (usually a free 304); the repo listing
+    behind main_language is only redone when the refresh policy says the
+    entry is due. Returns True if the entry was fully refreshed.
     """
-    user_obj = g.get_user(user_login)
+    user_obj = get_user(get_github(), user_login)
+
+    # Entries cached before user ids were stored (see dsq.registry)
+    if user_info.get("id") is None:
+        user_info["id"] = user_obj.id
 
     new_avatar = user_obj.avatar_url
     old_avatar = user_info.get("avatar_url", "")
@@ -103,26 +54,115 @@ def refresh_user(user_login, user_info):
         user_info["avatar_url"] = new_avatar
         print(f"[INFO] Updated avatar for {user_login}.")
 
-    new_main_lang = determine_main_language(user_login)
+    now = datetime.now(timezone.utc)
+    fingerprint = repos_fingerprint(user_obj.public_repos, user_obj.updated_at)
+    reason = refresh_reason(user_login, user_info, fingerprint, now)
+    if reason is None:
+        return False
+
+    new_main_lang, language_weights = determine_main_language(get_github(), user_login)
+    user_info["language_weights"] = language_weights
     old_main_lang = user_info.get("main_language", "")
     if not old_main_lang or (old_main_lang != new_main_lang):
         user_info["main_language"] = new_main_lang
-        print(f"[INFO] Updated main_language for {user_login} => {new_main_lang}.")
+        print(
+            f"[INFO] Updated main_language for {user_login} => {new_main_lang} ({reason})."
+        )
+    mark_refreshed(user_info, fingerprint, now)
+    return True
+
+
+def refresh_order(cache_data, state):
+    """
+    Users still to check in the current pass, least-recently-checked first.
+    Users already checked since the pass started (i.e. by an interrupted or
+    capped previous run) are skipped until the pass is complete.
+    """
+    started_at = state["started_at"]
+    users = [
+        (info.get("last_checked", ""), login)
+        for login, info in cache_data.items()
+        # Reserved sections (e.g. "_global_search") are not users
+        if is_user_key(login)
+    ]
+    return [login for last, login in sorted(users) if last < started_at]
 
 
 def main():
-    cache_data = load_cache()
+    cache_data = load_cache(create_missing=False)
 
-    # Parcours des utilisateurs du cache
-    for user_login, user_info in cache_data.items():
-        try:
-            refresh_user(user_login, user_info)
-        except Exception as e:
-            print(f"[WARN] Could not refresh user {user_login}: {e}")
+    # The Actions timeout sends SIGTERM: turn it into SystemExit so that the
+    # checkpoint below is still written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
 
-    save_cache(cache_data)
+    state = cache_data.get(REFRESH_STATE_KEY)
+    if state and not state.get("complete"):
+        print(
+            f"[INFO] Resuming refresh pass started at {state['started_at']} "
+            f"({state['done']} users already refreshed, last: {state['last_user']})."
+        )
+    else:
+        state = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "done": 0,
+            "last_user": None,
+            "complete": False,
+        }
+    cache_data[REFRESH_STATE_KEY] = state
+
+    # Participants' stats are updated by delta as their entries are refreshed
+    stats_index = StatsIndex.load(cache_data)
+
+    pending = refresh_order(cache_data, state)
+    if MAX_USERS_PER_RUN:
+        pending = pending[:MAX_USERS_PER_RUN]
+    print(f"[INFO] {len(pending)} users to check in this run.")
+
+    refreshed = 0
+    checked = 0
+    try:
+        for user_login in pending:
+            user_info = cache_data[user_login]
+            try:
+                with low_priority():
+                    if refresh_user(user_login, user_info):
+                        refreshed += 1
+                        if user_login in stats_index.members():
+                            stats_index.update(user_login, user_info)
+            except (RateLimitDeferred, RateLimitExhausted) as e:
+                print(f"[WARN] Stopping refresh at {user_login}, rate limit: {e}")
+                break
+            except Exception as e:
+                print(f"[WARN] Could not refresh user {user_login}: {e}")
+
+            user_info["last_checked"] = datetime.now(timezone.utc).isoformat()
+            state["done"] += 1
+            state["last_user"] = user_login
+            checked += 1
+            if checked % CHECKPOINT_EVERY == 0:
+                save_cache(cache_data)
+        else:
+            state["complete"] = not refresh_order(cache_data, state)
+    finally:
+        save_cache(cache_data)
+
+    count("refresh.checked", checked)
+    count("refresh.full", refreshed)
+    print(
+        f"[INFO] {checked} users checked, {refreshed} fully refreshed, "
+        f"pass complete: {state['complete']}."
+    )
     print("Cache updated successfully!")
+    print(http_cache_summary())
+    print(object_cache_summary())
+    print(rate_limit_summary())
 
 
 if __name__ == "__main__":
-    main()
+    # The run report (timings, API calls, quotas) is written even on failure
+    status = "error"
+    try:
+        main()
+        status = "ok"
+    finally:
+        write_run_report("update-user-cache", status)
@@ -9,9 +9,44 @@ Intégration d'un mécanisme de cache pour éviter les appels répétés à l'AP
 import os
 import sys
 import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from datetime import timezone
-from github import Github
+
+from github import GithubException
+
+from dsq import graphql_backend
+from dsq.atomic import atomic_write
+from dsq.avatars import (
+    AVATARS_CACHE_KEY,
+    AVATARS_DIR,
+    AVATARS_ENABLED,
+    avatar_files,
+    update_avatars,
+)
+from dsq.cache import load_cache, save_cache
+from dsq.client import get_client, get_github
+from dsq.http_cache import http_cache_summary
+from dsq.language_stats import (
+    determine_main_language,
+    main_language_label,
+    score_repos,
+)
+from dsq.migrations import is_user_key
+from dsq.objects import get_repo, get_user, object_cache_summary
+from dsq.quest_analytics import quest_stats
+from dsq.quests import QUESTS_CACHE_KEY, load_catalogue
+from dsq.registry import ParticipantRegistry
+from dsq.stats_index import STATS_CACHE_KEY, StatsIndex, quest_topic
+from dsq.telemetry import count, span, timed, write_run_report
+from dsq.refresh_policy import mark_refreshed, repos_fingerprint
+from dsq.rate_limit import (
+    RateLimitDeferred,
+    RateLimitExhausted,
+    low_priority,
+    rate_limit_summary,
+)
 
 # --------------------------------------------------------
 # CONFIGURATION GLOBALE
@@ -19,8 +54,50 @@ from github import Github
 REPO_OWNER = "RaphyStoll"
 REPO_NAME = "devSideQuests"
 
-# Fichier de cache
-CACHE_FILE = "cache.json"
+# Nombre maximal d'utilisateurs récupérés en parallèle via l'API
+MAX_WORKERS = max(1, int(os.environ.get("DSQ_MAX_WORKERS", "8")))
+
+# Backend de récupération des participants : "rest" (par défaut) ou "graphql"
+DATA_BACKEND = os.environ.get("DSQ_BACKEND", "rest")
+
+# Durée de validité de la recherche globale "topic:devsidequests" stockée dans le cache.
+# `check` demande une synchronisation dès qu'elle a expiré : le workflow la fixe
+# au-dessus de l'intervalle du cron pour que les runs sans changement l'évitent.
+SEARCH_TTL = timedelta(hours=float(os.environ.get("DSQ_SEARCH_TTL_HOURS", "6")))
+
+# Clé réservée du cache pour cette recherche (un login GitHub ne commence jamais par "_")
+SEARCH_CACHE_KEY = "_global_search"
+
+# L'API de recherche ne renvoie jamais plus de 1000 résultats
+SEARCH_MAX_RESULTS = 1000
+
+# Forks connus et "high-water mark" (date du fork le plus récent déjà vu)
+FORKS_CACHE_KEY = "_forks"
+
+# Intervalle entre deux listages complets des forks (pour détecter les forks supprimés).
+# DSQ_FORKS_FULL_SYNC=1 force un listage complet.
+FORKS_FULL_SYNC_INTERVAL = timedelta(
+    days=float(os.environ.get("DSQ_FORKS_FULL_SYNC_DAYS", "7"))
+)
+
+# Page générée
+PARTICIPANTS_FILE = "PARTICIPANTS.md"
+
+# Empreinte du dernier PARTICIPANTS.md écrit : la page n'est réécrite (et donc
+# recommitée) que si son contenu hors dates de génération a changé
+RENDER_CACHE_KEY = "_render"
+
+# Pages de participants : au-delà d'une certaine taille, la grille complète
+# des avatars est découpée en participants/page-K.md (0 = une seule page).
+PARTICIPANTS_DIR = "participants"
+PARTICIPANTS_PAGE_SIZE = int(os.environ.get("DSQ_PARTICIPANTS_PAGE_SIZE", "0"))
+
+# Nombre de participants affichés dans PARTICIPANTS.md quand il y a des pages
+GUILD_PREVIEW_SIZE = int(os.environ.get("DSQ_GUILD_PREVIEW_SIZE", "30"))
+
+# Marqueurs des dates de génération dans le markdown, exclus de l'empreinte
+GENERATED_ON_MARKER = "\x00generated_on\x00"
+GENERATED_AT_MARKER = "\x00generated_at\x00"
 
 # Tableau de noms d'utilisateur à ajouter manuellement
 ADDITIONAL_USERNAMES = [
@@ -28,47 +105,93 @@ ADDITIONAL_USERNAMES = [
     # "AutreAventurier",
 ]
 
-# On récupère le token GitHub
-token = os.environ.get("GITHUB_TOKEN")
-if not token:
-    print("ERREUR: Variable d'environnement GITHUB_TOKEN non définie ou vide.")
-    sys.exit(1)
-
-g = Github(token)
-
 # --------------------------------------------------------
-# GESTION DU CACHE
+# RECHERCHE GLOBALE DES REPOS DSQ (MÉMOÏSÉE)
 # --------------------------------------------------------
 
+# Résultat de la recherche pour le run courant :
+# {"complete": bool, "by_owner": {login: [dsq_repos...]}, "quests": set(...)}
+_global_search = None
 
-def load_cache():
-    """Charge le cache depuis le fichier CACHE_FILE,
-    s'il n'existe pas, le crée et renvoie un dict vide."""
-    if not os.path.exists(CACHE_FILE):
-        print(
-            f"[DEBUG] Cache file '{CACHE_FILE}' not found. Creating it now in {os.getcwd()}."
-        )
-        # On crée un nouveau fichier de cache vide
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            f.write("{}")  # on met simplement un JSON vide
-        return {}
-
-    # Sinon, on lit son contenu
-    with open(CACHE_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    print(
-        f"[DEBUG] Cache file '{CACHE_FILE}' loaded successfully from {os.path.join(os.getcwd(), CACHE_FILE)}."
-    )
-    return data
 
+def get_global_dsq_search(cache_data=None):
+    """
+    Exécute au plus une fois par run la recherche "topic:devsidequests".
+    Le résultat est conservé dans une section du cache valable SEARCH_TTL,
+    et partagé par count_active_quests() et la récupération des dsq_repos.
+    """
+    if _global_search is not None:
+        return _global_search
+
+    now = datetime.now(timezone.utc)
+    section = (cache_data or {}).get(SEARCH_CACHE_KEY)
+    if section and now - datetime.fromisoformat(section["fetched_at"]) < SEARCH_TTL:
+        print("Recherche globale DSQ : résultat du cache réutilisé.")
+        count("global_search.cache_hits")
+    else:
+        count("global_search.cache_misses")
+        results = get_github().search_repositories("topic:devsidequests")
+        repos = []
+        for r in results:
+            entry = dsq_repo_entry(
+                r.name, r.html_url, r.topics, r.created_at, r.pushed_at, r.language
+            )
+            entry["owner"] = r.owner.login
+            repos.append(entry)
+        section = {
+            "fetched_at": now.isoformat(),
+            "complete": results.totalCount <= SEARCH_MAX_RESULTS,
+            "repos": repos,
+        }
+        if cache_data is not None:
+            cache_data[SEARCH_CACHE_KEY] = section
+
+    return index_global_search(section)
 
-def save_cache(cache_data):
-    """Sauvegarde le cache dans le fichier CACHE_FILE."""
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        print(
-            f"[DEBUG] Saving cache file '{CACHE_FILE}' to {os.path.join(os.getcwd(), CACHE_FILE)}."
-        )
-        json.dump(cache_data, f, ensure_ascii=False, indent=2)
+
+def load_cached_global_search(cache_data):
+    """
+    Version hors ligne de get_global_dsq_search() : reprend la dernière
+    recherche stockée dans le cache, même expirée, sans appel à l'API.
+    """
+    section = cache_data.get(SEARCH_CACHE_KEY) or {"complete": False, "repos": []}
+    return index_global_search(section)
+
+
+def index_global_search(section):
+    """Indexe une section "_global_search" du cache pour le run courant."""
+    global _global_search
+    by_owner = {}
+    quests = set()
+    for entry in section["repos"]:
+        repo_info = {k: v for k, v in entry.items() if k != "owner"}
+        by_owner.setdefault(entry["owner"], []).append(repo_info)
+        topic = quest_topic(entry)
+        if topic:
+            quests.add(topic)
+
+    _global_search = {
+        "complete": section["complete"],
+        "by_owner": by_owner,
+        "quests": quests,
+    }
+    return _global_search
+
+
+def apply_global_search(participants):
+    """
+    Met à jour en une passe les dsq_repos de tous les participants à partir
+    de la recherche globale (si elle est complète), au lieu d'une recherche
+    "user:X topic:devsidequests" par utilisateur.
+    """
+    if _global_search is None or not _global_search["complete"]:
+        return
+    by_owner = _global_search["by_owner"]
+    for user in participants:
+        dsq_repos = by_owner.get(user["username"], [])
+        if user["dsq_repos"] != dsq_repos:
+            user["dsq_repos"] = dsq_repos
+            refresh_stats(user["username"], user)
 
 
 # --------------------------------------------------------
@@ -76,49 +199,134 @@ def save_cache(cache_data):
 # --------------------------------------------------------
 
 
+@timed()
 def fetch_user_data(user_login, fork_date=None):
     """
     Récupère toutes les infos pour un utilisateur donné (avatar, URL, date "fork"/arrivée,
     repos DSQ, langage principal) via l'API GitHub, et renvoie un dict.
     """
-    user_obj = g.get_user(user_login)
+    client = get_client()
+    user_obj = get_user(client, user_login)
 
     # Si fork_date n'est pas fourni, on prend la date de création de son compte
     # (utile pour les "ADDITIONAL_USERNAMES" qui n'ont pas forké).
     if not fork_date:
         fork_date = user_obj.created_at
 
-    # Récupération des dépôts DSQ
+    # Récupération des dépôts DSQ : depuis la recherche globale si elle est
+    # complète, sinon via une recherche dédiée à l'utilisateur
     dsq_repos = []
-    try:
-        user_repos = g.search_repositories(f"user:{user_login} topic:devsidequests")
-        for r in user_repos:
-            dsq_repos.append(
-                {"name": r.name, "url": r.html_url, "topics": r.get_topics()}
+    if _global_search is not None and _global_search["complete"]:
+        dsq_repos = list(_global_search["by_owner"].get(user_login, []))
+    else:
+        try:
+            user_repos = client.search_repositories(
+                f"user:{user_login} topic:devsidequests"
             )
-    except Exception as e:
-        print(f"Erreur lors de la recherche DSQ pour {user_login}: {e}")
+            for r in user_repos:
+                dsq_repos.append(
+                    dsq_repo_entry(
+                        r.name,
+                        r.html_url,
+                        r.topics,
+                        r.created_at,
+                        r.pushed_at,
+                        r.language,
+                    )
+                )
+        except (RateLimitDeferred, RateLimitExhausted):
+            raise
+        except Exception as e:
+            print(f"Erreur lors de la recherche DSQ pour {user_login}: {e}")
 
-    main_language = determine_main_language(user_login)
+    main_language, language_weights = determine_main_language(get_client(), user_login)
 
     # On stocke la date au format ISO8601 (string) pour plus de facilité au JSON
-    return {
+    user_info = {
         "username": user_login,
+        "id": user_obj.id,
         "avatar_url": user_obj.avatar_url,
         "profile_url": user_obj.html_url,
         "fork_date": fork_date.isoformat(),
         "dsq_repos": dsq_repos,
         "main_language": main_language,
+        "language_weights": language_weights,
+    }
+    # Une entrée toute neuve n'a pas à être recalculée par le refresh hebdomadaire
+    mark_refreshed(
+        user_info,
+        repos_fingerprint(user_obj.public_repos, user_obj.updated_at),
+        datetime.now(timezone.utc),
+    )
+    return user_info
+
+
+def dsq_repo_entry(name, url, topics, created_at, pushed_at, language=None):
+    """
+    Entrée `dsq_repos` du cache. Les dates servent aux stats de complétion,
+    le langage (fourni gratuitement par la recherche) aux stats par quête.
+    """
+    return {
+        "name": name,
+        "url": url,
+        "topics": topics,
+        "created_at": created_at.isoformat(),
+        "pushed_at": pushed_at.isoformat() if pushed_at else None,
+        "language": language,
     }
 
 
+def backfill_dsq_repos(user_login, user_info):
+    """
+    Migration paresseuse des anciennes entrées du cache : les repos DSQ
+    enregistrés sans `created_at` sont complétés une seule fois via l'API.
+    Renvoie True si au moins un repo a été complété.
+    """
+    if _global_search is not None and _global_search["complete"]:
+        # apply_global_search() remplacera ces entrées par des données à jour
+        return False
+    updated = False
+    for repo_info in user_info["dsq_repos"]:
+        if "created_at" in repo_info:
+            continue
+        try:
+            # Non prioritaire : peut être reporté au prochain run
+            with low_priority():
+                repo_obj = get_repo(get_client(), f"{user_login}/{repo_info['name']}")
+        except RateLimitDeferred:
+            return updated
+        except Exception as e:
+            print(
+                f"Migration impossible du repo {repo_info['name']} ({user_login}): {e}"
+            )
+            continue
+        repo_info.update(
+            dsq_repo_entry(
+                repo_info["name"],
+                repo_info["url"],
+                repo_info["topics"],
+                repo_obj.created_at,
+                repo_obj.pushed_at,
+                repo_obj.language,
+            )
+        )
+        updated = True
+    return updated
+
+
 def get_or_cache_user(user_login, cache_data, fork_date=None):
     if user_login in cache_data:
         user_info = cache_data[user_login]
+        changed = False
         # user_info["fork_date"] est une string iso
-        if fork_date:
-            # si on a un "fork_date" plus récent, on écrase
+        if fork_date and user_info["fork_date"] != fork_date.isoformat():
+            # la date de la section des forks (le plus ancien fork) fait foi
             user_info["fork_date"] = fork_date.isoformat()
+            changed = True
+        if backfill_dsq_repos(user_login, user_info):
+            changed = True
+        if changed:
+            refresh_stats(user_login, user_info)
     else:
         # On fetch
         user_info = fetch_user_data(user_login, fork_date)
@@ -132,74 +340,206 @@ def get_or_cache_user(user_login, cache_data, fork_date=None):
     return user_info
 
 
-# --------------------------------------------------------
-# DÉTERMINATION DU LANGAGE PRINCIPAL
-# --------------------------------------------------------
-
-
-def determine_main_language(user_login):
-    try:
-        user_obj = g.get_user(user_login)
-        repos = list(user_obj.get_repos())
-
-        if not repos:
-            return "Aucune"
-
-        from collections import Counter
-
-        languages = []
+def prefetch_users(user_entries, cache_data):
+    """
+    Récupère en parallèle (au plus MAX_WORKERS à la fois) les utilisateurs
+    absents du cache. `user_entries` est une liste de tuples (login, fork_date).
+    Les nouveaux utilisateurs sont insérés dans le cache dans l'ordre de
+    `user_entries`, pour que cache.json reste déterministe.
+    Renvoie l'ensemble des logins reportés faute de quota, ou ignorés pour ce
+    run (introuvables, erreur de l'API) : les autres sont gardés dans le cache.
+    """
+    pending = {}
+    for user_login, fork_date in user_entries:
+        if user_login not in cache_data and user_login not in pending:
+            pending[user_login] = fork_date
+    count("user_cache.hits", len(user_entries) - len(pending))
+    count("user_cache.misses", len(pending))
+
+    if not pending:
+        return set()
+
+    if DATA_BACKEND == "graphql":
+        try:
+            fetched = fetch_users_data_graphql(pending)
+        except RateLimitExhausted as e:
+            print(f"[WARN] {len(pending)} utilisateurs reportés au prochain run: {e}")
+            return set(pending)
+        for user_login in pending:
+            if user_login in fetched:
+                cache_data[user_login] = fetched[user_login]
+        # Logins introuvables (compte supprimé) : ignorés pour ce run, plutôt
+        # que redemandés un par un à l'API REST
+        return set(pending) - set(fetched)
 
-        for repo in repos:
-            if repo.language:
-                weight = 1
+    print(
+        f"Récupération de {len(pending)} nouveaux utilisateurs ({MAX_WORKERS} en parallèle)..."
+    )
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            user_login: executor.submit(fetch_user_data, user_login, fork_date)
+            for user_login, fork_date in pending.items()
+        }
+        deferred = set()
+        for user_login, future in futures.items():
+            try:
+                cache_data[user_login] = future.result()
+            except RateLimitExhausted as e:
+                deferred.add(user_login)
+                print(f"[WARN] {user_login} reporté au prochain run: {e}")
+            except GithubException as e:
+                # Login supprimé ou renommé (404), erreur serveur persistante :
+                # comme pour le backend GraphQL, l'utilisateur est ignoré
+                deferred.add(user_login)
+                print(f"[WARN] {user_login} ignoré pour ce run ({e.status}): {e}")
+    return deferred
+
+
+@timed()
+def fetch_users_data_graphql(pending):
+    """
+    Équivalent de fetch_user_data() pour un lot d'utilisateurs via le backend
+    GraphQL. `pending` associe chaque login à sa fork_date (ou None).
+    Renvoie un dict login -> entrée de cache, au même format que le chemin REST.
+    """
+    print(f"Récupération de {len(pending)} nouveaux utilisateurs via GraphQL...")
+    profiles = graphql_backend.fetch_users(get_github().requester, pending)
+
+    users = {}
+    for user_login, fork_date in pending.items():
+        profile = profiles.get(user_login)
+        if profile is None:
+            continue
+        if not fork_date:
+            fork_date = profile.created_at
+
+        # Mêmes règles que la recherche REST : dépôts non forkés avec le topic
+        dsq_repos = [
+            dsq_repo_entry(
+                r.name, r.url, r.topics, r.created_at, r.pushed_at, r.language
+            )
+            for r in profile.repos
+            if not r.fork and "devsidequests" in r.topics
+        ]
+
+        weights = score_repos(profile.repos)
+        users[user_login] = {
+            "username": user_login,
+            "id": profile.id,
+            "avatar_url": profile.avatar_url,
+            "profile_url": profile.profile_url,
+            "fork_date": fork_date.isoformat(),
+            "dsq_repos": dsq_repos,
+            "main_language": main_language_label(weights),
+            "language_weights": weights,
+        }
+        mark_refreshed(
+            users[user_login],
+            repos_fingerprint(profile.public_repos, profile.updated_at),
+            datetime.now(timezone.utc),
+        )
+    return users
 
-                # On s'assure d'un offset-aware "six_months_ago"
-                # en prenant la timezone du repo si elle existe :
-                repo_tz = repo.updated_at.tzinfo
-                six_months_ago = datetime.now(tz=repo_tz) - timedelta(days=180)
 
-                if not repo.fork:
-                    weight *= 3
-                if repo.updated_at > six_months_ago:
-                    weight *= 2
+# --------------------------------------------------------
+# RÉCUPÉRATION DES DONNÉES : FORKS + PARTICIPANTS ADDITIONNELS
+# --------------------------------------------------------
 
-                languages.extend([repo.language] * weight)
 
-        if not languages:
-            return "Aucune"
+def iter_forks(since=None):
+    """
+    Parcourt les forks du plus récent au plus ancien, en tuples (login, date).
+    Avec `since`, la pagination s'arrête dès qu'on atteint un fork plus ancien.
+    Le premier fork est toujours renvoyé, même plus ancien que `since` : c'est
+    le plus récent encore présent (le fork du high-water mark a pu être supprimé).
+    """
+    if DATA_BACKEND == "graphql":
+        yield from graphql_backend.fetch_forks(
+            get_github().requester, REPO_OWNER, REPO_NAME, since
+        )
+        return
 
-        counter = Counter(languages)
-        lang, count = counter.most_common(1)[0]
-        total = sum(counter.values())
-        percentage = (count / total) * 100
-        if percentage > 15:
-            return f"{lang} {int(percentage)}%"
-        return lang
+    repo = get_repo(get_github(), f"{REPO_OWNER}/{REPO_NAME}", lazy=True)
+    for position, fork in enumerate(repo.get_forks()):
+        if since and fork.created_at < since and position:
+            return
+        yield fork.owner.login, fork.created_at
 
-    except Exception as e:
-        print(f"Erreur determine_main_language({user_login}): {e}")
-        return "Aucune"
 
+def list_forks(cache_data):
+    """
+    Liste des forks (login, date) du plus récent au plus ancien.
+    Seuls les forks plus récents que le high-water mark stocké dans le cache
+    sont demandés à l'API, sauf lors d'un listage complet périodique.
+    """
+    now = datetime.now(timezone.utc)
+    section = cache_data.get(FORKS_CACHE_KEY)
+    full_sync = (
+        section is None
+        or os.environ.get("DSQ_FORKS_FULL_SYNC") == "1"
+        or now - datetime.fromisoformat(section["last_full_sync"])
+        >= FORKS_FULL_SYNC_INTERVAL
+    )
 
-# --------------------------------------------------------
-# RÉCUPÉRATION DES DONNÉES : FORKS + PARTICIPANTS ADDITIONNELS
-# --------------------------------------------------------
+    count("forks.full_syncs" if full_sync else "forks.incremental_syncs")
+    if full_sync:
+        print("Listage complet des forks...")
+        known = {}
+        since = None
+    else:
+        known = dict(section["forks"])
+        since = section["newest_created_at"]
+        since = datetime.fromisoformat(since) if since else None
+
+    new_count = 0
+    newest = (None, None)
+    for user_login, created_at in iter_forks(since):
+        # Plusieurs forks pour un même login (repos renommés) : on garde le
+        # plus ancien, quel que soit le type de listage
+        created_at = created_at.isoformat()
+        if newest[0] is None:
+            newest = (user_login, created_at)
+        if user_login not in known:
+            new_count += 1
+        known[user_login] = min(known.get(user_login, created_at), created_at)
+    if not full_sync:
+        count("forks.new", new_count)
+        print(f"{new_count} nouveaux forks depuis le dernier run.")
+
+    # High-water mark : le premier fork renvoyé par l'API, tel que check le
+    # compare (et non le plus récent de `known`, qui peut garder un fork
+    # supprimé jusqu'au prochain listage complet, ou la date plus ancienne
+    # d'un login ayant plusieurs forks)
+    ordered = sorted(known.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    cache_data[FORKS_CACHE_KEY] = {
+        "newest_created_at": newest[1],
+        "newest_login": newest[0],
+        "last_full_sync": (now.isoformat() if full_sync else section["last_full_sync"]),
+        "forks": dict(ordered),
+    }
+    return [
+        (user_login, datetime.fromisoformat(created_at))
+        for user_login, created_at in ordered
+    ]
 
 
+@timed()
 def get_forks(cache_data):
     """
     Récupère la liste des forks du repo principal,
     utilise le cache pour chaque user,
     et retourne une liste de dict participants.
     """
-    repo = g.get_repo(f"{REPO_OWNER}/{REPO_NAME}")
-    forks = repo.get_forks()
+    # On récupère d'abord la liste des forks (incrémentale), puis on récupère
+    # les utilisateurs inconnus en parallèle
+    fork_entries = list_forks(cache_data)
+    deferred = prefetch_users(fork_entries, cache_data)
 
     participants = []
-    for fork in forks:
-        user_login = fork.owner.login
-        fork_date = fork.created_at
-        # On récupère l'utilisateur depuis le cache ou via l'API
+    for user_login, fork_date in fork_entries:
+        if user_login in deferred:
+            continue
+        # On récupère l'utilisateur depuis le cache (déjà rempli ci-dessus)
         user_data = get_or_cache_user(user_login, cache_data, fork_date)
         participants.append(user_data)
 
@@ -214,8 +554,14 @@ def get_additional_participants_data(usernames_list, cache_data):
     via le cache ou l'API GitHub.
     On renvoie une liste (même format que get_forks).
     """
+    deferred = prefetch_users(
+        [(username, None) for username in usernames_list], cache_data
+    )
+
     participants_data = []
     for username in usernames_list:
+        if username in deferred:
+            continue
         user_data = get_or_cache_user(username, cache_data, None)
         participants_data.append(user_data)
     return participants_data
@@ -227,19 +573,16 @@ def get_additional_participants_data(usernames_list, cache_data):
 
 
 def count_active_quests():
-    """Détermine le nombre de quêtes actives via le topic 'dsqX'."""
+    """
+    Détermine le nombre de quêtes actives : quêtes du catalogue (quests/)
+    et quêtes trouvées via le topic 'dsqX'.
+    """
+    quest_ids = set(load_catalogue())
     try:
-        dsq_repos = g.search_repositories("topic:devsidequests")
-        quest_topics = set()
-        for repo in dsq_repos:
-            topics = repo.get_topics()
-            for topic in topics:
-                if topic.startswith("dsq") and topic != "devsidequests":
-                    quest_topics.add(topic)
-        return len(quest_topics) if quest_topics else 1
+        quest_ids.update(get_global_dsq_search()["quests"])
     except Exception as e:
         print(f"Erreur lors du comptage des quêtes actives: {e}")
-        return 1
+    return len(quest_ids) or 1
 
 
 def count_completed_projects(fork_data):
@@ -250,153 +593,149 @@ def count_completed_projects(fork_data):
     return total
 
 
-def calculate_monthly_growth(fork_data):
-    """Calcule la croissance mensuelle (groupement par YYYY-MM)."""
-    monthly_counts = {}
-    for user in fork_data:
-        # On re-convertit la date iso en datetime
-        dt = datetime.fromisoformat(user["fork_date"])
-        month_key = dt.strftime("%Y-%m")
-        monthly_counts[month_key] = monthly_counts.get(month_key, 0) + 1
-
-    sorted_months = sorted(monthly_counts.keys())
-    monthly_growth = []
-    for month in sorted_months:
-        dt_obj = datetime.strptime(month, "%Y-%m")
-        monthly_growth.append(
-            {
-                "month": month,
-                "count": monthly_counts[month],
-                "display_name": dt_obj.strftime("%b %Y"),
-            }
-        )
-    return monthly_growth
+# Index des statistiques du run courant (dsq.stats_index), chargé depuis le
+# cache par sync() / render() et tenu à jour au fil des modifications
+_stats_index = None
 
 
-def calculate_language_stats(fork_data):
-    """Classement des langages principaux dans la communauté."""
-    from collections import Counter
+def refresh_stats(user_login, user_info):
+    """Répercute la modification d'un participant dans l'index des statistiques."""
+    if _stats_index is not None and user_login in _stats_index.members():
+        _stats_index.update(user_login, user_info)
 
-    lang_counter = Counter()
 
-    for user in fork_data:
-        lang = user["main_language"]
-        # Si on a un pourcentage, on ne garde que le nom du langage
-        if "%" in lang:
-            lang = lang.split()[0]
-        lang_counter[lang] += 1
-
-    total_users = len(fork_data)
-    stats = []
-    for lang, count in lang_counter.most_common():
-        percentage = round((count / total_users) * 100, 1)
-        stats.append({"language": lang, "count": count, "percentage": percentage})
+@timed()
+def generate_community_stats(fork_data):
+    """
+    Construit un dict de stats (progression, langages, stats par quête...),
+    depuis l'index incrémental du run s'il est chargé, sinon en le
+    reconstruisant à partir de `fork_data`.
+    """
+    index = _stats_index if _stats_index is not None else StatsIndex.build(fork_data)
+
+    quests = quest_stats(index, load_catalogue())
+
+    stats = {
+        "monthly_growth": index.monthly_growth(),
+        "language_stats": index.language_stats(),
+        "quest_stats": quests,
+        "total_projects": sum(quest["completed"] for quest in quests),
+        "projects_count": index.projects_count(),
+    }
     return stats
 
 
-def get_completed_quests(fork_data):
+def fork_date_key(fork_data):
     """
-    Retourne la liste des quêtes "terminées" (repos DSQ de plus de 7 jours)
-    et calcule le temps moyen de complétion.
+    Clé de tri par date de fork. Les dates ISO ayant toutes le même fuseau
+    se trient comme des chaînes, sans les analyser.
     """
-    completed_quests = []
-    quest_completion_times = {}
+    if all(user["fork_date"].endswith("+00:00") for user in fork_data):
+        return lambda x: x["fork_date"]
+    return lambda x: datetime.fromisoformat(x["fork_date"])
 
-    for user in fork_data:
-        username = user["username"]
-        for repo_info in user["dsq_repos"]:
-            repo_name = repo_info["name"]
-            # On essaye d'aller voir la date de création du repo
-            try:
-                repo_obj = g.get_repo(f"{username}/{repo_name}")
-                creation_date = repo_obj.created_at
-                creation_tz = (
-                    creation_date.tzinfo if creation_date.tzinfo else timezone.utc
-                )
-                now_aware = datetime.now(creation_tz)
-                days_diff = (now_aware - creation_date).days
-                if days_diff >= 7:
-                    # la quête est considérée comme "complétée"
-                    quest_id = None
-                    for t in repo_info["topics"]:
-                        if t.startswith("dsq") and t != "devsidequests":
-                            quest_id = t
-                            break
-                    if quest_id:
-                        completed_quests.append(
-                            {
-                                "quest_id": quest_id,
-                                "repo_name": repo_info["name"],
-                                "repo_url": repo_info["url"],
-                                "user": username,
-                                "completion_days": days_diff,
-                            }
-                        )
-                        if quest_id not in quest_completion_times:
-                            quest_completion_times[quest_id] = []
-                        quest_completion_times[quest_id].append(days_diff)
-            except Exception as e:
-                print(
-                    f"Skipping repo {repo_name} for user {username} due to error: {e}"
-                )
-                continue
 
-    # On calcule la moyenne de complétion pour chaque quête
-    average_times = {}
-    for qid, times in quest_completion_times.items():
-        if times:
-            average_times[qid] = sum(times) / len(times)
+# --------------------------------------------------------
+# GÉNÉRATION DU MARKDOWN
+# --------------------------------------------------------
 
-    return completed_quests, average_times
 
+@timed()
+def generate_markdown(fork_data, generated_at=None):
+    """
+    Gère la construction de PARTICIPANTS.md (sans la "Galerie des Quêtes").
+    """
+    return stamp_markdown(build_markdown(fork_data), generated_at)
 
-def generate_community_stats(fork_data):
+
+def build_markdown(fork_data):
     """
-    Construit un dict de stats (progression, langages, temps moyen...).
+    Markdown de PARTICIPANTS.md avec des marqueurs à la place des dates de
+    génération, pour que son empreinte ne dépende que des données.
     """
-    # Quêtes terminées et moyenne
-    completion_data, avg_times = get_completed_quests(fork_data)
-    monthly_growth = calculate_monthly_growth(fork_data)
-    language_stats = calculate_language_stats(fork_data)
+    return "".join(iter_markdown(fork_data))
 
-    stats = {
-        "monthly_growth": monthly_growth,
-        "language_stats": language_stats,
-        "avg_completion_times": avg_times,
-        "total_projects": len(completion_data),
-    }
-    return stats
 
+def stamp_markdown(markdown, generated_at=None):
+    """Remplace les marqueurs de date de génération par `generated_at` (ou maintenant)."""
+    date_now = generated_at or datetime.now()
+    return markdown.replace(GENERATED_ON_MARKER, date_now.strftime("%d/%m/%Y")).replace(
+        GENERATED_AT_MARKER, date_now.strftime("%d/%m/%Y à %H:%M")
+    )
 
-# --------------------------------------------------------
-# GÉNÉRATION DU MARKDOWN
-# --------------------------------------------------------
+
+def content_hash(chunks):
+    """
+    Empreinte du markdown non daté (chaîne ou morceaux produits par
+    iter_markdown) : ne change qu'avec les données affichées. Les durées des
+    stats par quête dépendent du jour (StatsIndex.completion_days) : la page
+    est donc réécrite au plus une fois par jour même sans nouveau participant.
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
 
 
-def generate_markdown(fork_data):
+def write_markdown(fork_data, path, generated_at=None):
     """
-    Gère la construction de PARTICIPANTS.md (sans la "Galerie des Quêtes").
+    Écrit le markdown morceau par morceau dans un fichier temporaire bufferisé,
+    renommé sur `path` une fois complet : le document n'est jamais entier en
+    mémoire et une écriture interrompue ne laisse pas de fichier tronqué.
     """
-    # Tri final du plus récent au plus ancien
-    fork_data.sort(key=lambda x: datetime.fromisoformat(x["fork_date"]), reverse=True)
+    write_chunks(path, iter_markdown(fork_data), generated_at)
 
-    participants_count = len(fork_data)
-    projects_count = count_completed_projects(fork_data)
-    quests_count = count_active_quests()
-    newest_user = fork_data[0]["username"] if fork_data else "Aucun participant"
+
+def write_chunks(path, chunks, generated_at=None):
+    """Écriture atomique et bufferisée de morceaux de markdown dans `path`."""
+    date_now = generated_at or datetime.now()
+    with atomic_write(path) as f:
+        for chunk in chunks:
+            # Seuls l'en-tête et le pied de page contiennent des marqueurs
+            if "\x00" in chunk:
+                chunk = stamp_markdown(chunk, date_now)
+            f.write(chunk)
+
+
+def iter_markdown(fork_data, page_count=0):
+    """
+    Produit PARTICIPANTS.md section par section, en petits morceaux (une ligne
+    de tableau, un participant...) plutôt qu'en une seule chaîne.
+    Avec `page_count` pages de participants, la guilde n'affiche qu'un aperçu
+    et renvoie vers les pages.
+    """
+    # Tri final du plus récent au plus ancien
+    fork_data.sort(key=fork_date_key(fork_data), reverse=True)
 
     # Stats avancées
     community_stats = generate_community_stats(fork_data)
 
-    date_now = datetime.now()
-    date_now_str = date_now.strftime("%d/%m/%Y")
-    date_hour_str = date_now.strftime("%d/%m/%Y à %H:%M")
+    yield from markdown_header(fork_data, community_stats["projects_count"])
+    yield from markdown_monthly_growth(community_stats["monthly_growth"])
+    yield from markdown_language_stats(community_stats["language_stats"])
+    yield from markdown_quest_stats(community_stats["quest_stats"])
+    yield MARKDOWN_GUIDES
+    yield from markdown_newest_heroes(fork_data)
+    if page_count:
+        yield from markdown_guild_preview(fork_data, page_count)
+    else:
+        yield from markdown_guild(fork_data)
+    yield MARKDOWN_FOOTER
+
+
+def markdown_header(fork_data, projects_count):
+    """Introduction et tableau des chiffres clés."""
+    participants_count = len(fork_data)
+    quests_count = count_active_quests()
+    newest_user = fork_data[0]["username"] if fork_data else "Aucun participant"
 
-    markdown = f"""# 🎮 Aventuriers des Dev Side Quests
+    yield f"""# 🎮 Aventuriers des Dev Side Quests
 
 <div align="center">
   
-*Liste auto-générée le {date_now_str} · Mise à jour quotidienne*
+*Liste auto-générée le {GENERATED_ON_MARKER} · Mise à jour quotidienne*
 
 </div>
 
@@ -425,94 +764,89 @@ Pour apparaître dans cette liste d'aventuriers :
 </div>
 """
 
-    # Progression mensuelle
-    monthly_data = community_stats["monthly_growth"]
-    if monthly_data:
-        markdown += """
+
+def markdown_monthly_growth(monthly_data):
+    """Progression mensuelle, en graphique ASCII."""
+    if not monthly_data:
+        return
+    yield """
 ### 📈 Progression de la communauté
 
 ```
 """
-        # Créer un graphique ASCII simple pour la progression mensuelle
-        monthly_data = community_stats["monthly_growth"]
-        max_count = (
-            max([month["count"] for month in monthly_data]) if monthly_data else 0
-        )
-
-        if max_count > 0:
-            for month in monthly_data:
-                bar_length = int((month["count"] / max_count) * 30)
-                bar = "█" * bar_length
-                markdown += (
-                    f"{month['display_name']}: {bar} ({month['count']} nouveaux)\n"
-                )
+    max_count = max(month["count"] for month in monthly_data)
+    if max_count > 0:
+        for month in monthly_data:
+            bar_length = int((month["count"] / max_count) * 30)
+            bar = "█" * bar_length
+            yield f"{month['display_name']}: {bar} ({month['count']} nouveaux)\n"
+    yield "```\n"
 
-        markdown += "```\n"
 
-    # Ajouter les statistiques des langages si disponibles
-    if community_stats["language_stats"]:
-        markdown += """
+def markdown_language_stats(language_stats):
+    """Langages les plus utilisés (limités aux 8 plus populaires)."""
+    if not language_stats:
+        return
+    yield """
 ### 💻 Langages préférés de la communauté
 
 ```
 """
-        # Limiter aux 8 langages les plus populaires
-        top_languages = community_stats["language_stats"][:8]
-        for lang in top_languages:
-            bar_length = int((lang["percentage"] / 100) * 30)
-            bar = "█" * bar_length
-            markdown += f"{lang['language']:10}: {bar} {lang['percentage']}%\n"
+    for lang in language_stats[:8]:
+        bar_length = int((lang["percentage"] / 100) * 30)
+        bar = "█" * bar_length
+        yield f"{lang['language']:10}: {bar} {lang['percentage']}%\n"
+    yield "```\n"
 
-        markdown += "```\n"
 
-    # Ajouter les temps moyens de complétion si disponibles
-    if community_stats["avg_completion_times"]:
-        markdown += """
-### ⏱️ Temps moyen de complétion
+def format_days(days):
+    return "-" if days is None else f"{days:.1f} j"
 
-| Quête | Temps moyen |
-|:-----:|:-----------:|
-"""
-        for quest_id, avg_time in community_stats["avg_completion_times"].items():
-            markdown += f"| {quest_id} | {avg_time:.1f} jours |\n"
 
-        markdown += "\n"
+def markdown_quest_stats(quests):
+    """Participants, temps de complétion et langages par quête."""
+    if not quests:
+        return
+    yield """
+### ⏱️ Statistiques par quête
 
-    markdown += """
-## 🔍 Guides de la communauté
+| Quête | Aventuriers | Terminées | Moyenne | Médiane | P90 | Langages |
+|:------|:-----------:|:---------:|:-------:|:-------:|:---:|:---------|
+"""
+    for quest in quests:
+        name = f"{quest['id']} · {quest['title']}" if quest["file"] else quest["id"]
+        if quest["file"]:
+            name = f"[{name}]({quest['file']})"
+        languages = ", ".join(f"{lang} ({count})" for lang, count in quest["languages"])
+        yield (
+            f"| {name} | {quest['participants']} | {quest['completed']} "
+            f"| {format_days(quest['mean_days'])} | {format_days(quest['median_days'])} "
+            f"| {format_days(quest['p90_days'])} | {languages or '-'} |\n"
+        )
+    yield "\n"
 
-<details>
-<summary>💡 Comment organiser votre repo DSQ ?</summary>
 
-Nous recommandons la structure suivante :
+# Miniatures d'avatars du run (dsq.avatars) : URL d'avatar -> fichier,
+# chargées par render() ; vide si le pipeline est désactivé
+_avatar_files = {}
 
-```
-votre-projet-dsq/
-├── README.md       # Présentation de votre quête
-├── DEVLOG.md       # Journal de développement
-├── screenshots/    # Captures de votre projet
-└── src/            # Votre code source
-```
 
-</details>
+def avatar_src(user, asset_prefix=""):
+    """Miniature locale de l'avatar si elle existe, sinon l'avatar GitHub."""
+    name = _avatar_files.get(user["avatar_url"])
+    if name is None:
+        return user["avatar_url"]
+    return f"{asset_prefix}{AVATARS_DIR.replace(os.sep, '/')}/{name}"
 
-<details>
-<summary>📣 Comment partager efficacement votre projet ?</summary>
-
-1. Ajoutez des screenshots dans votre README
-2. Documentez votre processus dans un DEVLOG
-3. Expliquez vos choix techniques et les difficultés rencontrées
-4. Ajoutez les topics GitHub appropriés : `devsidequests`, `dsq1`, etc.
-
-</details>
 
+def markdown_newest_heroes(fork_data):
+    """Tableau des 5 derniers arrivés."""
+    yield """
 ## 🏆 Les Nouveaux Héros (Derniers arrivés)
 
 |                                                     Avatar                                                      |                   Aventurier                    | Classe principale |                     Repos DSQ                     | Date d'arrivée |
 | :-------------------------------------------------------------------------------------------------------------: | :---------------------------------------------: | :---------------: | :-----------------------------------------------: | :------------: |
 """
-
-    # Ajouter les 5 derniers arrivés
     for user in fork_data[:5]:
         date_formatted = datetime.fromisoformat(user["fork_date"]).strftime("%d/%m/%Y")
         repo_link = ""
@@ -520,57 +854,445 @@ votre-projet-dsq/
             main_repo = user["dsq_repos"][0]
             repo_link = f"[🔗]({main_repo['url']})"
 
-        markdown += f"| <img src=\"{user['avatar_url']}\" width=\"60\" height=\"60\" style=\"border-radius:50%\" /> "
-        markdown += f"| [{user['username']}]({user['profile_url']}) "
-        markdown += f"| {user['main_language']} "
-        markdown += f"| {repo_link} "
-        markdown += f"| {date_formatted} |\n"
+        yield (
+            f'| <img src="{avatar_src(user)}" width="60" height="60" style="border-radius:50%" /> '
+            f"| [{user['username']}]({user['profile_url']}) "
+            f"| {user['main_language']} "
+            f"| {repo_link} "
+            f"| {date_formatted} |\n"
+        )
+
 
-    # Ajouter la section des tous les participants
-    markdown += """
+def markdown_guild(fork_data):
+    """Grille de tous les participants, par rangées de 5."""
+    yield """
 ## 🌍 Guilde des Aventuriers (Tous les participants)
 
-<div align="center">
-<table>
 """
+    yield from markdown_avatar_grid(fork_data)
+
+    # Si plus de 30 participants, ajouter cette mention
+    if len(fork_data) > 30:
+        yield f"\n_Et plus de {len(fork_data) - 30} autres aventuriers..._\n"
+
+
+def markdown_guild_preview(fork_data, page_count):
+    """Grille des derniers arrivés, suivie des liens vers les pages de participants."""
+    yield """
+## 🌍 Guilde des Aventuriers (Derniers arrivés)
+
+"""
+    yield from markdown_avatar_grid(fork_data[:GUILD_PREVIEW_SIZE])
+
+    others = len(fork_data) - GUILD_PREVIEW_SIZE
+    if others > 0:
+        yield f"\n_Et plus de {others} autres aventuriers..._\n"
+    links = " · ".join(
+        f"[{page}]({PARTICIPANTS_DIR}/{shard_name(page)})"
+        for page in range(1, page_count + 1)
+    )
+    yield f"\n📜 Registre complet, par ordre d'arrivée : {links}\n"
+
 
-    # Génération de la table des utilisateurs (par groupes de 5)
-    for i in range(0, len(fork_data), 5):
-        markdown += "  <tr>\n"
-        for user in fork_data[i : i + 5]:
-            markdown += f"""    <td align="center">
+def markdown_avatar_grid(users, asset_prefix=""):
+    """
+    Tableau HTML d'avatars, par rangées de 5. `asset_prefix` est le chemin
+    de la racine du repo depuis le fichier produit (miniatures locales).
+    """
+    yield """<div align="center">
+<table>
+"""
+    for i in range(0, len(users), 5):
+        yield "  <tr>\n"
+        for user in users[i : i + 5]:
+            yield f"""    <td align="center">
       <a href="{user['profile_url']}">
-        <img src="{user['avatar_url']}" width="70" /><br />
+        <img src="{avatar_src(user, asset_prefix)}" width="70" /><br />
         <sub><b>{user['username']}</b></sub>
       </a>
     </td>
 """
-        markdown += "  </tr>\n"
+        yield "  </tr>\n"
+    yield """</table>
+</div>
+"""
+
+
+# --------------------------------------------------------
+# PAGES DE PARTICIPANTS
+# --------------------------------------------------------
+
+
+def shard_name(page):
+    """Nom du fichier de la page `page` (numérotée à partir de 1)."""
+    return f"page-{page}.md"
+
+
+def shard_participants(fork_data):
+    """
+    Découpe les participants en pages de PARTICIPANTS_PAGE_SIZE, du plus ancien
+    au plus récent : un nouvel arrivant ne modifie que la dernière page.
+    """
+    chronological = sorted(fork_data, key=fork_date_key(fork_data))
+    return [
+        chronological[i : i + PARTICIPANTS_PAGE_SIZE]
+        for i in range(0, len(chronological), PARTICIPANTS_PAGE_SIZE)
+    ]
+
+
+def iter_shard_markdown(users, page, page_count, first_rank):
+    """
+    Markdown d'une page de participants. Ni date ni nombre total de pages :
+    une page ne change qu'avec ses participants (ou l'apparition d'une suivante).
+    """
+    nav = ["[Liste principale](../PARTICIPANTS.md)"]
+    if page > 1:
+        nav.insert(0, f"[← Page {page - 1}]({shard_name(page - 1)})")
+    if page < page_count:
+        nav.append(f"[Page {page + 1} →]({shard_name(page + 1)})")
+    nav = " · ".join(nav)
+
+    yield f"""# 🌍 Guilde des Aventuriers · Page {page}
+
+<div align="center">
+
+{nav}
+
+Aventuriers n°{first_rank} à {first_rank + len(users) - 1}, par ordre d'arrivée.
+
+</div>
+
+"""
+    yield from markdown_avatar_grid(users, "../")
+    yield f"""
+<div align="center">
+
+{nav}
 
-    markdown += """</table>
 </div>
 """
 
-    # Si plus de 30 participants, ajouter cette mention
-    if participants_count > 30:
-        markdown += f"\n_Et plus de {participants_count - 30} autres aventuriers..._\n"
 
-    # Ajouter la section footer
-    markdown += f"""
+MARKDOWN_GUIDES = """
+## 🔍 Guides de la communauté
+
+<details>
+<summary>💡 Comment organiser votre repo DSQ ?</summary>
+
+Nous recommandons la structure suivante :
+
+```
+votre-projet-dsq/
+├── README.md       # Présentation de votre quête
+├── DEVLOG.md       # Journal de développement
+├── screenshots/    # Captures de votre projet
+└── src/            # Votre code source
+```
+
+</details>
+
+<details>
+<summary>📣 Comment partager efficacement votre projet ?</summary>
+
+1. Ajoutez des screenshots dans votre README
+2. Documentez votre processus dans un DEVLOG
+3. Expliquez vos choix techniques et les difficultés rencontrées
+4. Ajoutez les topics GitHub appropriés : `devsidequests`, `dsq1`, etc.
+
+</details>
+"""
+
+MARKDOWN_FOOTER = f"""
 ---
 <div align="center">
 
 *Cette page est générée automatiquement par un workflow GitHub Actions.*  
-*Dernière mise à jour : {datetime.now().strftime('%d/%m/%Y à %H:%M')}*
+*Dernière mise à jour : {GENERATED_AT_MARKER}*
 
 </div>
 """
-    return markdown
 
 
-def main():
-    print("Récupération du cache...")
-    cache_data = load_cache()
+# --------------------------------------------------------
+# DÉTECTION RAPIDE DES CHANGEMENTS
+# --------------------------------------------------------
+
+
+def detect_changes(cache_data):
+    """
+    Vérifie à moindre coût (le dépôt et la première page de ses forks, en
+    requêtes conditionnelles généralement servies en 304 par le cache HTTP) si une synchronisation est nécessaire.
+    Renvoie la raison du changement, ou None si rien n'a bougé.
+    """
+    now = datetime.now(timezone.utc)
+    forks_section = cache_data.get(FORKS_CACHE_KEY)
+    if forks_section is None:
+        return "forks jamais synchronisés"
+    if (
+        now - datetime.fromisoformat(forks_section["last_full_sync"])
+        >= FORKS_FULL_SYNC_INTERVAL
+    ):
+        return "listage complet des forks dû"
+
+    search_section = cache_data.get(SEARCH_CACHE_KEY)
+    if (
+        search_section is None
+        or now - datetime.fromisoformat(search_section["fetched_at"]) >= SEARCH_TTL
+    ):
+        return "recherche globale expirée"
+
+    missing = [
+        user_login
+        for user_login in list(forks_section["forks"]) + ADDITIONAL_USERNAMES
+        if user_login not in cache_data
+    ]
+    if missing:
+        return f"{len(missing)} participants absents du cache"
+
+    # Les forks supprimés ne sont de toute façon détectés qu'au listage complet :
+    # seul le fork le plus récent compte ici
+    repo = get_repo(get_github(), f"{REPO_OWNER}/{REPO_NAME}", lazy=True)
+    newest = next(iter(repo.get_forks()), None)
+    if newest is not None and (
+        newest.owner.login != forks_section["newest_login"]
+        or newest.created_at.isoformat() != forks_section["newest_created_at"]
+    ):
+        return f"nouveau fork de {newest.owner.login}"
+    return None
+
+
+# --------------------------------------------------------
+# ÉVÉNEMENTS GITHUB (FORK, REPOSITORY)
+# --------------------------------------------------------
+
+
+def read_event(source=None):
+    """
+    Payload d'un événement GitHub : fichier `source`, entrée standard ("-"),
+    ou $GITHUB_EVENT_PATH dans un workflow. Un événement relayé par
+    repository_dispatch est déballé (client_payload).
+    """
+    source = source or os.environ.get("GITHUB_EVENT_PATH") or "-"
+    if source == "-":
+        payload = json.load(sys.stdin)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    return payload.get("client_payload") or payload
+
+
+def event_datetime(value):
+    """Date d'un payload : ISO 8601 ou timestamp (selon les événements)."""
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def is_participant(cache_data, user_login):
+    forks_section = cache_data.get(FORKS_CACHE_KEY) or {"forks": {}}
+    return user_login in forks_section["forks"] or user_login in ADDITIONAL_USERNAMES
+
+
+def apply_fork_event(cache_data, payload):
+    """
+    Nouveau fork du repo principal : ajout à la section des forks, puis
+    récupération de l'utilisateur (seul appel à l'API) et mise à jour de
+    l'index des statistiques. Renvoie True si le cache a changé.
+    Le high-water mark des forks n'est pas avancé : seul list_forks() le fait.
+    """
+    parent = payload["repository"]["full_name"]
+    if parent.lower() != f"{REPO_OWNER}/{REPO_NAME}".lower():
+        print(f"Fork de {parent} ignoré.")
+        return False
+    user_login = payload["forkee"]["owner"]["login"]
+    created_at = event_datetime(payload["forkee"]["created_at"]).isoformat()
+
+    section = cache_data.get(FORKS_CACHE_KEY)
+    if section is None:
+        # Pas encore de listage des forks : le prochain sync le fera
+        print("Section des forks absente du cache, synchronisation complète requise.")
+        return False
+    forks = dict(section["forks"])
+    # Comme list_forks() : un second fork ne remplace pas la date du premier
+    created_at = min(forks.get(user_login, created_at), created_at)
+    forks[user_login] = created_at
+    fork_date = datetime.fromisoformat(created_at)
+    # Le high-water mark (newest_*) reste celui du dernier listage : les runs
+    # d'événements en attente peuvent être annulés par un plus récent, et le
+    # prochain listage incrémental (list_forks) doit alors repartir d'avant
+    # les forks dont l'événement a été perdu
+    cache_data[FORKS_CACHE_KEY] = dict(
+        section,
+        forks=dict(
+            sorted(forks.items(), key=lambda item: (item[1], item[0]), reverse=True)
+        ),
+    )
+
+    print(f"Nouveau fork de {user_login} ({created_at}).")
+    user_info = get_or_cache_user(user_login, cache_data, fork_date)
+    _stats_index.update(user_login, user_info)
+    return True
+
+
+def apply_repository_event(cache_data, payload):
+    """
+    Repo d'un participant créé, modifié (topics, renommage), supprimé ou
+    rendu privé : son entrée dans les dsq_repos du participant et dans la
+    recherche globale en cache est recalculée depuis le payload, sans appel
+    à l'API. Renvoie True si le cache a changé.
+    """
+    repo = payload["repository"]
+    user_login = repo["owner"]["login"]
+    if not is_participant(cache_data, user_login) or user_login not in cache_data:
+        print(f"{user_login} n'est pas un participant connu, événement ignoré.")
+        return False
+
+    old_name = (
+        payload.get("changes", {}).get("repository", {}).get("name", {}).get("from")
+    )
+    names = {repo["name"], old_name} - {None}
+    entry = None
+    if (
+        payload.get("action") not in ("deleted", "privatized")
+        and not repo.get("private")
+        and not repo.get("fork")
+        and "devsidequests" in repo.get("topics", [])
+    ):
+        entry = dsq_repo_entry(
+            repo["name"],
+            repo["html_url"],
+            repo["topics"],
+            event_datetime(repo["created_at"]),
+            event_datetime(repo["pushed_at"]) if repo.get("pushed_at") else None,
+            repo.get("language"),
+        )
+
+    user_info = cache_data[user_login]
+    dsq_repos = [r for r in user_info["dsq_repos"] if r["name"] not in names]
+    if entry:
+        dsq_repos.append(entry)
+    if dsq_repos == user_info["dsq_repos"]:
+        print(f"Repo {user_login}/{repo['name']} : aucun changement.")
+        return False
+    user_info["dsq_repos"] = dsq_repos
+    _stats_index.update(user_login, user_info)
+
+    # La recherche globale en cache ne doit pas annuler ce changement au
+    # prochain sync
+    section = cache_data.get(SEARCH_CACHE_KEY)
+    if section is not None:
+        repos = [
+            r
+            for r in section["repos"]
+            if r["owner"] != user_login or r["name"] not in names
+        ]
+        if entry:
+            repos.append(dict(entry, owner=user_login))
+        cache_data[SEARCH_CACHE_KEY] = dict(section, repos=repos)
+
+    print(f"Repo {user_login}/{repo['name']} : dsq_repos mis à jour.")
+    return True
+
+
+def avatars(cache_data):
+    """
+    Met à jour les miniatures d'avatars (img/avatars/) utilisées par render.
+    Seuls les avatars nouveaux ou changés sont téléchargés et traités.
+    """
+    if not AVATARS_ENABLED:
+        print("Miniatures d'avatars désactivées (DSQ_AVATARS=1 pour les activer).")
+        return
+    section = cache_data.get(AVATARS_CACHE_KEY)
+    update_avatars(cache_data, participants_from_cache(cache_data))
+    if cache_data.get(AVATARS_CACHE_KEY) != section:
+        save_cache(cache_data)
+
+
+def event(cache_data, source=None):
+    """
+    Applique un événement GitHub ("fork" ou "repository") au cache, pour un
+    seul utilisateur, puis régénère PARTICIPANTS.md.
+    """
+    payload = read_event(source)
+    load_stats_index(cache_data)
+
+    if "forkee" in payload:
+        changed = apply_fork_event(cache_data, payload)
+    elif "repository" in payload:
+        changed = apply_repository_event(cache_data, payload)
+    else:
+        print("Événement non pris en charge (ni fork, ni repository).")
+        sys.exit(2)
+
+    if changed and AVATARS_ENABLED:
+        update_avatars(cache_data, participants_from_cache(cache_data))
+
+    # render() sauvegarde le cache s'il a lui-même changé quelque chose
+    if not render(cache_data) and changed:
+        save_cache(cache_data)
+
+
+# --------------------------------------------------------
+# POINTS D'ENTRÉE
+# --------------------------------------------------------
+
+
+def participants_from_cache(cache_data):
+    """
+    Reconstruit la liste des participants (forks puis participants
+    additionnels) à partir du cache seul, sans appel à l'API.
+    """
+    forks_section = cache_data.get(FORKS_CACHE_KEY)
+    if forks_section is not None:
+        fork_logins = list(forks_section["forks"])
+    else:
+        # Cache antérieur au suivi des forks : tous les utilisateurs connus
+        fork_logins = [
+            key
+            for key in cache_data
+            if is_user_key(key) and key not in ADDITIONAL_USERNAMES
+        ]
+
+    participants = []
+    for user_login in fork_logins + ADDITIONAL_USERNAMES:
+        if user_login in cache_data:
+            participants.append(cache_data[user_login])
+        else:
+            print(f"{user_login} absent du cache, ignoré.")
+    return merge_participants(participants).participants()
+
+
+def merge_participants(*sources):
+    """
+    Fusionne les sources de participants en une passe, une seule entrée par
+    personne (voir dsq.registry). Les entrées dont la date de fork a changé
+    à la fusion sont répercutées dans l'index des statistiques.
+    """
+    registry = ParticipantRegistry()
+    for participants in sources:
+        for user in participants:
+            merged = registry.add(user)
+            if merged is not None:
+                refresh_stats(merged["username"], merged)
+    return registry
+
+
+def load_stats_index(cache_data):
+    """Charge l'index des statistiques du cache pour le run courant."""
+    global _stats_index
+    _stats_index = StatsIndex.load(cache_data)
+    return _stats_index
+
+
+def sync(cache_data):
+    """Met à jour le cache depuis l'API GitHub (forks, participants, recherche DSQ)."""
+    load_stats_index(cache_data)
+
+    print("Recherche globale des repos DSQ...")
+    try:
+        get_global_dsq_search(cache_data)
+    except Exception as e:
+        print(f"Erreur lors de la recherche globale DSQ: {e}")
 
     print("Récupération des forks...")
     fork_data = get_forks(cache_data)
@@ -580,26 +1302,205 @@ def main():
     additional_data = get_additional_participants_data(ADDITIONAL_USERNAMES, cache_data)
     print(f"Participants additionnels : {len(additional_data)}")
 
-    # Correction du NameError : renommer 'forks_data' en 'fork_data'
-    combined = fork_data + additional_data
-    print(f"Nombre total de participants après fusion : {len(combined)}")
-
-    print("Génération du markdown...")
-    markdown_content = generate_markdown(combined)
-
-    print("Écriture dans PARTICIPANTS.md...")
-    with open("PARTICIPANTS.md", "w", encoding="utf-8") as f:
-        f.write(markdown_content)
+    registry = merge_participants(fork_data, additional_data)
+    combined = registry.participants()
+    print(
+        f"Nombre total de participants après fusion : {len(combined)} "
+        f"({registry.duplicates} doublons)"
+    )
+    apply_global_search(combined)
+    _stats_index.sync_members(combined)
 
     print("Mise à jour du cache...")
     save_cache(cache_data)
-    print("Mise à jour terminée.")
+    print("Synchronisation terminée.")
 
     # Récap
     print("\nRécapitulatif:")
     print(f"- {len(fork_data)} participants (via forks)")
     print(f"- {count_completed_projects(fork_data)} projets complétés")
     print(f"- {count_active_quests()} quêtes actives")
+    print(f"- {http_cache_summary()}")
+    print(f"- {object_cache_summary()}")
+    print(f"- {rate_limit_summary()}")
+
+
+def render(cache_data):
+    """
+    Génère PARTICIPANTS.md (et les pages de participants) à partir du cache
+    seul, sans appel réseau. Chaque fichier n'est réécrit que si l'empreinte
+    de son contenu a changé.
+    """
+    global _avatar_files
+    if _global_search is None:
+        load_cached_global_search(cache_data)
+    # L'index est normalement à jour après sync ; on ne fait qu'aligner ses membres
+    index = _stats_index if _stats_index is not None else load_stats_index(cache_data)
+    index_members = dict(index.section["members"])
+    participants = participants_from_cache(cache_data)
+    index.sync_members(participants)
+    pages = shard_participants(participants) if PARTICIPANTS_PAGE_SIZE else []
+    _avatar_files = avatar_files(cache_data)
+
+    # Fiches de quêtes relues seulement si leur contenu a changé (la section
+    # ne garde pas les dates de modification, propres à chaque checkout)
+    quests_section = cache_data.get(QUESTS_CACHE_KEY)
+    load_catalogue(cache_data)
+
+    section = cache_data.get(RENDER_CACHE_KEY) or {}
+    changed = (
+        index.section["members"] != index_members
+        or cache_data.get(QUESTS_CACHE_KEY) != quests_section
+    )
+
+    # Première passe sans écriture : seule l'empreinte est calculée
+    print("Génération du markdown...")
+    with span("generate_markdown"):
+        digest = content_hash(iter_markdown(participants, len(pages)))
+    if section.get("content_hash") == digest and os.path.exists(PARTICIPANTS_FILE):
+        print(
+            f"Contenu inchangé depuis le {section['rendered_at']}, {PARTICIPANTS_FILE} conservé."
+        )
+    else:
+        print(f"Écriture dans {PARTICIPANTS_FILE}...")
+        with span("generate_markdown"):
+            write_chunks(PARTICIPANTS_FILE, iter_markdown(participants, len(pages)))
+        section = {
+            "content_hash": digest,
+            "rendered_at": datetime.now(timezone.utc).isoformat(),
+            "pages": section.get("pages", {}),
+        }
+        changed = True
+
+    old_pages = section.get("pages", {})
+    new_pages = {}
+    written = 0
+    first_rank = 1
+    for page, users in enumerate(pages, start=1):
+        path = f"{PARTICIPANTS_DIR}/{shard_name(page)}"
+        new_pages[path] = content_hash(
+            iter_shard_markdown(users, page, len(pages), first_rank)
+        )
+        if old_pages.get(path) != new_pages[path] or not os.path.exists(path):
+            os.makedirs(PARTICIPANTS_DIR, exist_ok=True)
+            write_chunks(path, iter_shard_markdown(users, page, len(pages), first_rank))
+            written += 1
+        first_rank += len(users)
+
+    # Pages devenues inutiles (moins de participants, ou pagination désactivée)
+    removed = 0
+    for path in old_pages.keys() - new_pages.keys():
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    if removed and not new_pages and os.path.isdir(PARTICIPANTS_DIR):
+        if not os.listdir(PARTICIPANTS_DIR):
+            os.rmdir(PARTICIPANTS_DIR)
+
+    if pages or old_pages:
+        print(
+            f"Pages de participants : {written} réécrites, "
+            f"{len(pages) - written} inchangées, {removed} supprimées."
+        )
+    if written or removed or new_pages != old_pages:
+        section["pages"] = new_pages
+        changed = True
+
+    if changed:
+        cache_data[RENDER_CACHE_KEY] = section
+        save_cache(cache_data)
+    return changed
+
+
+def check(cache_data):
+    """
+    Indique si une synchronisation est nécessaire. Le résultat est aussi écrit
+    dans $GITHUB_OUTPUT (changed=true/false) pour conditionner le workflow.
+    """
+    try:
+        reason = detect_changes(cache_data)
+    except Exception as e:
+        # Dans le doute, on synchronise
+        reason = f"vérification impossible ({e})"
+
+    if reason:
+        print(f"Synchronisation nécessaire : {reason}.")
+    else:
+        print("Aucun changement détecté depuis la dernière synchronisation.")
+
+    output_file = os.environ.get("GITHUB_OUTPUT")
+    if output_file:
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"changed={'true' if reason else 'false'}\n")
+
+
+def stats(cache_data):
+    """
+    Vérifie la cohérence de l'index des statistiques en le reconstruisant
+    entièrement à partir du cache. L'index reconstruit remplace l'ancien ;
+    le script sort en erreur si les deux différaient.
+    """
+    participants = participants_from_cache(cache_data)
+    current = StatsIndex.load(cache_data)
+    rebuilt = StatsIndex.build(participants)
+
+    differences = current.diff(rebuilt)
+    if differences:
+        print(f"Index des statistiques incohérent : {'; '.join(differences)}.")
+    else:
+        print(
+            f"Index des statistiques cohérent ({rebuilt.participants_count()} participants)."
+        )
+
+    cache_data[STATS_CACHE_KEY] = rebuilt.section
+    save_cache(cache_data)
+    if differences:
+        sys.exit(1)
+
+
+COMMANDS = {
+    "check": check,
+    "sync": sync,
+    "render": render,
+    "stats": stats,
+    "event": event,
+    "avatars": avatars,
+}
+
+
+def main(argv=None):
+    """
+    Usage : update_participants.py [check|sync|render|stats|avatars]
+            update_participants.py event [payload.json|-]
+    Sans argument : sync puis render (comportement historique).
+    """
+    args = sys.argv[1:] if argv is None else argv
+    max_args = 2 if args[:1] == ["event"] else 1
+    if len(args) > max_args or (args and args[0] not in COMMANDS):
+        print(main.__doc__.strip())
+        sys.exit(2)
+
+    # Rapport de run (durées, appels API, quotas) écrit même en cas d'échec
+    command = args[0] if args else "sync+render"
+    status = "error"
+    try:
+        print("Récupération du cache...")
+        cache_data = load_cache()
+
+        if args:
+            with span(args[0]):
+                COMMANDS[args[0]](cache_data, *args[1:])
+        else:
+            with span("sync"):
+                sync(cache_data)
+            if AVATARS_ENABLED:
+                with span("avatars"):
+                    avatars(cache_data)
+            with span("render"):
+                render(cache_data)
+        status = "ok"
+    finally:
+        write_run_report(command, status)
 
 
 if __name__ == "__main__":